@@ -1,10 +1,29 @@
 
-from tabulate import tabulate
-from gui import build_gui  # or wherever your GUI function is
+import argparse
+import multiprocessing
+from pathlib import Path
+import sys
+from instrument import configure, stage, start_run
+
+# The GUI is imported only in the main process: the loader's worker processes re-import this
+# file, and keeping tkinter and the tabs out of it makes both the window and the workers start sooner.
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # the parallel loader's worker processes need this in the frozen exe
+    parser = argparse.ArgumentParser(prog="Hector")
+    parser.add_argument(
+        "--profile", nargs="?", const="timings", choices=["timings", "cprofile"],
+        help="time each load stage (same as HECTOR_PROFILE=1); cprofile also writes cProfile dumps"
+    )
+    args, _ = parser.parse_known_args()
+    if args.profile:
+        configure(args.profile)
+    # With --profile, "startup" times the imports and window up to the first paint
+    startup_run = start_run("startup", Path(sys.argv[0]).resolve().parent)
     try:
-        build_gui()
+        with stage("import gui"):
+            from gui import build_gui
+        build_gui(startup_run=startup_run)
     except Exception as e:
         import traceback
         traceback.print_exc()
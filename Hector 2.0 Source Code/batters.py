@@ -1,8 +1,11 @@
-from bs4 import BeautifulSoup
 from pathlib import Path
 import sys
 import os
 import importlib.util
+import threading
+from array import array
+from player_store import PlayerStore
+from instrument import stage
 
 def get_base_path():
     if getattr(sys, 'frozen', False):
@@ -20,47 +23,65 @@ def import_weights_module(module_name):
     spec.loader.exec_module(module)
     return module
 
-# Load batter_weights dynamically
-batter_weights = import_weights_module("batter_weights")
-section_weights = batter_weights.section_weights  # get the variable from the module
+# Load batter_weights dynamically, the first time scores are needed rather than at import,
+# so the window can open before the weights file runs. weights_watcher replaces
+# section_weights when the file is edited.
+weights_lock = threading.Lock()
 
-def load_batters_data(filename="batters.html"):
-    base_path = get_base_path()
-    html_path = base_path / filename
+def load_section_weights():
+    global batter_weights, section_weights
+    with weights_lock:
+        if "section_weights" not in globals():
+            batter_weights = import_weights_module("batter_weights")
+            section_weights = batter_weights.section_weights  # get the variable from the module
+    return section_weights
 
-    with open(html_path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f, "html.parser")
+def __getattr__(attr):
+    # batters.section_weights from other modules loads the weights on first use
+    if attr in ("section_weights", "batter_weights"):
+        load_section_weights()
+        return globals()[attr]
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
 
-    # Locate the batter table
-    table = soup.find("table", class_="data")
-    if not table:
-        raise ValueError("No table with class 'data' found in HTML file.")
+def load_batters_data(filename="batters.html", use_cache=True, executor=None):
+    base_path = get_base_path()
+    html_path = base_path / filename
 
-    # Extract headers
-    headers = [th.get_text(strip=True) for th in table.find("thead").find_all("th")]
+    # Stream rows out of the data table (or the parsed-export cache) into a compact player store.
+    # The parser and cache are imported here rather than at the top so opening the window doesn't wait on them.
+    from table_reader import iter_export_rows
+    from export_cache import cached_table_rows
+    if use_cache:
+        table_rows = cached_table_rows(html_path, executor=executor)
+    else:
+        table_rows = iter_export_rows(html_path, executor=executor)
+    with stage("read batters") as entry:
+        headers, rows = [], []
+        for headers, cells in table_rows:
+            if len(cells) == len(headers):
+                rows.append(cells)
+        entry["rows"] = len(rows)
+    with stage("store batters", len(rows)):
+        batters = PlayerStore(headers, rows)
 
-    # Extract rows
-    batters = []
-    for row in table.find("tbody").find_all("tr"):
-        cells = [td.get_text(strip=True) for td in row.find_all("td")]
-        if len(cells) == len(headers):
-            batter_data = dict(zip(headers, cells))
-            batter_data['Scores'] = calculate_batter_score(batter_data)
-            batters.append(batter_data)
+    # Score the whole roster in one batch
+    with stage("score batters", len(batters)):
+        batters.add_column('Scores', score_batters(batters))
 
     return batters
 
+def to_number(val):
+    val = str(val).replace(" Stars", "")
+    if val == "-" or val == "":
+        return 0
+    try:
+        return float(val)
+    except ValueError:
+        return 0
+
 def calculate_batter_score(player):
     pos = player.get('POS', '').upper()
-
-    def to_number(val):
-        val = str(val).replace(" Stars", "")
-        if val == "-" or val == "":
-            return 0
-        try:
-            return float(val)
-        except ValueError:
-            return 0
+    section_weights = load_section_weights()
 
     overall_w = section_weights.get('overall_weight', 1.0)
     potential_w = section_weights.get('potential_weight', 1.0)
@@ -110,3 +131,178 @@ def calculate_batter_score(player):
         "overall_stars": overall_stars,
         "potential_stars": potential_stars
     }
+
+# --- Batch scoring ---
+# The roster is turned into numeric columns once; a weight change then only needs
+# score_batter_columns again. Terms are added in the same order as calculate_batter_score,
+# and defense terms are masked per position, so the results match it exactly.
+
+OFFENSE_TERMS = [('CON', 'contact'), ('GAP', 'gap'), ('POW', 'power'), ('EYE', 'eye'), ("K's", 'strikeouts')]
+POTENTIAL_TERMS = [
+    ('CON P', 'contact_potential'), ('GAP P', 'gap_potential'), ('POW P', 'power_potential'),
+    ('EYE P', 'eye_potential'), ('K P', 'strikeouts_potential')
+]
+DEFENSE_HEADERS = ['C ABI', 'C ARM', 'C BLK', 'IF RNG', 'IF ERR', 'IF ARM', 'OF RNG', 'OF ERR', 'OF ARM']
+
+CATCHER_POSITIONS = ['C']
+INFIELD_POSITIONS = ['1B', '2B', 'SS', '3B']
+OUTFIELD_POSITIONS = ['LF', 'CF', 'RF']
+
+def defense_weights(weights=None):
+    # pos -> one weight per DEFENSE_HEADERS entry, None where the term doesn't apply
+    if weights is None:
+        weights = load_section_weights()
+    catcher = weights['catcher']
+    infield = weights['infield']
+    outfield = weights['outfield']
+
+    vectors = {}
+    for pos in CATCHER_POSITIONS:
+        vectors[pos] = (
+            catcher['catcher_ability'], catcher['catcher_arm'], catcher['catcher_blocking'],
+            None, None, None, None, None, None
+        )
+    for pos in INFIELD_POSITIONS:
+        vectors[pos] = (
+            None, None, None,
+            infield['infield_range'].get(pos, 0), infield['infield_error'], infield['infield_arm'].get(pos, 0),
+            None, None, None
+        )
+    for pos in OUTFIELD_POSITIONS:
+        vectors[pos] = (
+            None, None, None, None, None, None,
+            outfield['outfield_range'].get(pos, 0), outfield['outfield_error'], outfield['outfield_arm']
+        )
+    return vectors
+
+def batter_columns(players):
+    positions = [player.get('POS', '').upper() for player in players]
+    pos_rows = {}
+    for i, pos in enumerate(positions):
+        pos_rows.setdefault(pos, array('l')).append(i)
+
+    columns = {
+        "count": len(players),
+        "pos": positions,
+        "pos_rows": pos_rows,
+        "overall_stars": [player.get('OVR', '0 Stars') for player in players],
+        "potential_stars": [player.get('POT', '0 Stars') for player in players],
+    }
+
+    # Rating strings repeat a lot (20-80 scale, "-"), so each distinct one is parsed once
+    headers = [h for h, _ in OFFENSE_TERMS] + [h for h, _ in POTENTIAL_TERMS] + DEFENSE_HEADERS
+    for header in headers:
+        if isinstance(players, PlayerStore):
+            columns[header] = players.parsed_column(header, to_number)
+            continue
+        memo = {}
+        values = array('d')
+        for player in players:
+            raw = player.get(header, 0)
+            num = memo.get(raw)
+            if num is None:
+                num = memo[raw] = to_number(raw)
+            values.append(num)
+        columns[header] = values
+    return columns
+
+def weighted_sum(columns, terms, section):
+    acc = [0] * columns["count"]
+    for header, key in terms:
+        weight = section[key]
+        acc = [a + num * weight for a, num in zip(acc, columns[header])]
+    return acc
+
+# Score components, unrounded, one value per row. Each reads only its own part of
+# section_weights, so a weight change only has to recompute the parts it touches.
+def offense_part(columns, weights):
+    overall_w = weights.get('overall_weight', 1.0)
+    return [v * overall_w for v in weighted_sum(columns, OFFENSE_TERMS, weights['overall'])]
+
+def potential_part(columns, weights):
+    potential_w = weights.get('potential_weight', 1.0)
+    return [v * potential_w for v in weighted_sum(columns, POTENTIAL_TERMS, weights['potential'])]
+
+def defense_part(columns, weights):
+    # Defense is summed per position group, using only the terms that apply to it
+    vectors = defense_weights(weights)
+    defense = [0] * columns["count"]
+    for pos, rows in columns["pos_rows"].items():
+        vector = vectors.get(pos)
+        if vector is None:
+            continue
+        group = [0] * len(rows)
+        for header, weight in zip(DEFENSE_HEADERS, vector):
+            if weight is None:
+                continue
+            values = columns[header]
+            group = [g + values[i] * weight for g, i in zip(group, rows)]
+        for i, g in zip(rows, group):
+            defense[i] = g
+    return defense
+
+SCORE_PARTS = {
+    "offense": offense_part,
+    "offense_potential": potential_part,
+    "defense": defense_part,
+}
+
+# section_weights key -> the score parts it feeds
+WEIGHT_SECTION_PARTS = {
+    'overall_weight': {"offense"},
+    'overall': {"offense"},
+    'potential_weight': {"offense_potential"},
+    'potential': {"offense_potential"},
+    'catcher': {"defense"},
+    'infield': {"defense"},
+    'outfield': {"defense"},
+}
+
+def score_parts(columns, weights=None, parts=None, names=SCORE_PARTS):
+    # Recomputes the named parts into parts (a dict of part -> values) and returns it
+    if weights is None:
+        weights = load_section_weights()
+    if parts is None:
+        parts = {}
+    for name in names:
+        parts[name] = SCORE_PARTS[name](columns, weights)
+    return parts
+
+def changed_score_parts(old_weights, new_weights):
+    changed = set()
+    for key in set(old_weights) | set(new_weights):
+        if old_weights.get(key) != new_weights.get(key):
+            changed |= WEIGHT_SECTION_PARTS.get(key, set())
+    return changed
+
+def score_batter_columns(columns, weights=None):
+    parts = score_parts(columns, weights)
+    return [
+        {
+            "offense": round(o, 2),
+            "offense_potential": round(p, 2),
+            "defense": round(d, 2),
+            "total": round(o + p + d, 2),
+            "overall_stars": overall_stars,
+            "potential_stars": potential_stars
+        }
+        for o, p, d, overall_stars, potential_stars in zip(
+            parts["offense"], parts["offense_potential"], parts["defense"],
+            columns["overall_stars"], columns["potential_stars"]
+        )
+    ]
+
+def update_batter_scores(players, parts, names):
+    # Writes the named parts (and the total they add up to) into each player's Scores
+    names = list(names)
+    if not names:
+        return
+    for player, o, p, d in zip(players, parts["offense"], parts["offense_potential"], parts["defense"]):
+        scores = player['Scores']
+        for name, value in zip(("offense", "offense_potential", "defense"), (o, p, d)):
+            if name in names:
+                scores[name] = round(value, 2)
+        scores["total"] = round(o + p + d, 2)
+
+def score_batters(players, weights=None):
+    return score_batter_columns(batter_columns(players), weights)
@@ -0,0 +1,280 @@
+import argparse
+import json
+import multiprocessing
+from pathlib import Path
+import platform
+import sys
+import time
+import tracemalloc
+
+from table_reader import iter_table_rows, iter_csv_rows
+from export_cache import cached_table_rows
+from player_store import PlayerStore
+from pitchers import score_pitchers
+from batters import score_batters
+from data_loader import load_all, validate_fields, REQUIRED_PITCHER_FIELDS, REQUIRED_BATTER_FIELDS
+from player_query import build_index, run_query
+from sort_keys import column_keys, sorted_positions, reverse_positions
+from teams import group_rosters, team_rows
+from lineups import best_lineups
+from cli import PITCHER_FIELDS, PITCHER_SCORES, BATTER_FIELDS, BATTER_SCORES, player_rows
+from synth_exports import write_league
+
+# Benchmarks of the load and table hot paths on synthetic league-sized exports.
+#
+#   python benchmark.py                                  1k and 10k players
+#   python benchmark.py --sizes 1000 10000 100000 --json bench.json
+#   python benchmark.py --baseline bench.json            exit 1 when a stage got slower
+#
+# Exports are written once per size and seed to bench_exports/<size>-<seed>/ (synth_exports.py),
+# and the same league as CSV to bench_exports/<size>-<seed>-csv/.
+# Every stage runs --repeat times and the fastest run counts; a second, traced run measures
+# the peak memory each stage allocates (tracemalloc, so worker processes aren't counted).
+
+BENCH_DIR_NAME = "bench_exports"
+DEFAULT_SIZES = [1000, 10000]
+SEARCH_QUERIES = ["sp", "1b", ">30", "total>150", "rp >25 total>150", "smi"]
+
+# A stage slower than its baseline by more than the tolerance and by more than this many
+# seconds counts as a regression; shorter differences are timer noise
+NOISE_SECONDS = 0.005
+
+
+def table_values(players, fields, scores):
+    # The values of a players table (as the GUI and CLI show them), one tuple per player
+    return list(player_rows(players, fields, scores))
+
+
+def search_index(players, rows, fields, scores):
+    # player_query index over table rows, as the GUI builds it
+    name = fields.index("Name")
+    team = fields.index("ORG")
+    age = fields.index("Age")
+    total = len(fields) + scores.index("total")
+    return build_index(
+        names=[values[name] for values in rows],
+        teams=[values[team] for values in rows],
+        positions=[p.get("POS", "") for p in players],
+        numbers={"age": [values[age] for values in rows], "total": [values[total] for values in rows]},
+    )
+
+
+def sort_all_columns(columns, rows):
+    # Typed keys and both sort orders for every column, like clicking each heading twice
+    for i, column in enumerate(columns):
+        keys = column_keys(column, [values[i] for values in rows])
+        reverse_positions(sorted_positions(keys), keys)
+
+
+# --- Stages ---
+# Each stage takes the state dict (results of the stages before it) and returns how many
+# rows it handled. Stages run in this order.
+
+def stage_parse(roster):
+    def run(state):
+        state[roster + "_rows"] = list(iter_table_rows(state["directory"] / f"{roster}.html"))
+        return len(state[roster + "_rows"])
+    return run
+
+
+def stage_parse_csv(roster):
+    def run(state):
+        return sum(1 for _ in iter_csv_rows(state["csv_directory"] / f"{roster}.csv"))
+    return run
+
+
+def stage_cached(roster):
+    def run(state):
+        return sum(1 for _ in cached_table_rows(state["directory"] / f"{roster}.html"))
+    return run
+
+
+def stage_store(roster):
+    def run(state):
+        rows = state[roster + "_rows"]
+        headers = rows[0][0] if rows else []
+        state[roster] = PlayerStore(headers, [cells for _, cells in rows if len(cells) == len(headers)])
+        return len(state[roster])
+    return run
+
+
+def stage_score(roster, score):
+    def run(state):
+        players = state[roster]
+        players.add_column("Scores", score(players))
+        return len(players)
+    return run
+
+
+def stage_validate(state):
+    validate_fields(state["pitchers"], REQUIRED_PITCHER_FIELDS)
+    validate_fields(state["batters"], REQUIRED_BATTER_FIELDS)
+    return len(state["pitchers"]) + len(state["batters"])
+
+
+def stage_filter(roster, fields, scores):
+    def run(state):
+        players = state[roster]
+        rows = state[roster + "_table"] = table_values(players, fields, scores)
+        index = search_index(players, rows, fields, scores)
+        for query in SEARCH_QUERIES:
+            run_query(index, query)
+        return len(rows)
+    return run
+
+
+def stage_sort(roster, fields, scores):
+    def run(state):
+        rows = state[roster + "_table"]
+        sort_all_columns(fields + scores, rows)
+        return len(rows)
+    return run
+
+
+def stage_teams(state):
+    groups = group_rosters(state["pitchers"], state["batters"])
+    return len(team_rows(state["pitchers"], state["batters"], groups))
+
+
+def stage_lineups(state):
+    return len(best_lineups(state["batters"]))
+
+
+def stage_load_all(state):
+    result = load_all(directory=state["directory"], use_cache=False)
+    return len(result["pitchers"]) + len(result["batters"])
+
+
+STAGES = [
+    ("parse pitchers", stage_parse("pitchers")),
+    ("parse batters", stage_parse("batters")),
+    ("parse pitchers csv", stage_parse_csv("pitchers")),
+    ("parse batters csv", stage_parse_csv("batters")),
+    ("cached read pitchers", stage_cached("pitchers")),
+    ("cached read batters", stage_cached("batters")),
+    ("store pitchers", stage_store("pitchers")),
+    ("store batters", stage_store("batters")),
+    ("score pitchers", stage_score("pitchers", score_pitchers)),
+    ("score batters", stage_score("batters", score_batters)),
+    ("validate", stage_validate),
+    ("filter pitchers", stage_filter("pitchers", PITCHER_FIELDS, PITCHER_SCORES)),
+    ("filter batters", stage_filter("batters", BATTER_FIELDS, BATTER_SCORES)),
+    ("sort pitchers", stage_sort("pitchers", PITCHER_FIELDS, PITCHER_SCORES)),
+    ("sort batters", stage_sort("batters", BATTER_FIELDS, BATTER_SCORES)),
+    ("teams", stage_teams),
+    ("lineups", stage_lineups),
+    ("load_all (no cache)", stage_load_all),
+]
+
+
+def export_dir(base, size, seed=0, regenerate=False, file_format="html"):
+    directory = Path(base) / (f"{size}-{seed}" if file_format == "html" else f"{size}-{seed}-{file_format}")
+    files = [directory / f"{roster}.{file_format}" for roster in ("pitchers", "batters")]
+    if regenerate or not all(path.is_file() for path in files):
+        write_league(directory, size, seed, file_format)
+    return directory
+
+
+def run_stages(directory, csv_directory, repeat=3):
+    # {stage: {"rows", "seconds", "peak_mb"}}
+    for roster in ("pitchers", "batters"):
+        for _ in cached_table_rows(directory / f"{roster}.html"):
+            pass   # so the cached read stages time a warm cache
+
+    results = {name: {"rows": 0, "seconds": None} for name, _ in STAGES}
+    for _ in range(repeat):
+        state = {"directory": directory, "csv_directory": csv_directory}
+        for name, run in STAGES:
+            start = time.perf_counter()
+            rows = run(state)
+            seconds = time.perf_counter() - start
+            result = results[name]
+            result["rows"] = rows
+            if result["seconds"] is None or seconds < result["seconds"]:
+                result["seconds"] = seconds
+
+    state = {"directory": directory, "csv_directory": csv_directory}
+    tracemalloc.start()
+    try:
+        for name, run in STAGES:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            run(state)
+            results[name]["peak_mb"] = (tracemalloc.get_traced_memory()[1] - before) / 1e6
+    finally:
+        tracemalloc.stop()
+
+    for result in results.values():
+        result["seconds"] = round(result["seconds"], 4)
+        result["peak_mb"] = round(result["peak_mb"], 2)
+    return results
+
+
+def find_regressions(report, baseline, tolerance):
+    # [(size, stage, baseline seconds, seconds)] for stages slower than the baseline allows
+    regressions = []
+    for size, stages in report["sizes"].items():
+        for name, result in stages.items():
+            base = baseline.get("sizes", {}).get(size, {}).get(name)
+            if base is None:
+                continue
+            limit = base["seconds"] * (1 + tolerance)
+            if result["seconds"] > limit and result["seconds"] - base["seconds"] > NOISE_SECONDS:
+                regressions.append((size, name, base["seconds"], result["seconds"]))
+    return regressions
+
+
+def print_results(size, results):
+    print(f"{size} players")
+    print(f"  {'stage':<22} {'rows':>8} {'seconds':>9} {'rows/s':>11} {'peak MB':>9}")
+    for name, result in results.items():
+        rate = result["rows"] / result["seconds"] if result["seconds"] else 0
+        print(f"  {name:<22} {result['rows']:>8} {result['seconds']:>9.4f} {rate:>11.0f} {result['peak_mb']:>9.2f}")
+    print()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmark.py", description="Time the load and table hot paths on synthetic exports.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="league sizes in players (default: 1000 10000)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage; the fastest counts (default: 3)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the synthetic exports (default: 0)")
+    parser.add_argument("--dir", default=BENCH_DIR_NAME, help=f"where the exports are kept (default: {BENCH_DIR_NAME})")
+    parser.add_argument("--regenerate", action="store_true", help="write the exports again even if they exist")
+    parser.add_argument("--json", default=None, help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=None, help="JSON results to compare against; exit 1 on a slowdown")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown over the baseline (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "sizes": {},
+    }
+    for size in args.sizes:
+        directory = export_dir(args.dir, size, args.seed, args.regenerate)
+        csv_directory = export_dir(args.dir, size, args.seed, args.regenerate, "csv")
+        results = run_stages(directory, csv_directory, args.repeat)
+        report["sizes"][str(size)] = results
+        print_results(size, results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = find_regressions(report, baseline, args.tolerance)
+        for size, name, before, after in regressions:
+            print(f"SLOWER: {size} players, {name}: {before:.4f}s -> {after:.4f}s", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No stage is more than {args.tolerance:.0%} slower than {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
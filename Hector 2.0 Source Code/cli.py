@@ -0,0 +1,229 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import csv
+import json
+import multiprocessing
+import os
+from pathlib import Path
+import sys
+import time
+
+from data_loader import load_all, get_base_path, export_path
+from teams import TEAM_COLUMNS, group_rosters, team_rows, breakdown_columns, breakdown_rows
+from instrument import configure, stage, start_run, finish_run
+
+# Command-line scoring for headless machines and scheduled jobs. Never imports tkinter.
+#
+#   python cli.py                                  score the exports next to the app
+#   python cli.py exports/ --format jsonl          every export folder under exports/, in parallel
+#   python cli.py league1/ league2/ -o out -j 2
+#
+# An export folder holds pitchers and batters exports (.html or .csv). Each one gets its own folder under
+# the output directory with pitchers, batters, teams and team_breakdown (position depth and
+# age distribution) tables in the chosen format. The folder is named after the export folder,
+# or, when two exports share a name (leagueA/week1, leagueB/week1), after its path below the
+# folder they have in common.
+
+PITCHER_FIELDS = ["ID", "Name", "ORG", "POS", "Age", "Prone", "VELO", "PIT", "G/F"]
+PITCHER_SCORES = ["pitches", "pitches_potential", "total"]
+BATTER_FIELDS = ["ID", "Name", "ORG", "POS", "Age", "Prone"]
+BATTER_SCORES = ["overall_stars", "potential_stars", "offense", "offense_potential", "defense", "total"]
+
+
+# --- Writers ---
+# Each takes the column names and an iterable of row tuples and returns the row count.
+# CSV and JSON Lines write rows as they come; the columnar file holds one list per column.
+
+def write_csv(path, columns, rows):
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def write_jsonl(path, columns, rows):
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def write_columns(path, columns, rows):
+    # {"columns": [...], "count": n, "data": {column: [values]}}, e.g. pandas.DataFrame(data["data"])
+    data = [[] for _ in columns]
+    count = 0
+    for row in rows:
+        for values, value in zip(data, row):
+            values.append(value)
+        count += 1
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"columns": list(columns), "count": count, "data": dict(zip(columns, data))}, f, ensure_ascii=False)
+    return count
+
+
+FORMATS = {
+    "csv": (".csv", write_csv),
+    "jsonl": (".jsonl", write_jsonl),
+    "columns": (".columns.json", write_columns),
+}
+
+
+# --- Exports ---
+def is_export(path):
+    return export_path(path, "pitchers").is_file() and export_path(path, "batters").is_file()
+
+
+def find_exports(paths):
+    # Export folders given directly, or the export folders one level below the given folders
+    exports = []
+    for path in map(Path, paths):
+        if is_export(path):
+            exports.append(path)
+        elif path.is_dir():
+            found = sorted(child for child in path.iterdir() if child.is_dir() and is_export(child))
+            if not found:
+                raise ValueError(f"No pitchers/batters exports found in {path}")
+            exports.extend(found)
+        else:
+            raise ValueError(f"Not a folder: {path}")
+    # The same folder given twice would be scored twice into the same output
+    unique = {}
+    for path in exports:
+        unique.setdefault(path.resolve(), path)
+    return list(unique.values())
+
+
+def output_names(exports):
+    # export folder -> its output folder name (a relative path), unique across exports
+    resolved = [Path(path).resolve() for path in exports]
+    names = [path.name for path in resolved]
+    if len(set(names)) < len(names):
+        root = Path(os.path.commonpath(resolved))
+        names = [str(path.relative_to(root)) if path != root else path.name for path in resolved]
+        if len(set(names)) < len(names):
+            raise ValueError("Two exports would write to the same output folder: " + ", ".join(map(str, exports)))
+    return dict(zip(exports, names))
+
+
+def player_rows(players, fields, scores):
+    for p in players:
+        yield tuple(p.get(field, "") for field in fields) + tuple(p["Scores"].get(key, 0) for key in scores)
+
+
+def export_fields(players, default_fields, all_fields):
+    if all_fields and players:
+        return [field for field in players[0] if field != "Scores"]
+    return default_fields
+
+
+def score_export(directory, output, fmt="csv", all_fields=False, use_cache=True, parallel=False, name=None):
+    # Loads, scores and writes one export to output/name (default: the export folder's name);
+    # returns a summary dict (with "error" when it failed)
+    start = time.perf_counter()
+    summary = {"export": str(directory)}
+    out_dir = Path(output) / (name or Path(directory).resolve().name)
+    run = start_run(f"cli {name or out_dir.name}", out_dir)   # None unless profiling is on
+    try:
+        result = load_all(directory=directory, use_cache=use_cache, parallel=parallel)
+        missing = sorted(result["missing_pitcher_fields"] | result["missing_batter_fields"])
+        if missing:
+            summary["error"] = "export is missing fields: " + ", ".join(missing)
+            return summary
+
+        pitchers = result["pitchers"]
+        batters = result["batters"]
+        pitcher_fields = export_fields(pitchers, PITCHER_FIELDS, all_fields)
+        batter_fields = export_fields(batters, BATTER_FIELDS, all_fields)
+        with stage("group teams", len(pitchers) + len(batters)):
+            groups = group_rosters(pitchers, batters)
+        tables = [
+            ("pitchers", pitcher_fields + PITCHER_SCORES, player_rows(pitchers, pitcher_fields, PITCHER_SCORES)),
+            ("batters", batter_fields + BATTER_SCORES, player_rows(batters, batter_fields, BATTER_SCORES)),
+            ("teams", list(TEAM_COLUMNS), team_rows(pitchers, batters, groups)),
+            ("team_breakdown", breakdown_columns(groups)[1], breakdown_rows(groups)),
+        ]
+
+        out_dir.mkdir(parents=True, exist_ok=True)
+        extension, write = FORMATS[fmt]
+        summary["output"] = str(out_dir)
+        summary["counts"] = {}
+        for name, columns, rows in tables:
+            with stage(f"write {name}") as entry:
+                summary["counts"][name] = entry["rows"] = write(out_dir / f"{name}{extension}", columns, rows)
+    except Exception as e:
+        summary["error"] = f"{type(e).__name__}: {e}"
+    summary["seconds"] = round(time.perf_counter() - start, 3)
+    report = finish_run(run)
+    if report is not None:
+        summary["profile"] = report.get("path", report.get("error"))
+    return summary
+
+
+def report(summary):
+    name = Path(summary["export"]).resolve().name
+    if "error" in summary:
+        print(f"{name}: FAILED - {summary['error']}", file=sys.stderr)
+    else:
+        counts = summary["counts"]
+        print(
+            f"{name}: {counts['pitchers']} pitchers, {counts['batters']} batters, {counts['teams']} teams"
+            f" -> {summary['output']} ({summary['seconds']}s)"
+        )
+    if "profile" in summary:
+        print(f"  profile: {summary['profile']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="cli.py", description="Score OOTP exports without the GUI.")
+    parser.add_argument(
+        "paths", nargs="*",
+        help="export folders (holding pitchers and batters .html or .csv exports), or folders of export folders;"
+             " defaults to the exports next to the app"
+    )
+    parser.add_argument("-o", "--output", default="hector_output", help="output folder (default: hector_output)")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="csv", help="output format (default: csv)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="exports scored at once (default: one per CPU)")
+    parser.add_argument("--all-fields", action="store_true", help="write every export column, not just the table columns")
+    parser.add_argument("--no-cache", action="store_true", help="always re-parse the HTML exports")
+    parser.add_argument(
+        "--profile", nargs="?", const="timings", choices=["timings", "cprofile"],
+        help="write per-stage timings (and with cprofile, cProfile dumps) to .hector_profile in the output folder"
+    )
+    args = parser.parse_args(argv)
+    if args.profile:
+        configure(args.profile)
+
+    try:
+        exports = find_exports(args.paths or [get_base_path()])
+        names = output_names(exports)
+    except ValueError as e:
+        parser.error(str(e))
+    options = (args.output, args.format, args.all_fields, not args.no_cache)
+
+    failed = 0
+    if len(exports) == 1 or args.jobs == 1:
+        # One export at a time; a single large export still splits its parse across processes
+        for directory in exports:
+            summary = score_export(directory, *options, parallel=None if len(exports) == 1 else False, name=names[directory])
+            report(summary)
+            failed += "error" in summary
+    else:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            futures = [pool.submit(score_export, directory, *options, name=names[directory]) for directory in exports]
+            for future in as_completed(futures):
+                summary = future.result()
+                report(summary)
+                failed += "error" in summary
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
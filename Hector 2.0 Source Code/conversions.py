@@ -0,0 +1,161 @@
+import argparse
+import sys
+
+import batters as batter_module
+from batters import batter_columns, offense_part, potential_part, defense_part
+from data_loader import load_all
+from player_query import number_index, number_rows
+
+# Role-conversion recommendations (the README's planned improvements):
+#   RP/CL -> SP       3 or more pitches and stamina 50 or higher
+#   1B -> 2B/SS/3B    infield range 50+, infield arm 45+, turn DP above 40, infield error above 40
+#
+# Candidates come from threshold indexes (sorted ratings and bisect, as the search box uses),
+# so finding them never walks the roster. Each candidate is then re-scored at the target
+# position: batters get that position's defense weights (infield_range['SS'] and so on).
+# Pitcher scores already carry the SP penalties whatever the role, so an RP's score is
+# already their score as a starter. Next to the change in their own score, every candidate
+# shows the team gain: the projected score over the weakest player the team has at that position.
+#
+#   python conversions.py                 both lists for the exports next to the app
+#   python conversions.py 1b_to_if --top 20
+
+# conversion name -> (roster, from positions, to positions, [(rating, op, value), ...])
+CONVERSIONS = {
+    "rp_to_sp": ("pitchers", ("RP", "CL"), ("SP",), [("PIT", ">=", 3), ("STM", ">=", 50)]),
+    "1b_to_if": (
+        "batters", ("1B",), ("2B", "SS", "3B"),
+        [("IF RNG", ">=", 50), ("IF ARM", ">=", 45), ("TDP", ">", 40), ("IF ERR", ">", 40)]
+    ),
+}
+
+CONVERSION_TITLES = {
+    "rp_to_sp": "RP to SP (3+ pitches, 50+ stamina)",
+    "1b_to_if": "1B to 2B/SS/3B (range 50+, arm 45+, TDP and error above 40)",
+}
+
+CONVERSION_COLUMNS = ("Name", "Team", "Age", "From", "To", "Score", "Projected", "Change", "Replaces", "Team Gain")
+
+
+def conversion_index(players, fields):
+    # {"pos": {POS: [rows]}, "numbers": {rating: (sorted values, rows)}}; reads ratings only, so
+    # it stays valid across re-scores
+    index = {"pos": {}, "numbers": {}}
+    for row, player in enumerate(players):
+        index["pos"].setdefault(str(player.get("POS", "")).upper(), []).append(row)
+    for field in fields:
+        index["numbers"][field] = number_index([player.get(field) for player in players])
+    return index
+
+
+def conversion_indexes(pitchers, batters):
+    rosters = {"pitchers": pitchers, "batters": batters}
+    indexes = {}
+    for roster in rosters:
+        fields = {field for r, _, _, thresholds in CONVERSIONS.values() if r == roster for field, _, _ in thresholds}
+        indexes[roster] = conversion_index(rosters[roster], sorted(fields))
+    return indexes
+
+
+def candidate_rows(index, positions, thresholds):
+    # Rows at any of positions that pass every threshold, in roster order
+    candidate_sets = [set().union(*(index["pos"].get(pos, []) for pos in positions))]
+    for field, op, value in thresholds:
+        candidate_sets.append(set(number_rows(index, field, op, value)))
+    candidate_sets.sort(key=len)
+    result = candidate_sets[0]
+    for rows in candidate_sets[1:]:
+        if not result:
+            break
+        result = result & rows
+    return sorted(result)
+
+
+def weakest_by_team(players, rows):
+    # team -> (score, player) of the lowest total among rows
+    weakest = {}
+    for row in rows:
+        player = players[row]
+        team = player.get("ORG", "")
+        score = player["Scores"].get("total", 0)
+        if team not in weakest or score < weakest[team][0]:
+            weakest[team] = (score, player)
+    return weakest
+
+
+def batter_projections(candidates, target, weights=None):
+    # Totals of the candidates if they played target, added up like score_batter_columns
+    if weights is None:
+        weights = batter_module.section_weights
+    columns = batter_columns(candidates)
+    columns["pos_rows"] = {target: list(range(len(candidates)))}
+    parts = zip(offense_part(columns, weights), potential_part(columns, weights), defense_part(columns, weights))
+    return [round(o + p + d, 2) for o, p, d in parts]
+
+
+def recommend(name, pitchers, batters, indexes=None, weights=None):
+    # One dict per (candidate, target position), best projected score first
+    roster, from_positions, to_positions, thresholds = CONVERSIONS[name]
+    players = pitchers if roster == "pitchers" else batters
+    if indexes is None:
+        indexes = conversion_indexes(pitchers, batters)
+    index = indexes[roster]
+    candidates = [players[row] for row in candidate_rows(index, from_positions, thresholds)]
+
+    results = []
+    for target in to_positions:
+        if roster == "batters":
+            projected = batter_projections(candidates, target, weights)
+        else:
+            projected = [player["Scores"].get("total", 0) for player in candidates]
+        weakest = weakest_by_team(players, index["pos"].get(target, []))
+        for player, score in zip(candidates, projected):
+            current = player["Scores"].get("total", 0)
+            replaced_score, replaced = weakest.get(player.get("ORG", ""), (0, None))
+            results.append({
+                "player": player,
+                "from": player.get("POS", ""),
+                "to": target,
+                "score": current,
+                "projected": score,
+                "change": round(score - current, 2),
+                "replaces": replaced,
+                "team_gain": round(score - replaced_score, 2),
+            })
+    results.sort(key=lambda r: (r["projected"], r["team_gain"]), reverse=True)
+    return results
+
+
+def recommendation_row(result):
+    player = result["player"]
+    replaced = result["replaces"]
+    return (
+        player.get("Name", ""), player.get("ORG", ""), player.get("Age", ""), result["from"], result["to"],
+        result["score"], result["projected"], result["change"],
+        replaced.get("Name", "") if replaced is not None else "-", result["team_gain"],
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="conversions.py", description="Recommend players who could change position.")
+    parser.add_argument("conversions", nargs="*", help=f"which lists: {', '.join(CONVERSIONS)} (default: all)")
+    parser.add_argument("--dir", default=None, help="export folder (default: the exports next to the app)")
+    parser.add_argument("--top", type=int, default=10, help="rows per list (default: 10)")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.conversions if name not in CONVERSIONS]
+    if unknown:
+        parser.error(f"unknown conversion: {', '.join(unknown)}")
+
+    result = load_all(directory=args.dir)
+    indexes = conversion_indexes(result["pitchers"], result["batters"])
+    for name in args.conversions or CONVERSIONS:
+        print(CONVERSION_TITLES[name])
+        print("  " + " | ".join(CONVERSION_COLUMNS))
+        for recommendation in recommend(name, result["pitchers"], result["batters"], indexes)[:args.top]:
+            print("  " + " | ".join(str(value) for value in recommendation_row(recommendation)))
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
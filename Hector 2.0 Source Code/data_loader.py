@@ -0,0 +1,127 @@
+import os
+from pathlib import Path
+
+from pitchers import load_pitchers_data, get_base_path
+from batters import load_batters_data
+from player_store import PlayerStore
+from instrument import stage
+
+# Loading, validation and scoring of both exports, kept free of tkinter so it can run
+# on a worker thread (or without a GUI at all).
+
+# --- FULL FIELD LISTS ---
+REQUIRED_PITCHER_FIELDS = [
+    "ID","ORG","POS","Name","Age","B","T","OVR","POT","Prone",
+    "STU","MOV","CON","STU P","MOV P","CON P","FB","FBP","CH","CHP",
+    "CB","CBP","SL","SLP","SI","SIP","SP","SPP","CT","CTP","FO","FOP",
+    "CC","CCP","SC","SCP","KC","KCP","KN","KNP","PIT","VELO","STM",
+    "G/F","HLD","SctAcc"
+]
+
+REQUIRED_BATTER_FIELDS = [
+    "ID","POS","Name","ORG","Age","B","Prone","OVR","POT","CON","GAP","POW","EYE","K's",
+    "CON P","GAP P","POW P","EYE P","K P","C ABI","C FRM","C ARM","IF RNG","IF ERR",
+    "IF ARM","TDP","OF RNG","OF ERR","OF ARM","SPE","STE","RUN","SctAcc"
+]
+
+
+# An export may be saved as HTML (OOTP's web page export) or CSV; the newer file is used if both are there
+EXPORT_SUFFIXES = (".html", ".csv")
+
+# Below this combined export size, worker process start-up costs more than it saves
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+
+
+class LoadCancelled(Exception):
+    pass
+
+
+def validate_fields(players, required_fields):
+    # Fields not in the export's header, or empty for some player. A PlayerStore checks its
+    # header once and each column in one pass; plain dicts are checked player by player.
+    if isinstance(players, PlayerStore):
+        return players.blank_keys(required_fields)
+    missing_fields = set()
+    for player in players:
+        for field in required_fields:
+            if field not in player or player[field] in [None, ""]:
+                missing_fields.add(field)
+    return missing_fields
+
+
+def export_path(base_path, roster):
+    # base_path / pitchers.html or pitchers.csv (roster "pitchers"), the newer one when both exist;
+    # the .html name when neither does, so errors name the usual file
+    found = []
+    for suffix in EXPORT_SUFFIXES:
+        path = Path(base_path) / (roster + suffix)
+        try:
+            found.append((os.stat(path).st_mtime_ns, -len(found), path))
+        except OSError:
+            pass
+    return max(found)[2] if found else Path(base_path) / (roster + EXPORT_SUFFIXES[0])
+
+
+def export_size(directory=None):
+    # Combined size in bytes of the two exports in directory (default: next to the app)
+    base_path = get_base_path() if directory is None else Path(directory)
+    total = 0
+    for roster in ("pitchers", "batters"):
+        try:
+            total += os.path.getsize(export_path(base_path, roster))
+        except OSError:
+            pass
+    return total
+
+
+def use_parallel_load(directory=None):
+    return export_size(directory) >= PARALLEL_MIN_BYTES
+
+
+def load_all(progress=None, cancel=None, parallel=None, directory=None, use_cache=True):
+    # progress(message, fraction) is called before each stage; cancel is a threading.Event
+    # that is checked between stages and raises LoadCancelled once set.
+    # parallel=None decides from the export sizes; True parses both files at once, with large
+    # files split into row ranges across a process pool.
+    # directory holds the pitchers and batters exports (.html or .csv); by default the ones next
+    # to the app are used.
+    def step(message, fraction):
+        if cancel is not None and cancel.is_set():
+            raise LoadCancelled()
+        if progress is not None:
+            progress(message, fraction)
+
+    base_path = get_base_path() if directory is None else Path(directory)
+    pitchers_file = str(export_path(base_path, "pitchers"))
+    batters_file = str(export_path(base_path, "batters"))
+
+    if parallel is None:
+        parallel = use_parallel_load(base_path)
+
+    if parallel:
+        # Imported only here: the process pool machinery is the slowest import on the way to the window
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        step("Loading pitchers and batters...", 0.0)
+        with ProcessPoolExecutor() as processes, ThreadPoolExecutor(max_workers=2) as threads:
+            pitchers_future = threads.submit(load_pitchers_data, pitchers_file, use_cache, processes)
+            batters_future = threads.submit(load_batters_data, batters_file, use_cache, processes)
+            pitchers = pitchers_future.result()
+            batters = batters_future.result()
+    else:
+        step("Loading pitchers...", 0.0)
+        pitchers = load_pitchers_data(pitchers_file, use_cache)
+        step("Loading batters...", 0.45)
+        batters = load_batters_data(batters_file, use_cache)
+
+    step("Validating fields...", 0.9)
+    with stage("validate fields", len(pitchers) + len(batters)):
+        missing_pitcher_fields = validate_fields(pitchers, REQUIRED_PITCHER_FIELDS)
+        missing_batter_fields = validate_fields(batters, REQUIRED_BATTER_FIELDS)
+    step("Done", 1.0)
+
+    return {
+        "pitchers": pitchers,
+        "batters": batters,
+        "missing_pitcher_fields": missing_pitcher_fields,
+        "missing_batter_fields": missing_batter_fields,
+    }
@@ -0,0 +1,107 @@
+from pathlib import Path
+import hashlib
+import marshal
+import os
+import sys
+
+from table_reader import export_format, iter_csv_rows, iter_export_rows
+
+# On-disk cache of parsed export rows, so reloads skip parsing when the export hasn't changed.
+# Each export gets one marshal file in a .hector_cache folder next to it, holding the file's
+# path, size, mtime and content hash plus the parsed header and rows.
+#  - size and mtime match: the cached rows are used as-is
+#  - size or mtime changed: the file is hashed, and if the content is the same the cache is
+#    reused (and re-stamped); otherwise the export is parsed again and the cache rewritten
+# CSV exports are not cached: the csv module reads them faster than a cache file loads.
+
+CACHE_DIR_NAME = ".hector_cache"
+CACHE_FORMAT = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_hash(path):
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_file_for(path, cache_dir=None):
+    path = Path(path).resolve()
+    if cache_dir is None:
+        cache_dir = path.parent / CACHE_DIR_NAME
+    key = hashlib.blake2b(str(path).encode("utf-8"), digest_size=8).hexdigest()
+    return Path(cache_dir) / f"{path.stem}-{key}.bin"
+
+
+def _read_cache(cache_file):
+    try:
+        with open(cache_file, "rb") as f:
+            entry = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    # marshal's format is tied to the Python version, so that is part of the key too
+    if not isinstance(entry, dict) or entry.get("format") != (CACHE_FORMAT, sys.version_info[:2]):
+        return None
+    return entry
+
+
+def _write_cache(cache_file, entry):
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(".tmp")
+        with open(tmp_file, "wb") as f:
+            marshal.dump(entry, f)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        # A read-only export folder just means no cache
+        pass
+
+
+def read_table(path, cache_dir=None, executor=None):
+    # Returns (headers, rows) for the export's data table, from the cache when it is still valid
+    path = Path(path).resolve()
+    stat = path.stat()
+    cache_file = cache_file_for(path, cache_dir)
+    entry = _read_cache(cache_file)
+
+    if entry is not None and entry["path"] == str(path):
+        if entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["headers"], entry["rows"]
+
+        content_hash = file_hash(path)
+        if entry["hash"] == content_hash:
+            # Touched but not changed (e.g. the same export copied in again)
+            entry["size"] = stat.st_size
+            entry["mtime_ns"] = stat.st_mtime_ns
+            _write_cache(cache_file, entry)
+            return entry["headers"], entry["rows"]
+    else:
+        content_hash = file_hash(path)
+
+    headers = ()
+    rows = []
+    for headers, cells in iter_export_rows(path, executor=executor):
+        rows.append(cells)
+
+    _write_cache(cache_file, {
+        "format": (CACHE_FORMAT, sys.version_info[:2]),
+        "path": str(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "hash": content_hash,
+        "headers": headers,
+        "rows": rows,
+    })
+    return headers, rows
+
+
+def cached_table_rows(path, cache_dir=None, executor=None):
+    # Drop-in for table_reader.iter_export_rows that goes through the cache
+    if export_format(path) == "csv":
+        yield from iter_csv_rows(path)
+        return
+    headers, rows = read_table(path, cache_dir, executor)
+    for cells in rows:
+        yield headers, cells
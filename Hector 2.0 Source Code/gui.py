@@ -1,38 +1,54 @@
 import tkinter as tk
 from tkinter import ttk
 import tkinter.messagebox as messagebox
-import importlib
-import webbrowser
+from pathlib import Path
 import sys
+import os
+import threading
+import queue
+import traceback
 
-from pitchers import load_pitchers_data
-from batters import load_batters_data
+from data_loader import LoadCancelled, load_all, export_size
+from virtual_table import VirtualTable
+from sort_keys import column_keys, sorted_positions, reverse_positions
+from player_query import build_index, run_query, query_narrows
+from leaderboards import BOARDS, BOARD_TITLES, BATTER_POSITIONS, PITCHER_POSITIONS, build_boards, refresh_boards
+from weights_watcher import WeightsWatcher
+from teams import TEAM_COLUMNS, AGE_BIN_LABELS, group_rosters, team_rows, team_breakdowns
+from instrument import stage, mark, start_run, discard_run, finish_run, summary
+from conversions import CONVERSION_TITLES, CONVERSION_COLUMNS, conversion_indexes, recommend, recommendation_row
+from lineups import LINEUP_COLUMNS, best_lineups, lineup_rows
+from workspace import (
+    LeagueCache, load_workspace, default_workspace, save_workspace, add_league, find_league, league_directory,
+    player_url, export_stamp, load_leagues,
+)
 
+# Exports at least this big (about 5k players) get virtual-scrolling tables.
+# HECTOR_VIRTUAL_TABLES=1 / 0 forces them on or off.
+VIRTUAL_TABLE_MIN_BYTES = 4 * 1024 * 1024
 
+# How often the weight files are checked for edits
+WEIGHTS_POLL_MS = 1000
 
-# --- FULL FIELD LISTS ---
-REQUIRED_PITCHER_FIELDS = [
-    "ID","ORG","POS","Name","Age","B","T","OVR","POT","Prone",
-    "STU","MOV","CON","STU P","MOV P","CON P","FB","FBP","CH","CHP",
-    "CB","CBP","SL","SLP","SI","SIP","SP","SPP","CT","CTP","FO","FOP",
-    "CC","CCP","SC","SCP","KC","KCP","KN","KNP","PIT","VELO","STM",
-    "G/F","HLD","SctAcc"
-]
+# How often results of leagues loading in the background are picked up
+PRELOAD_POLL_MS = 200
 
-REQUIRED_BATTER_FIELDS = [
-    "ID","POS","Name","ORG","Age","B","Prone","OVR","POT","CON","GAP","POW","EYE","K's",
-    "CON P","GAP P","POW P","EYE P","K P","C ABI","C FRM","C ARM","IF RNG","IF ERR",
-    "IF ARM","TDP","OF RNG","OF ERR","OF ARM","SPE","STE","RUN","SctAcc"
-]
 
+def use_virtual_tables(directory=None):
+    setting = os.environ.get("HECTOR_VIRTUAL_TABLES")
+    if setting is not None:
+        return setting.strip() not in ("", "0")
+    return export_size(directory) >= VIRTUAL_TABLE_MIN_BYTES
 
-def validate_fields(players, required_fields):
-    missing_fields = set()
-    for player in players:
-        for field in required_fields:
-            if field not in player or player[field] in [None, ""]:
-                missing_fields.add(field)
-    return missing_fields
+
+def use_snapshots():
+    # Each new export is kept in the snapshot store (see snapshots.py); HECTOR_SNAPSHOTS=0 turns it off
+    return os.environ.get("HECTOR_SNAPSHOTS", "1").strip() not in ("", "0")
+
+
+def open_player_page(url):
+    import webbrowser   # only needed on a double-click, so startup doesn't pay for it
+    webbrowser.open(url)
 
 
 def create_tooltip(widget, text):
@@ -56,7 +72,26 @@ def create_tooltip(widget, text):
     widget.bind("<Leave>", leave)
 
 
-def build_gui():
+def build_gui(virtual_tables=None, startup_run=None):
+    # Leagues to switch between (see workspace.py); league_state["name"] is the one shown (or
+    # about to be), "shown" stays None until a load has succeeded
+    try:
+        workspace = load_workspace()
+    except ValueError as e:
+        print(f"{e}; using the exports next to the app", file=sys.stderr)
+        workspace = default_workspace()
+    league_state = {"name": workspace["active"], "shown": None}
+    league_cache = LeagueCache(workspace["cache_size"])
+
+    def current_league():
+        return find_league(workspace, league_state["name"])
+
+    def league_names():
+        return [league["name"] for league in workspace["leagues"]]
+
+    if virtual_tables is None:
+        virtual_tables = use_virtual_tables(league_directory(current_league()))
+
     root = tk.Tk()
     root.title("Hector 2.0 - Player Scores")
     root.geometry("1500x850")
@@ -72,6 +107,28 @@ def build_gui():
     control_frame.pack(fill="x", padx=10, pady=5)
     reload_btn = ttk.Button(control_frame, text="Reload Data")
     reload_btn.pack(side="left", padx=5)
+    cancel_btn = ttk.Button(control_frame, text="Cancel", state="disabled")
+    cancel_btn.pack(side="left", padx=5)
+    tk.Label(control_frame, text="League:", bg="#1e1e1e", fg="#d4d4d4").pack(side="left", padx=(15, 0))
+    league_var = tk.StringVar(value=league_state["name"])
+    league_select = ttk.Combobox(control_frame, textvariable=league_var, values=league_names(),
+                                 state="readonly", width=20)
+    league_select.pack(side="left", padx=5)
+    add_league_btn = ttk.Button(control_frame, text="Add League...")
+    add_league_btn.pack(side="left", padx=5)
+    load_progress = ttk.Progressbar(control_frame, mode="determinate", maximum=100, length=200)
+    load_progress.pack(side="left", padx=5)
+    load_status_var = tk.StringVar(value="")
+    tk.Label(control_frame, textvariable=load_status_var, bg="#1e1e1e", fg="#d4d4d4",
+             font=("Consolas", 10)).pack(side="left", padx=5)
+
+    def open_player(player_id):
+        # The player's page on the shown league's StatsPlus site
+        url = player_url(current_league(), player_id)
+        if url is None:
+            load_status_var.set(f"No StatsPlus site set for {league_state['name']}")
+        else:
+            open_player_page(url)
 
     # --- NOTEBOOK ---
     notebook = ttk.Notebook(root)
@@ -86,6 +143,12 @@ def build_gui():
                     font=font)
     style.map("Treeview", background=[("selected", "#264f78")])
 
+    def make_table(parent, columns):
+        # Virtual tables only render the visible rows; both kinds take the same calls below
+        if virtual_tables:
+            return VirtualTable(parent, columns=columns, show="headings")
+        return ttk.Treeview(parent, columns=columns, show="headings")
+
     # --- Hover highlight ---
     def on_treeview_motion(event):
         tree = event.widget
@@ -104,55 +167,125 @@ def build_gui():
             tree._prev_hover = None
 
     def sort_treeview(tree, col, reverse):
-        data = [(tree.set(k, col), k) for k in tree.get_children("")]
-
-        if col == "Prone":
-            order = {
-                "wrecked": 0,
-                "fragile": 1,
-                "normal": 2,
-                "durable": 3,
-                "iron man": 4,
-                "ironman": 4,
-            }
-            def rank(value):
-                return order.get(value.lower(), -1)
-            data.sort(key=lambda t: rank(t[0]), reverse=reverse)
-
-        elif col == "Velo":
-            def velo_value(val):
-                val = val.strip()
-                if val.endswith("+"):
-                    try:
-                        return float(val[:-1]) + 1.1  
-                    except:
-                        return -1
-                elif "-" in val:
-                    parts = val.split("-")
-                    try:
-                        return float(parts[-1])
-                    except:
-                        return -1
-                else:
-                    try:
-                        return float(val)
-                    except:
-                        return -1
-            data.sort(key=lambda t: velo_value(t[0]), reverse=reverse)
-
+        # Typed keys per column are built on the first click after a load and the sorted order
+        # is cached per column and direction; every row is sorted, including detached ones,
+        # so they come back in order when the filter widens.
+        order = tree._sort_cache.get((col, reverse))
+        if order is None:
+            keys = tree._sort_keys.get(col)
+            if keys is None:
+                index = list(tree["columns"]).index(col)
+                keys = tree._sort_keys[col] = column_keys(col, [values[index] for values in tree._row_values])
+            ascending = tree._sort_cache.get((col, False))
+            if ascending is None:
+                ascending = tree._sort_cache[(col, False)] = sorted_positions(keys)
+            order = ascending if not reverse else reverse_positions(ascending, keys)
+            tree._sort_cache[(col, reverse)] = order
+        tree._sort_state = (col, reverse)
+
+        base_iids = tree._base_iids
+        tree._all_iids = [base_iids[i] for i in order]
+        visible = set(tree.get_children(""))
+        if len(visible) == len(base_iids):
+            tree.set_children("", *tree._all_iids)
         else:
-            try:
-                data.sort(key=lambda t: float(str(t[0]).replace("-", "0").replace("Stars", "").strip()), reverse=reverse)
-            except ValueError:
-                data.sort(key=lambda t: str(t[0]).lower(), reverse=reverse)
-
-        for index, (val, k) in enumerate(data):
-            tree.move(k, "", index)
+            tree.set_children("", *[k for k in tree._all_iids if k in visible])
         arrow = " ▲" if not reverse else " ▼"
         for c in tree["columns"]:
             tree.heading(c, text=c)
         tree.heading(col, text=col + arrow, command=lambda: sort_treeview(tree, col, not reverse))
 
+    # --- Table rows and filtering ---
+    # Every player gets one Treeview item per load, with a stable iid. Filtering only detaches
+    # and reattaches items (set_children), so iids, sort order and the id maps stay valid.
+    def fill_table(tree, id_map, rows, query_index=None):
+        # rows: (player_id, pos, values); query_index: player_query.build_index over the same rows
+        tree.delete(*tree._all_iids)
+        id_map.clear()
+        tree._all_iids = []
+        tree._row_pos = {}
+        tree._row_number = {}
+        tree._query_index = query_index
+        tree._filter = None
+        tree._prev_hover = None
+        tree._row_values = []
+        tree._sort_keys = {}
+        tree._sort_cache = {}
+        tree._sort_state = None
+        for index, (player_id, pos, values) in enumerate(rows):
+            iid = tree.insert("", "end", iid=str(index), values=values)
+            tree._all_iids.append(iid)
+            tree._row_pos[iid] = pos
+            tree._row_number[iid] = index
+            tree._row_values.append(values)
+            id_map[iid] = player_id
+        tree._base_iids = list(tree._all_iids)
+        for c in tree["columns"]:
+            tree.heading(c, text=c, command=lambda c=c: sort_treeview(tree, c, False))
+
+    def update_table(tree, rows, query_index=None):
+        # Same players in the same order as the last fill_table, with new values (after a
+        # re-score): only changed rows are rewritten, and the sort and filter are kept
+        changed_columns = set()
+        for index, (_, _, values) in enumerate(rows):
+            old = tree._row_values[index]
+            if values != old:
+                tree.item(tree._base_iids[index], values=values)
+                tree._row_values[index] = values
+                changed_columns.update(i for i, (a, b) in enumerate(zip(old, values)) if a != b)
+
+        columns = list(tree["columns"])
+        for i in changed_columns:
+            tree._sort_keys.pop(columns[i], None)
+            tree._sort_cache.pop((columns[i], False), None)
+            tree._sort_cache.pop((columns[i], True), None)
+        if query_index is not None:
+            tree._query_index = query_index
+
+        if tree._sort_state is not None and tree._sort_state[0] not in tree._sort_keys:
+            sort_treeview(tree, *tree._sort_state)
+        if tree._filter is not None:
+            search_text, allowed_positions = tree._filter
+            tree._filter = None   # scores changed, so a narrowing re-check is not enough
+            filter_table(tree, search_text, allowed_positions)
+
+    def filter_table(tree, search_text, allowed_positions):
+        allowed_positions = set(allowed_positions)
+        query_index = tree._query_index
+
+        # When the query only narrows (a longer name prefix, more terms, fewer positions),
+        # only the rows that are showing now can still match
+        previous = tree._filter
+        narrowing = (
+            previous is not None
+            and allowed_positions <= previous[1]
+            and query_narrows(query_index, previous[0], search_text)
+        )
+        candidates = tree.get_children("") if narrowing else tree._all_iids
+
+        matches = run_query(query_index, search_text)
+        row_pos = tree._row_pos
+        row_number = tree._row_number
+        visible = [
+            iid for iid in candidates
+            if row_pos[iid] in allowed_positions and (matches is None or row_number[iid] in matches)
+        ]
+        if not narrowing or len(visible) != len(candidates):
+            tree.set_children("", *visible)
+        tree._filter = (search_text, allowed_positions)
+
+    def debounce(callback, delay=150):
+        # Returns a function that runs callback once typing pauses for delay ms
+        pending = [None]
+        def schedule(*args):
+            if pending[0] is not None:
+                root.after_cancel(pending[0])
+            pending[0] = root.after(delay, run)
+        def run():
+            pending[0] = None
+            callback()
+        return schedule
+
     # --- Helper for integrated clear button ---
     def add_clear_button(entry, variable):
         clear_btn = tk.Label(entry.master, text="✕", fg="#aaa", bg="#1e1e1e", cursor="hand2")
@@ -200,15 +333,16 @@ def build_gui():
     pitcher_search_entry = ttk.Entry(pitcher_controls_frame, textvariable=pitcher_search_var, width=30)
     pitcher_search_entry.pack(side="left", padx=(0, 2))
     add_clear_button(pitcher_search_entry, pitcher_search_var)
-    create_tooltip(pitcher_search_entry, "Search tips:\n- Filter by team: CAS, ATL\n- Filter by position: SP, RP")
-##\n- Filter by age: >25, <=30, =27
+    create_tooltip(pitcher_search_entry, "Search tips:\n- Filter by team: CAS, ATL\n- Filter by position: SP, RP"
+                   "\n- Filter by age: >25, <=30, =27\n- Filter by score: total>=40, pitch>5, pitchpot>5"
+                   "\n- Anything else matches the start of a name: smi")
     table_frame = ttk.Frame(pitcher_frame)
     table_frame.pack(side="right", fill="both", expand=True)
     pitcher_columns = (
         "Name", "Team", "Age", "POS", "Prone", "Velo", "#Pitches", "G/F",
         "Pitch Score", "Pitch Pot. Score", "Total Score"
     )
-    pitcher_table = ttk.Treeview(table_frame, columns=pitcher_columns, show="headings")
+    pitcher_table = make_table(table_frame, pitcher_columns)
     pitcher_table.pack(fill="both", expand=True)
     for col in pitcher_columns:
         pitcher_table.heading(col, text=col, command=lambda c=col: sort_treeview(pitcher_table, c, False))
@@ -216,41 +350,57 @@ def build_gui():
 
     pitcher_table.tag_configure("hover", background="#333")
     pitcher_table._prev_hover = None
+    pitcher_table._all_iids = []
     pitcher_table.bind("<Motion>", on_treeview_motion)
     pitcher_table.bind("<Leave>", on_leave)
 
     pitcher_id_map = {}
 
-    def apply_pitcher_filter(search_text=""):
-        pitcher_table.delete(*pitcher_table.get_children())
-        pitcher_id_map.clear()
-        allowed_positions = [pos for pos, var in pos_vars_pitcher.items() if var.get()]
-        search_terms = [term.lower() for term in search_text.strip().split() if term]
-
+    def pitcher_rows():
+        rows = []
         for p in pitchers:
-            player_id = p.get("ID", "")
             pos = "RP" if p.get("POS") == "CL" else p.get("POS")
             name = p.get("Name", "")
             team = p.get("ORG", "")
-            age = p.get("Age", "")
-            prone_value = p.get("Prone", "")
-            search_fields = f"{name} {team} {pos}".lower()
-
-            if pos in allowed_positions and all(term in search_fields for term in search_terms):
-                iid = pitcher_table.insert("", "end", values=(
+            rows.append((
+                p.get("ID", ""),
+                pos,
+                (
                     name,
                     team,
-                    age,
+                    p.get("Age", ""),
                     pos,
-                    prone_value,
+                    p.get("Prone", ""),
                     p.get("VELO", ""),
                     p.get("PIT", ""),
                     p.get("G/F", ""),
                     p["Scores"].get("pitches", 0),
                     p["Scores"].get("pitches_potential", 0),
                     p["Scores"].get("total", 0),
-                ))
-                pitcher_id_map[iid] = player_id
+                ),
+            ))
+        return rows
+
+    def pitcher_query_index(rows):
+        return build_index(
+            names=[values[0] for _, _, values in rows],
+            teams=[values[1] for _, _, values in rows],
+            positions=[pos for _, pos, _ in rows],
+            numbers={
+                "age": [values[2] for _, _, values in rows],
+                "pitches": [values[8] for _, _, values in rows],
+                "pitches_potential": [values[9] for _, _, values in rows],
+                "total": [values[10] for _, _, values in rows],
+            },
+        )
+
+    def fill_pitcher_table():
+        rows = pitcher_rows()
+        fill_table(pitcher_table, pitcher_id_map, rows, pitcher_query_index(rows))
+
+    def apply_pitcher_filter(search_text=""):
+        allowed_positions = [pos for pos, var in pos_vars_pitcher.items() if var.get()]
+        filter_table(pitcher_table, search_text, allowed_positions)
 
     def on_pitcher_double_click(event):
         region = pitcher_table.identify_region(event.x, event.y)
@@ -262,11 +412,10 @@ def build_gui():
             return
         player_id = pitcher_id_map.get(item_id)
         if player_id:
-            url = f"https://atl-01.statsplus.net/rfbl/player/{player_id}?page=dash"
-            webbrowser.open(url)
+            open_player(player_id)
 
     pitcher_table.bind("<Double-1>", on_pitcher_double_click)
-    pitcher_search_var.trace_add("write", lambda *args: apply_pitcher_filter(pitcher_search_var.get()))
+    pitcher_search_var.trace_add("write", debounce(lambda: apply_pitcher_filter(pitcher_search_var.get())))
 
     # ---- Batters tab ----
     batter_frame = ttk.Frame(notebook)
@@ -298,8 +447,9 @@ def build_gui():
     batter_search_entry = ttk.Entry(batter_controls_frame, textvariable=batter_search_var, width=30)
     batter_search_entry.pack(side="left", padx=(0, 2))
     add_clear_button(batter_search_entry, batter_search_var)
-    create_tooltip(batter_search_entry, "Search tips:\n- Filter by team: CAS, ATL\n- Filter by position: 2B, SS, LF")
-##\n- Filter by age: >25, <=30, =27
+    create_tooltip(batter_search_entry, "Search tips:\n- Filter by team: CAS, ATL\n- Filter by position: 2B, SS, LF"
+                   "\n- Filter by age: >25, <=30, =27\n- Filter by score: total>=40, off>30, pot>30, def>10"
+                   "\n- Anything else matches the start of a name: smi\n- Combine them: >25 CAS 1b")
     batter_table_frame = ttk.Frame(batter_frame)
     batter_table_frame.pack(side="right", fill="both", expand=True)
     batter_columns = (
@@ -307,7 +457,7 @@ def build_gui():
         "Offense", "Offense Pot.", "Defense", "Total"
     )
 
-    batter_table = ttk.Treeview(batter_table_frame, columns=batter_columns, show="headings")
+    batter_table = make_table(batter_table_frame, batter_columns)
     batter_table.pack(fill="both", expand=True)
     for col in batter_columns:
         batter_table.heading(col, text=col, command=lambda c=col: sort_treeview(batter_table, c, False))
@@ -315,42 +465,58 @@ def build_gui():
 
     batter_table.tag_configure("hover", background="#333")
     batter_table._prev_hover = None
+    batter_table._all_iids = []
     batter_table.bind("<Motion>", on_treeview_motion)
     batter_table.bind("<Leave>", on_leave)
 
     batter_id_map = {}
 
-    def apply_batter_filter(search_text=""):
-        batter_table.delete(*batter_table.get_children())
-        batter_id_map.clear()
-        allowed_positions = [pos for pos, var in pos_vars_batter.items() if var.get()]
-        search_terms = [term.lower() for term in search_text.strip().split() if term]
-
+    def batter_rows():
+        rows = []
         for b in batters:
-            player_id = b.get("ID", "")
             pos = b.get("POS", "")
             name = b.get("Name", "")
             team = b.get("ORG", "")
-            age = b.get("Age", "")
-            prone_value = b.get("Prone", "")
-            search_fields = f"{name} {team} {pos}".lower()
-
-            if pos in allowed_positions and all(term in search_fields for term in search_terms):
-                iid = batter_table.insert("", "end", values=(
+            rows.append((
+                b.get("ID", ""),
+                pos,
+                (
                     name,
                     team,
-                    age,
+                    b.get("Age", ""),
                     pos,
-                    prone_value,
+                    b.get("Prone", ""),
                     b["Scores"].get("overall_stars", 0),
                     b["Scores"].get("potential_stars", 0),
                     b["Scores"].get("offense", 0),
                     b["Scores"].get("offense_potential", 0),
                     b["Scores"].get("defense", 0),
                     b["Scores"].get("total", 0),
-                ))
-                batter_id_map[iid] = player_id
+                ),
+            ))
+        return rows
+
+    def batter_query_index(rows):
+        return build_index(
+            names=[values[0] for _, _, values in rows],
+            teams=[values[1] for _, _, values in rows],
+            positions=[pos for _, pos, _ in rows],
+            numbers={
+                "age": [values[2] for _, _, values in rows],
+                "offense": [values[7] for _, _, values in rows],
+                "offense_potential": [values[8] for _, _, values in rows],
+                "defense": [values[9] for _, _, values in rows],
+                "total": [values[10] for _, _, values in rows],
+            },
+        )
+
+    def fill_batter_table():
+        rows = batter_rows()
+        fill_table(batter_table, batter_id_map, rows, batter_query_index(rows))
 
+    def apply_batter_filter(search_text=""):
+        allowed_positions = [pos for pos, var in pos_vars_batter.items() if var.get()]
+        filter_table(batter_table, search_text, allowed_positions)
 
     def on_batter_double_click(event):
         region = batter_table.identify_region(event.x, event.y)
@@ -362,17 +528,16 @@ def build_gui():
             return
         player_id = batter_id_map.get(item_id)
         if player_id:
-            url = f"https://atl-01.statsplus.net/rfbl/player/{player_id}?page=dash"
-            webbrowser.open(url)
+            open_player(player_id)
 
     batter_table.bind("<Double-1>", on_batter_double_click)
-    batter_search_var.trace_add("write", lambda *args: apply_batter_filter(batter_search_var.get()))
+    batter_search_var.trace_add("write", debounce(lambda: apply_batter_filter(batter_search_var.get())))
 
     # ---- Teams tab ----
     teams_frame = ttk.Frame(notebook)
     notebook.add(teams_frame, text="Teams")
 
-    teams_columns = ("Team", "Avg Age", "SP Total", "RP Total", "Team Pitching Total", "Batters Total", "Total Team Score")
+    teams_columns = TEAM_COLUMNS
     teams_table = ttk.Treeview(teams_frame, columns=teams_columns, show="headings")
     teams_table.pack(fill="both", expand=True, padx=10, pady=10)
 
@@ -382,21 +547,197 @@ def build_gui():
 
     teams_table.tag_configure("hover", background="#333")
     teams_table._prev_hover = None
+    teams_table._all_iids = []
+    teams_id_map = {}
     teams_table.bind("<Motion>", on_treeview_motion)
     teams_table.bind("<Leave>", on_leave)
 
+    # Team grouping of the loaded rosters; it does not depend on scores, so a re-score reuses it
+    team_state = {"groups": None}
+
+    def on_team_double_click(event):
+        if teams_table.identify_region(event.x, event.y) == "heading":
+            return
+        team = teams_id_map.get(teams_table.focus())
+        if team is None or team_state["groups"] is None:
+            return
+        breakdown = team_breakdowns(team_state["groups"])[team]
+        depth = "   ".join(f"{pos} {count}" for pos, count in breakdown["depth"].items())
+        ages = "\n".join(f"{label}: {breakdown['ages'][label]}" for label in AGE_BIN_LABELS)
+        messagebox.showinfo(f"{team} Breakdown", f"Position depth:\n{depth}\n\nAges:\n{ages}")
+
+    teams_table.bind("<Double-1>", on_team_double_click)
+
+    # ---- Leaders tab ----
+    leaders_frame = ttk.Frame(notebook)
+    notebook.add(leaders_frame, text="Leaders")
+
+    leaders_controls_frame = tk.Frame(leaders_frame, bg="#1e1e1e")
+    leaders_controls_frame.pack(fill="x", padx=10, pady=5)
+    tk.Label(leaders_controls_frame, text="Leaderboard:", bg="#1e1e1e", fg="#d4d4d4").pack(side="left")
+    board_names = {title: name for name, title in BOARD_TITLES.items()}
+    board_var = tk.StringVar(value=BOARD_TITLES["batters_total"])
+    board_select = ttk.Combobox(leaders_controls_frame, textvariable=board_var, values=list(board_names),
+                                state="readonly", width=36)
+    board_select.pack(side="left", padx=5)
+
+    leaders_columns = ("POS", "Rank", "Name", "Team", "Age", "Score")
+    leaders_table = ttk.Treeview(leaders_frame, columns=leaders_columns, show="headings")
+    leaders_table.pack(fill="both", expand=True, padx=10, pady=10)
+
+    for col in leaders_columns:
+        leaders_table.heading(col, text=col, command=lambda c=col: sort_treeview(leaders_table, c, False))
+        leaders_table.column(col, width=200 if col == "Name" else 80, anchor="center")
+
+    leaders_table.tag_configure("hover", background="#333")
+    leaders_table._prev_hover = None
+    leaders_table._all_iids = []
+    leaders_id_map = {}
+    leaders_table.bind("<Motion>", on_treeview_motion)
+    leaders_table.bind("<Leave>", on_leave)
+
+    leader_boards = {}
+
+    def show_leaderboard(*args):
+        name = board_names[board_var.get()]
+        board = leader_boards.get(name, {})
+        positions = BATTER_POSITIONS if BOARDS[name][0] == "batters" else PITCHER_POSITIONS
+        rows = []
+        for pos in positions:
+            for rank, (score, player) in enumerate(board.get(pos, []), start=1):
+                rows.append((
+                    player.get("ID", ""),
+                    pos,
+                    (pos, rank, player.get("Name", ""), player.get("ORG", ""), player.get("Age", ""), score),
+                ))
+        fill_table(leaders_table, leaders_id_map, rows)
+
+    def on_leaders_double_click(event):
+        if leaders_table.identify_region(event.x, event.y) == "heading":
+            return
+        player_id = leaders_id_map.get(leaders_table.focus())
+        if player_id:
+            open_player(player_id)
+
+    board_select.bind("<<ComboboxSelected>>", show_leaderboard)
+    leaders_table.bind("<Double-1>", on_leaders_double_click)
+
+    # ---- Conversions tab ----
+    conversions_frame = ttk.Frame(notebook)
+    notebook.add(conversions_frame, text="Conversions")
+
+    conversions_controls_frame = tk.Frame(conversions_frame, bg="#1e1e1e")
+    conversions_controls_frame.pack(fill="x", padx=10, pady=5)
+    tk.Label(conversions_controls_frame, text="Move:", bg="#1e1e1e", fg="#d4d4d4").pack(side="left")
+    conversion_names = {title: name for name, title in CONVERSION_TITLES.items()}
+    conversion_var = tk.StringVar(value=CONVERSION_TITLES["rp_to_sp"])
+    conversion_select = ttk.Combobox(conversions_controls_frame, textvariable=conversion_var,
+                                     values=list(conversion_names), state="readonly", width=56)
+    conversion_select.pack(side="left", padx=5)
+
+    conversions_table = ttk.Treeview(conversions_frame, columns=CONVERSION_COLUMNS, show="headings")
+    conversions_table.pack(fill="both", expand=True, padx=10, pady=10)
+
+    for col in CONVERSION_COLUMNS:
+        conversions_table.heading(col, text=col, command=lambda c=col: sort_treeview(conversions_table, c, False))
+        conversions_table.column(col, width=180 if col in ("Name", "Replaces") else 80, anchor="center")
+
+    conversions_table.tag_configure("hover", background="#333")
+    conversions_table._prev_hover = None
+    conversions_table._all_iids = []
+    conversions_id_map = {}
+    conversions_table.bind("<Motion>", on_treeview_motion)
+    conversions_table.bind("<Leave>", on_leave)
+
+    # Threshold indexes of the loaded rosters; they read ratings only, so a re-score reuses them
+    conversion_state = {"indexes": None}
+
+    def show_conversions(*args):
+        if conversion_state["indexes"] is None:
+            return
+        name = conversion_names[conversion_var.get()]
+        rows = [
+            (result["player"].get("ID", ""), result["to"], recommendation_row(result))
+            for result in recommend(name, pitchers, batters, conversion_state["indexes"])
+        ]
+        fill_table(conversions_table, conversions_id_map, rows)
+
+    def on_conversions_double_click(event):
+        if conversions_table.identify_region(event.x, event.y) == "heading":
+            return
+        player_id = conversions_id_map.get(conversions_table.focus())
+        if player_id:
+            open_player(player_id)
+
+    conversion_select.bind("<<ComboboxSelected>>", show_conversions)
+    conversions_table.bind("<Double-1>", on_conversions_double_click)
+
+    # ---- Lineups tab ----
+    lineups_frame = ttk.Frame(notebook)
+    notebook.add(lineups_frame, text="Lineups")
+
+    lineups_controls_frame = tk.Frame(lineups_frame, bg="#1e1e1e")
+    lineups_controls_frame.pack(fill="x", padx=10, pady=5)
+    tk.Label(lineups_controls_frame, text="Team:", bg="#1e1e1e", fg="#d4d4d4").pack(side="left")
+    lineup_team_var = tk.StringVar()
+    lineup_team_select = ttk.Combobox(lineups_controls_frame, textvariable=lineup_team_var, state="readonly", width=12)
+    lineup_team_select.pack(side="left", padx=5)
+    lineup_summary_var = tk.StringVar()
+    tk.Label(lineups_controls_frame, textvariable=lineup_summary_var, bg="#1e1e1e", fg="#d4d4d4").pack(side="left", padx=10)
+
+    lineups_table = ttk.Treeview(lineups_frame, columns=LINEUP_COLUMNS, show="headings")
+    lineups_table.pack(fill="both", expand=True, padx=10, pady=10)
+
+    for col in LINEUP_COLUMNS:
+        lineups_table.heading(col, text=col, command=lambda c=col: sort_treeview(lineups_table, c, False))
+        lineups_table.column(col, width=200 if col == "Name" else 80, anchor="center")
+
+    lineups_table.tag_configure("hover", background="#333")
+    lineups_table._prev_hover = None
+    lineups_table._all_iids = []
+    lineups_id_map = {}
+    lineups_table.bind("<Motion>", on_treeview_motion)
+    lineups_table.bind("<Leave>", on_leave)
+
+    # team -> lineups.team_lineup; every team is solved at once (a few ms for a league)
+    team_lineups = {}
+
+    def show_lineup(*args):
+        lineup = team_lineups.get(lineup_team_var.get())
+        if lineup is None:
+            lineup_summary_var.set("")
+            fill_table(lineups_table, lineups_id_map, [])
+            return
+        lineup_summary_var.set(
+            f"Lineup total {lineup['total']}   Depth chart {lineup['depth_chart_total']}   "
+            f"Gain {lineup['gain']}   Moved {lineup['moved']}"
+        )
+        rows = [
+            (slot["player"].get("ID", "") if slot["player"] else "", slot["pos"], values)
+            for slot, values in zip(lineup["slots"], lineup_rows(lineup))
+        ]
+        fill_table(lineups_table, lineups_id_map, rows)
+
+    def on_lineups_double_click(event):
+        if lineups_table.identify_region(event.x, event.y) == "heading":
+            return
+        player_id = lineups_id_map.get(lineups_table.focus())
+        if player_id:
+            open_player(player_id)
+
+    lineup_team_select.bind("<<ComboboxSelected>>", show_lineup)
+    lineups_table.bind("<Double-1>", on_lineups_double_click)
+
     # --- Data and reload ---
     pitchers = []
     batters = []
 
-    def load_data():
+    def apply_loaded_data(result):
+        # False when the export is missing fields; the first load of the session exits then,
+        # later ones keep the league that is shown
         nonlocal pitchers, batters
-        pitchers = load_pitchers_data()
-        batters = load_batters_data()
-
-        # Validate required fields
-        missing_pitcher_fields = validate_fields(pitchers, REQUIRED_PITCHER_FIELDS)
-        missing_batter_fields = validate_fields(batters, REQUIRED_BATTER_FIELDS)
+        missing_pitcher_fields = result["missing_pitcher_fields"]
+        missing_batter_fields = result["missing_batter_fields"]
 
         if missing_pitcher_fields or missing_batter_fields:
             error_message = "Your OOTP export is missing fields:\n\n"
@@ -406,88 +747,352 @@ def build_gui():
                 error_message += "Batters are missing:\n- " + "\n- ".join(sorted(missing_batter_fields)) + "\n\n"
             error_message += "Please update your OOTP export to include these fields."
             messagebox.showerror("Missing Fields", error_message)
-            root.destroy()
-            sys.exit(1)  # exit program
+            if league_state["shown"] is None:
+                root.destroy()
+                sys.exit(1)  # exit program
+            return False
+
+        pitchers = result["pitchers"]
+        batters = result["batters"]
+        return True
+
+    def show_league(name, result):
+        if not apply_loaded_data(result):
+            league_var.set(league_state["name"])
+            return False
+        league_state["name"] = league_state["shown"] = name
+        league_var.set(name)
+        refresh_tables()
+        return True
+
+    def teams_rows():
+        return [(values[0], None, values) for values in team_rows(pitchers, batters, team_state["groups"])]
 
     def update_teams_tab():
-        teams_table.delete(*teams_table.get_children())
-
-        team_scores = {}
-        team_ages = {}  # key: team, value: list of ages
+        team_state["groups"] = group_rosters(pitchers, batters)
+        fill_table(teams_table, teams_id_map, teams_rows())
+
+    # --- On-demand tabs ---
+    # A load only fills the tab on screen; the others are marked stale and filled the first
+    # time they are shown, so tabs nobody opens cost nothing.
+    def fill_pitchers_tab():
+        with stage("fill pitchers table", len(pitchers)):
+            fill_pitcher_table()
+            apply_pitcher_filter(pitcher_search_var.get())
+
+    def fill_batters_tab():
+        with stage("fill batters table", len(batters)):
+            fill_batter_table()
+            apply_batter_filter(batter_search_var.get())
+
+    def fill_teams_tab():
+        with stage("teams tab"):
+            update_teams_tab()
+
+    def fill_leaders_tab():
+        with stage("leaderboards"):
+            leader_boards.clear()
+            leader_boards.update(build_boards(batters, pitchers))
+            show_leaderboard()
+
+    def fill_conversions_tab():
+        with stage("conversions"):
+            conversion_state["indexes"] = conversion_indexes(pitchers, batters)
+            show_conversions()
+
+    def fill_lineups_tab():
+        with stage("lineups", len(batters)):
+            team_lineups.clear()
+            team_lineups.update(best_lineups(batters))
+            teams = sorted(team_lineups)
+            lineup_team_select.config(values=teams)
+            if lineup_team_var.get() not in team_lineups:
+                lineup_team_var.set(teams[0] if teams else "")
+            show_lineup()
+
+    tab_fills = {
+        str(pitcher_frame): fill_pitchers_tab,
+        str(batter_frame): fill_batters_tab,
+        str(teams_frame): fill_teams_tab,
+        str(leaders_frame): fill_leaders_tab,
+        str(conversions_frame): fill_conversions_tab,
+        str(lineups_frame): fill_lineups_tab,
+    }
+    stale_tabs = set()
+
+    def tab_filled(frame):
+        return str(frame) not in stale_tabs
+
+    def fill_shown_tab(event=None):
+        tab = str(notebook.select())
+        if tab in stale_tabs:
+            stale_tabs.discard(tab)
+            tab_fills[tab]()
+
+    def refresh_tables():
+        stale_tabs.update(tab_fills)
+        fill_shown_tab()
+
+    notebook.bind("<<NotebookTabChanged>>", fill_shown_tab)
+
+    # --- Background loading ---
+    # Loading, validation and scoring run on a worker thread. The worker only talks to the UI
+    # through load_queue; the Tk thread drains it from poll_load_queue via root.after.
+    load_queue = queue.Queue()
+    load_state = {"id": 0, "cancel": None, "run": None, "league": None}
+
+    def start_load(name=None):
+        # Loads league name (default: the shown one) from its exports
+        if load_state["cancel"] is not None:
+            return  # a load is already running
+        check_weights()   # so the reload scores with the weights on disk
+        name = league_state["name"] if name is None else name
+        directory = league_directory(find_league(workspace, name))
+        load_state["id"] += 1
+        load_id = load_state["id"]
+        cancel = threading.Event()
+        load_state["cancel"] = cancel
+        load_state["league"] = name
+        load_state["run"] = start_run("reload", directory)   # None unless HECTOR_PROFILE is set
+
+        def worker():
+            try:
+                stamp = export_stamp(directory)
+                result = load_all(
+                    progress=lambda message, fraction: load_queue.put((load_id, "progress", (message, fraction))),
+                    cancel=cancel,
+                    directory=directory,
+                )
+            except LoadCancelled:
+                load_queue.put((load_id, "cancelled", None))
+            except Exception as e:
+                load_queue.put((load_id, "error", (e, traceback.format_exc())))
+            else:
+                if use_snapshots() and not (result["missing_pitcher_fields"] or result["missing_batter_fields"]):
+                    from snapshots import save_snapshot, export_source, SNAPSHOT_DIR_NAME
+                    try:
+                        with stage("save snapshot"):
+                            save_snapshot(
+                                result["pitchers"], result["batters"], source=export_source(directory),
+                                store_dir=directory / SNAPSHOT_DIR_NAME,
+                            )
+                    except (OSError, ValueError) as e:
+                        print(f"Could not save a snapshot: {e}", file=sys.stderr)
+                load_queue.put((load_id, "done", (stamp, result)))
+
+        reload_btn.config(state="disabled")
+        league_select.config(state="disabled")
+        add_league_btn.config(state="disabled")
+        cancel_btn.config(state="normal")
+        load_progress["value"] = 0
+        load_status_var.set("Loading...")
+        threading.Thread(target=worker, daemon=True).start()
+        root.after(50, poll_load_queue)
+
+    def finish_load(status):
+        load_state["cancel"] = None
+        reload_btn.config(state="normal")
+        league_select.config(state="readonly")
+        add_league_btn.config(state="normal")
+        cancel_btn.config(state="disabled")
+        league_var.set(league_state["name"])
+        load_status_var.set(status)
+
+    def finish_profile(run):
+        # Writes the profiling report of a run and adds where its time went to the status bar
+        report = finish_run(run)
+        if report is not None:
+            load_status_var.set(f"{load_status_var.get()}  [{summary(report)}]")
+
+    def cancel_load():
+        if load_state["cancel"] is not None:
+            load_state["cancel"].set()
+            load_status_var.set("Cancelling...")
+
+    def poll_load_queue():
+        while True:
+            try:
+                load_id, kind, payload = load_queue.get_nowait()
+            except queue.Empty:
+                break
+            if load_id != load_state["id"]:
+                continue  # left over from an earlier load
+
+            if kind == "progress":
+                message, fraction = payload
+                load_progress["value"] = fraction * 100
+                load_status_var.set(message)
+            elif kind == "done":
+                stamp, result = payload
+                load_progress["value"] = 100
+                finish_load(f"Loaded {len(result['pitchers'])} pitchers, {len(result['batters'])} batters")
+                if show_league(load_state["league"], result):
+                    league_cache.put(load_state["league"], result, stamp)
+                finish_profile(load_state["run"])
+                start_preload()
+                return
+            elif kind == "cancelled":
+                load_progress["value"] = 0
+                finish_load("Load cancelled")
+                finish_profile(load_state["run"])
+                return
+            elif kind == "error":
+                error, details = payload
+                print(details, file=sys.stderr)
+                load_progress["value"] = 0
+                finish_load("Load failed")
+                finish_profile(load_state["run"])
+                messagebox.showerror("Load Failed", f"Could not load the OOTP exports:\n\n{error}")
+                return
+        root.after(50, poll_load_queue)
+
+    reload_btn.config(command=start_load)
+    cancel_btn.config(command=cancel_load)
+
+    # --- Leagues ---
+    # Switching to a league in league_cache shows it at once; any other league is loaded.
+    # After a load, the workspace's other leagues (as many as the cache keeps) are loaded in
+    # the background, one process each.
+    preload_queue = queue.Queue()
+    preload_state = {"running": False}
+
+    def switch_league(event=None):
+        name = league_var.get()
+        if name == league_state["name"] or load_state["cancel"] is not None:
+            return
+        check_weights()   # so cached scores are compared with the weights on disk
+        result = league_cache.get(name, league_directory(find_league(workspace, name)))
+        if result is None:
+            start_load(name)
+        elif show_league(name, result):
+            load_status_var.set(f"{name}: {len(result['pitchers'])} pitchers, {len(result['batters'])} batters")
+        if len(workspace["leagues"]) > 1:
+            workspace["active"] = name
+            try:
+                save_workspace(workspace)
+            except OSError as e:
+                print(f"Could not save the workspace: {e}", file=sys.stderr)
+
+    def add_league_dialog():
+        from tkinter import filedialog, simpledialog
+        directory = filedialog.askdirectory(parent=root, title="Folder with the league's exports", mustexist=True)
+        if not directory:
+            return
+        name = simpledialog.askstring("Add League", "League name:", initialvalue=Path(directory).name, parent=root)
+        if not name or not name.strip():
+            return
+        statsplus = simpledialog.askstring(
+            "Add League", "StatsPlus site (optional), e.g. https://atl-01.statsplus.net/rfbl", parent=root
+        )
+        try:
+            add_league(workspace, name.strip(), directory, (statsplus or "").strip())
+        except ValueError as e:
+            messagebox.showerror("Add League", str(e))
+            return
+        league_select.config(values=league_names())
+        league_var.set(name.strip())
+        switch_league()   # also saves the workspace
 
-        # Aggregate pitcher scores and ages by team and role
-        for p in pitchers:
-            team = p.get("ORG", "Unknown")
-            pos = p.get("POS", "")
-            total_score = p["Scores"].get("total", 0)
-            age = p.get("Age")
-
-            if team not in team_scores:
-                team_scores[team] = {"SP": 0, "RP": 0, "Batters": 0}
-                team_ages[team] = []
-
-            if age is not None:
-                try:
-                    team_ages[team].append(float(age))
-                except ValueError:
-                    pass
-
-            if pos == "SP":
-                team_scores[team]["SP"] += total_score
-            elif pos in ("RP", "CL"):
-                team_scores[team]["RP"] += total_score
-
-        # Aggregate batter scores and ages by team
-        for b in batters:
-            team = b.get("ORG", "Unknown")
-            total_score = b["Scores"].get("offense", 0) + b["Scores"].get("defense", 0)
-            age = b.get("Age")
-
-            if team not in team_scores:
-                team_scores[team] = {"SP": 0, "RP": 0, "Batters": 0}
-                team_ages[team] = []
-
-            if age is not None:
-                try:
-                    team_ages[team].append(float(age))
-                except ValueError:
-                    pass
-
-            team_scores[team]["Batters"] += total_score
-
-        for team in sorted(team_scores.keys()):
-            sp_total = round(team_scores[team]["SP"], 2)
-            rp_total = round(team_scores[team]["RP"], 2)
-            team_pitching_total = round(sp_total + rp_total, 2)
-            batters_total = round(team_scores[team]["Batters"], 2)
-            total_team_score = round(team_pitching_total + batters_total, 2)
-
-            # Calculate average age
-            ages = team_ages.get(team, [])
-            avg_age = round(sum(ages) / len(ages), 2) if ages else "N/A"
-
-            teams_table.insert(
-                "",
-                "end",
-                values=(team, avg_age, sp_total, rp_total, team_pitching_total, batters_total, total_team_score)
-            )
-
-    def reload_and_refresh():
-        load_data()
-        apply_pitcher_filter(pitcher_search_var.get())
-        apply_batter_filter(batter_search_var.get())
-        update_teams_tab()
+    def start_preload():
+        if preload_state["running"] or not workspace.get("preload", True):
+            return
+        leagues = [
+            league for league in workspace["leagues"]
+            if league["name"] != league_state["name"] and league["name"] not in league_cache
+        ][:league_cache.size - 1]
+        if not leagues:
+            return
+        preload_state["running"] = True
 
-    reload_btn.config(command=reload_and_refresh)
+        def worker():
+            try:
+                for item in load_leagues(leagues):
+                    preload_queue.put(item)
+            except Exception as e:
+                preload_queue.put((None, None, None, e))
+            preload_queue.put(None)
 
-    
+        threading.Thread(target=worker, daemon=True).start()
+        root.after(PRELOAD_POLL_MS, poll_preload_queue)
 
+    def poll_preload_queue():
+        while True:
+            try:
+                item = preload_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                preload_state["running"] = False
+                return
+            league, stamp, result, error = item
+            if error is not None:
+                print(f"Could not load {league['name'] if league else 'the other leagues'}: {error}", file=sys.stderr)
+            elif not (result["missing_pitcher_fields"] or result["missing_batter_fields"]):
+                if league["name"] != league_state["name"] and league["name"] not in league_cache:
+                    league_cache.put(league["name"], result, stamp)
+        root.after(PRELOAD_POLL_MS, poll_preload_queue)
+
+    league_select.bind("<<ComboboxSelected>>", switch_league)
+    add_league_btn.config(command=add_league_dialog)
+
+    # --- Weight file watching ---
+    # Edits to batter_weights.py / pitcher_weights.py are picked up without a reload: the
+    # affected score parts are recomputed and the tables, Teams tab and boards updated in place.
+    weights_watcher = WeightsWatcher()
+
+    def check_weights():
+        run = start_run("weights change", league_directory(current_league()))
+        components, errors = weights_watcher.poll({"batters": batters, "pitchers": pitchers})
+        league_cache.touch(league_state["name"])   # the shown league is scored with the installed weights
+        for roster, error in errors:
+            print(f"Could not reload {roster} weights: {error}", file=sys.stderr)
+            load_status_var.set(f"Could not reload {roster} weights: {error}")
+        if not components:
+            discard_run(run)
+            return
 
-    # Initial load
-    load_data()
-    apply_pitcher_filter("")
-    apply_batter_filter("")
-    update_teams_tab()
+        changed_rosters = {roster for roster, _ in components}
+        # Stale tabs are skipped: they are filled with the new scores when next shown
+        with stage("update tables"):
+            if "pitchers" in changed_rosters and tab_filled(pitcher_frame):
+                rows = pitcher_rows()
+                update_table(pitcher_table, rows, pitcher_query_index(rows))
+            if "batters" in changed_rosters and tab_filled(batter_frame):
+                rows = batter_rows()
+                update_table(batter_table, rows, batter_query_index(rows))
+            if tab_filled(teams_frame):
+                update_table(teams_table, teams_rows())
+        with stage("leaderboards and conversions"):
+            if tab_filled(leaders_frame):
+                refresh_boards(leader_boards, batters, pitchers, components)
+                show_leaderboard()
+            if tab_filled(conversions_frame):
+                show_conversions()
+            if "batters" in changed_rosters and tab_filled(lineups_frame):
+                fill_lineups_tab()
+        load_status_var.set("Weights changed, scores updated")
+        finish_profile(run)
+
+    def watch_weights():
+        if load_state["cancel"] is None:   # a running load picks the weights up itself
+            check_weights()
+        root.after(WEIGHTS_POLL_MS, watch_weights)
+
+    # Initial load, once the window is on screen: the first <Map> of the root window is the
+    # first paint. With --profile the startup run (started in Main.py) ends there.
+    def on_first_map(event):
+        if event.widget is not root:
+            return
+        root.unbind("<Map>", first_map_binding)
+        mark("window shown")
+        report = finish_run(startup_run)
+        if report is not None:
+            print(f"Startup {summary(report)}", file=sys.stderr)
+        root.after_idle(start_load)
+        root.after(WEIGHTS_POLL_MS, watch_weights)
+
+    first_map_binding = root.bind("<Map>", on_first_map)
+    mark("window built")
 
     root.mainloop()
 
@@ -0,0 +1,169 @@
+from contextlib import contextmanager
+from datetime import datetime
+import json
+import os
+from pathlib import Path
+import re
+import threading
+import time
+
+# Opt-in timings of where a load's time goes.
+# Off unless HECTOR_PROFILE is set or --profile is given:
+#   1 / timings   per-stage wall time and row counts
+#   cprofile      the same, plus a cProfile dump per stage
+# A run (a GUI reload or weight re-score, one export in cli.py) collects the stages that run
+# while it is open, from any thread, and is written as a JSON report to .hector_profile/.
+# The GUI also shows the slowest stages in its status bar. When off, stage() only checks
+# whether a run is open.
+#
+#   HECTOR_PROFILE=1 python Main.py
+#   python Main.py --profile cprofile
+#   python cli.py --profile
+#   python -m pstats .hector_profile/<run>/read_pitchers.prof
+
+ENV_VAR = "HECTOR_PROFILE"
+PROFILE_DIR_NAME = ".hector_profile"
+MODES = ("off", "timings", "cprofile")
+
+state = {"mode": None, "run": None}
+lock = threading.Lock()
+local = threading.local()
+
+
+def mode_from_env():
+    value = os.environ.get(ENV_VAR, "").strip().lower()
+    if value in ("", "0", "off"):
+        return "off"
+    return "cprofile" if value == "cprofile" else "timings"
+
+
+def configure(mode=None):
+    # mode None reads HECTOR_PROFILE; a mode given here is also exported to the environment,
+    # so worker processes pick it up
+    if mode is None:
+        mode = mode_from_env()
+    elif mode not in MODES:
+        raise ValueError(f"Unknown profiling mode {mode!r} (use one of {', '.join(MODES)})")
+    else:
+        os.environ[ENV_VAR] = "0" if mode == "off" else mode
+    state["mode"] = mode
+    return mode
+
+
+def current_mode():
+    return state["mode"] if state["mode"] is not None else configure()
+
+
+def enabled():
+    return current_mode() != "off"
+
+
+def start_run(name, directory):
+    # Opens a run whose report goes to directory/.hector_profile; None when profiling is off
+    if not enabled():
+        return None
+    started = datetime.now()
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_")
+    run = {
+        "name": name,
+        "mode": current_mode(),
+        "started": started.isoformat(timespec="seconds"),
+        "id": f"{started:%Y-%m-%d_%H%M%S_%f}_{slug}",
+        "directory": Path(directory) / PROFILE_DIR_NAME,
+        "clock": time.perf_counter(),
+        "stages": [],
+    }
+    state["run"] = run
+    return run
+
+
+@contextmanager
+def stage(name, rows=None):
+    # with stage("parse pitchers") as entry: ...; entry["rows"] = count
+    run = state["run"]
+    if run is None:
+        yield {}
+        return
+
+    entry = {"stage": name, "rows": rows, "thread": threading.current_thread().name}
+    depth = getattr(local, "depth", 0)
+    profile = None
+    if run["mode"] == "cprofile" and depth == 0:
+        # Only the outermost stage of each thread is profiled; another thread's profiler being
+        # active (Python 3.12+ allows one at a time) just skips the dump
+        import cProfile
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            profile = None
+    local.depth = depth + 1
+    start = time.perf_counter()
+    try:
+        yield entry
+    finally:
+        seconds = time.perf_counter() - start
+        local.depth = depth
+        entry["offset"] = round(start - run["clock"], 4)
+        entry["seconds"] = round(seconds, 4)
+        entry["depth"] = depth
+        if profile is not None:
+            profile.disable()
+            entry["profile"] = dump_profile(profile, run, name)
+        with lock:
+            run["stages"].append(entry)
+
+
+def mark(name):
+    # A zero-length stage: its offset records when something happened in the run
+    with stage(name):
+        pass
+
+
+def dump_profile(profile, run, name):
+    directory = run["directory"] / run["id"]
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / (re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_") + ".prof")
+    profile.dump_stats(path)
+    return str(path)
+
+
+def discard_run(run):
+    # Closes the run without a report (nothing worth keeping happened)
+    if run is not None and state["run"] is run:
+        state["run"] = None
+
+
+def finish_run(run):
+    # Closes the run and writes its report; returns the report (None for no run)
+    if run is None:
+        return None
+    if state["run"] is run:
+        state["run"] = None
+    with lock:
+        stages = sorted(run["stages"], key=lambda entry: entry["offset"])
+    report = {
+        "name": run["name"],
+        "mode": run["mode"],
+        "started": run["started"],
+        "seconds": round(time.perf_counter() - run["clock"], 4),
+        "stages": stages,
+    }
+    try:
+        run["directory"].mkdir(parents=True, exist_ok=True)
+        path = run["directory"] / f"{run['id']}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        report["path"] = str(path)
+    except OSError as e:
+        report["error"] = str(e)
+    return report
+
+
+def summary(report, count=3):
+    # "1.52s: read pitchers 0.61s, read batters 0.48s, fill batters table 0.20s"
+    if report is None:
+        return ""
+    top = sorted((entry for entry in report["stages"] if entry["depth"] == 0), key=lambda e: e["seconds"], reverse=True)
+    parts = ", ".join(f"{entry['stage']} {entry['seconds']:.2f}s" for entry in top[:count])
+    return f"{report['seconds']:.2f}s: {parts}" if parts else f"{report['seconds']:.2f}s"
@@ -0,0 +1,130 @@
+import heapq
+
+import pitchers as pitcher_module
+from pitchers import parse_value, flatten_weights
+
+# Top-N leaderboards per position.
+# Every board is filled in a single pass over the roster, keeping one bounded min-heap per
+# position, so building all of them costs O(players * log N) instead of sorting the roster.
+# Each board lists the score components it reads, so after a re-score only the boards
+# whose components changed have to be rebuilt (see refresh_boards).
+
+BATTER_POSITIONS = ["C", "1B", "2B", "3B", "SS", "LF", "CF", "RF", "DH"]
+PITCHER_POSITIONS = ["SP", "RP"]
+MAX_POTENTIAL_AGE = 25
+CORE_POTENTIAL_HEADERS = ["STU P", "MOV P", "CON P"]
+
+
+def to_age(player):
+    try:
+        return float(player.get("Age", ""))
+    except ValueError:
+        return None
+
+
+def pitcher_position(player):
+    return "RP" if player.get("POS") == "CL" else player.get("POS", "")
+
+
+def batter_total(player):
+    return player["Scores"].get("total", 0)
+
+
+def batter_potential(player):
+    # Offense Potential + Defense, for players 25 and under
+    age = to_age(player)
+    if age is None or age > MAX_POTENTIAL_AGE:
+        return None
+    return round(player["Scores"].get("offense_potential", 0) + player["Scores"].get("defense", 0), 2)
+
+
+def pitcher_total(player):
+    return player["Scores"].get("total", 0)
+
+
+def pitcher_potential_scorer(weights=None):
+    # Core attribute potentials (STU P/MOV P/CON P) + pitch potential
+    flat_weights = flatten_weights(weights if weights is not None else pitcher_module.section_weights)
+    terms = [
+        (header, flat_weights.get(key, 0))
+        for header, key in zip(CORE_POTENTIAL_HEADERS, ("stuff_potential", "movement_potential", "control_potential"))
+    ]
+
+    def pitcher_potential(player):
+        core = 0
+        for header, weight in terms:
+            core += parse_value(header, player.get(header, "")) * weight
+        return round(core + player["Scores"].get("pitches_potential", 0), 2)
+    return pitcher_potential
+
+
+# board name -> (roster, position function, score function factory, score components it reads)
+# Components are (roster, Scores key); the core potentials behind pitchers_potential also feed
+# the pitcher total, so a change to them always shows up as ("pitchers", "total").
+BOARDS = {
+    "batters_total": (
+        "batters", lambda p: p.get("POS", ""), lambda: batter_total, {("batters", "total")}
+    ),
+    "batters_potential": (
+        "batters", lambda p: p.get("POS", ""), lambda: batter_potential,
+        {("batters", "offense_potential"), ("batters", "defense")}
+    ),
+    "pitchers_total": (
+        "pitchers", pitcher_position, lambda: pitcher_total, {("pitchers", "total")}
+    ),
+    "pitchers_potential": (
+        "pitchers", pitcher_position, pitcher_potential_scorer,
+        {("pitchers", "pitches_potential"), ("pitchers", "total")}
+    ),
+}
+
+BOARD_TITLES = {
+    "batters_total": "Batters - Total Score",
+    "batters_potential": f"Batters - Potential ({MAX_POTENTIAL_AGE} and under)",
+    "pitchers_total": "Pitchers - Total Score",
+    "pitchers_potential": "Pitchers - Potential",
+}
+
+
+def top_n_by_position(players, position_of, score_of, n=10, positions=None):
+    # One pass, one bounded heap per position. Returns {pos: [(score, player), ...]} best first;
+    # ties keep roster order. positions limits which positions get a board.
+    heaps = {}
+    for index, player in enumerate(players):
+        pos = position_of(player)
+        if positions is not None and pos not in positions:
+            continue
+        score = score_of(player)
+        if score is None:
+            continue
+        heap = heaps.setdefault(pos, [])
+        entry = (score, -index, player)
+        if len(heap) < n:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+    return {
+        pos: [(score, player) for score, _, player in sorted(heap, key=lambda e: e[:2], reverse=True)]
+        for pos, heap in heaps.items()
+    }
+
+
+def build_board(name, rosters, n=10):
+    roster, position_of, make_score, _ = BOARDS[name]
+    positions = BATTER_POSITIONS if roster == "batters" else PITCHER_POSITIONS
+    return top_n_by_position(rosters[roster], position_of, make_score(), n, positions)
+
+
+def build_boards(batters, pitchers, n=10):
+    rosters = {"batters": batters, "pitchers": pitchers}
+    return {name: build_board(name, rosters, n) for name in BOARDS}
+
+
+def refresh_boards(boards, batters, pitchers, changed_components, n=10):
+    # Rebuilds only the boards that read a changed (roster, Scores key) component
+    rosters = {"batters": batters, "pitchers": pitchers}
+    changed_components = set(changed_components)
+    for name, (_, _, _, components) in BOARDS.items():
+        if name not in boards or components & changed_components:
+            boards[name] = build_board(name, rosters, n)
+    return boards
@@ -0,0 +1,252 @@
+import argparse
+import json
+import sys
+
+import batters as batter_module
+from batters import batter_columns, offense_part, potential_part, defense_part
+from data_loader import load_all
+from leaderboards import BATTER_POSITIONS
+from teams import factorize
+
+# Best defensive lineup plus DH for every team.
+# calculate_batter_score only scores a batter at their listed POS, but the export carries
+# catcher, infield and outfield ratings for everyone. Here every batter is scored at every
+# position with that position's section_weights defense terms (DH: no defense), one column
+# pass per position over the whole league, the way conversions.py projects a move. Each team's
+# positions are then filled by a minimum-cost assignment (Hungarian method, O(positions^2 x
+# batters)) on the negated scores, so the lineup is optimal without trying every permutation.
+#
+# Ties go to the listed position: 1B/2B and LF/RF share their default weights, so without
+# that a team's first and second basemen could trade places for nothing.
+#
+# The lineup is compared with the depth-chart lineup: the best batter listed at each
+# position, and the best of the rest at DH.
+#
+#   python lineups.py                     every team, best total first
+#   python lineups.py CAS TOR             those teams' lineups, position by position
+#   python lineups.py --json lineups.json
+
+FIELD_POSITIONS = [pos for pos in BATTER_POSITIONS if pos != "DH"]
+LINEUP_COLUMNS = ("POS", "Name", "Age", "Listed", "Score", "Listed Score", "Change")
+LINEUP_TEAM_COLUMNS = ("Team", "Lineup Total", "Depth Chart Total", "Gain", "Moved")
+
+# Added to a player's score at their listed position when assigning; far below the 0.01 the
+# totals are rounded to, so it only decides between equal lineups
+LISTED_TIE_BREAK = 1e-6
+
+
+def position_scores(players, weights=None):
+    # pos -> unrounded total of every player as if they played pos
+    if weights is None:
+        weights = batter_module.section_weights
+    columns = batter_columns(players)
+    bat = [o + p for o, p in zip(offense_part(columns, weights), potential_part(columns, weights))]
+    rows = list(range(columns["count"]))
+    scores = {}
+    for pos in BATTER_POSITIONS:
+        if pos == "DH":
+            scores[pos] = bat
+            continue
+        columns["pos_rows"] = {pos: rows}
+        scores[pos] = [b + d for b, d in zip(bat, defense_part(columns, weights))]
+    return scores
+
+
+def min_cost_assignment(cost):
+    # cost: one row per task, at least as many columns as rows. Returns the column given to
+    # each row so the summed cost is lowest (shortest augmenting paths with potentials).
+    n = len(cost)
+    m = len(cost[0]) if n else 0
+    inf = float("inf")
+    u = [0] * (n + 1)
+    v = [0] * (m + 1)
+    owner = [0] * (m + 1)   # column -> row holding it (1-based, 0 = free)
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        owner[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = owner[j0]
+            row = cost[i0 - 1]
+            ui0 = u[i0]
+            delta = inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if used[j]:
+                    continue
+                cur = row[j - 1] - ui0 - v[j]
+                if cur < minv[j]:
+                    minv[j] = cur
+                    way[j] = j0
+                if minv[j] < delta:
+                    delta = minv[j]
+                    j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[owner[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if owner[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+
+    assigned = [None] * n
+    for j in range(1, m + 1):
+        if owner[j]:
+            assigned[owner[j] - 1] = j - 1
+    return assigned
+
+
+def best_assignment(scores):
+    # scores[position][player]; the player for each position (None when the team is short)
+    # so the summed score is highest
+    if not scores or not scores[0]:
+        return [None] * len(scores)
+    if len(scores) <= len(scores[0]):
+        return min_cost_assignment([[-s for s in row] for row in scores])
+    # Fewer players than positions: give each player a position instead
+    by_player = min_cost_assignment([[-row[k] for row in scores] for k in range(len(scores[0]))])
+    assigned = [None] * len(scores)
+    for player, pos in enumerate(by_player):
+        assigned[pos] = player
+    return assigned
+
+
+def depth_chart(rows, listed, scores):
+    # pos -> row: the best player listed at each position, then the best of the rest at DH
+    chart = {}
+    for pos in FIELD_POSITIONS:
+        at_pos = [row for row, listed_pos in zip(rows, listed) if listed_pos == pos]
+        if at_pos:
+            chart[pos] = max(at_pos, key=lambda row: scores[pos][row])
+    taken = set(chart.values())
+    rest = [row for row in rows if row not in taken]
+    if rest:
+        chart["DH"] = max(rest, key=lambda row: scores["DH"][row])
+    return chart
+
+
+def team_lineup(players, rows, scores):
+    listed = [str(players[row].get("POS", "")).upper() for row in rows]
+    assigned = best_assignment([
+        [scores[pos][row] + (LISTED_TIE_BREAK if pos == listed_pos else 0) for row, listed_pos in zip(rows, listed)]
+        for pos in BATTER_POSITIONS
+    ])
+    slots = []
+    for pos, k in zip(BATTER_POSITIONS, assigned):
+        if k is None:
+            slots.append({"pos": pos, "player": None, "score": 0, "listed_score": 0})
+            continue
+        player = players[rows[k]]
+        slots.append({
+            "pos": pos,
+            "player": player,
+            "score": round(scores[pos][rows[k]], 2),
+            "listed_score": player["Scores"].get("total", 0),
+        })
+    total = sum(scores[pos][rows[k]] for pos, k in zip(BATTER_POSITIONS, assigned) if k is not None)
+    chart = depth_chart(rows, listed, scores)
+    chart_total = sum(scores[pos][row] for pos, row in chart.items())
+    return {
+        "slots": slots,
+        "total": round(total, 2),
+        "depth_chart_total": round(chart_total, 2),
+        "gain": round(total - chart_total, 2),
+        "moved": sum(1 for pos, k in zip(BATTER_POSITIONS, assigned) if k is not None and pos != "DH" and listed[k] != pos),
+    }
+
+
+def best_lineups(players, weights=None, teams=None):
+    # team -> team_lineup, for every ORG (or just teams)
+    scores = position_scores(players, weights)
+    codes, names = factorize([player.get("ORG", "Unknown") for player in players])
+    team_rows = [[] for _ in names]
+    for row, code in enumerate(codes):
+        team_rows[code].append(row)
+    return {
+        team: team_lineup(players, rows, scores)
+        for team, rows in zip(names, team_rows)
+        if teams is None or team in teams
+    }
+
+
+def lineup_rows(lineup):
+    rows = []
+    for slot in lineup["slots"]:
+        player = slot["player"]
+        if player is None:
+            rows.append((slot["pos"], "-", "", "", 0, 0, 0))
+            continue
+        rows.append((
+            slot["pos"], player.get("Name", ""), player.get("Age", ""), player.get("POS", ""),
+            slot["score"], slot["listed_score"], round(slot["score"] - slot["listed_score"], 2),
+        ))
+    return rows
+
+
+def lineup_team_rows(lineups):
+    # One row per team, best lineup total first
+    rows = [
+        (team, lineup["total"], lineup["depth_chart_total"], lineup["gain"], lineup["moved"])
+        for team, lineup in lineups.items()
+    ]
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return rows
+
+
+def lineup_json(lineup):
+    return {
+        "total": lineup["total"],
+        "depth_chart_total": lineup["depth_chart_total"],
+        "gain": lineup["gain"],
+        "moved": lineup["moved"],
+        "lineup": [dict(zip(LINEUP_COLUMNS, row), ID=slot["player"].get("ID", "") if slot["player"] else "")
+                   for slot, row in zip(lineup["slots"], lineup_rows(lineup))],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="lineups.py", description="Best defensive lineup plus DH for each team.")
+    parser.add_argument("teams", nargs="*", help="teams (ORG) to show position by position (default: a summary of all)")
+    parser.add_argument("--dir", default=None, help="export folder (default: the exports next to the app)")
+    parser.add_argument("--json", default=None, help="write every team's lineup to this JSON file")
+    args = parser.parse_args(argv)
+
+    result = load_all(directory=args.dir)
+    batters = result["batters"]
+    wanted = {team.upper() for team in args.teams} or None
+    lineups = best_lineups(batters, teams=wanted)
+    if wanted:
+        unknown = wanted - set(lineups)
+        if unknown:
+            parser.error(f"no team called {', '.join(sorted(unknown))}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({team: lineup_json(lineup) for team, lineup in lineups.items()}, f, indent=2)
+
+    if not wanted:
+        print("  " + " | ".join(LINEUP_TEAM_COLUMNS))
+        for row in lineup_team_rows(lineups):
+            print("  " + " | ".join(str(value) for value in row))
+        return 0
+    for team in args.teams:
+        lineup = lineups[team.upper()]
+        print(f"{team.upper()}: {lineup['total']} (depth chart {lineup['depth_chart_total']}, gain {lineup['gain']})")
+        print("  " + " | ".join(LINEUP_COLUMNS))
+        for row in lineup_rows(lineup):
+            print("  " + " | ".join(str(value) for value in row))
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,12 @@
-from bs4 import BeautifulSoup
 from pathlib import Path
 import sys
 import os
 import importlib.util
+import threading
 import re
+from array import array
+from player_store import PlayerStore
+from instrument import stage
 
 def get_base_path():
     if getattr(sys, 'frozen', False):
@@ -21,124 +24,164 @@ def import_weights_module(module_name):
     spec.loader.exec_module(module)
     return module
 
-# Load pitcher_weights dynamically
-pitcher_weights = import_weights_module("pitcher_weights")
-section_weights = pitcher_weights.section_weights  # get the variable from the module
+# Load pitcher_weights dynamically, the first time scores are needed rather than at import,
+# so the window can open before the weights file runs. weights_watcher replaces
+# section_weights when the file is edited.
+weights_lock = threading.Lock()
 
-def load_pitchers_data(filename="pitchers.html"):
+def load_section_weights():
+    global pitcher_weights, section_weights
+    with weights_lock:
+        if "section_weights" not in globals():
+            pitcher_weights = import_weights_module("pitcher_weights")
+            section_weights = pitcher_weights.section_weights  # get the variable from the module
+    return section_weights
+
+def __getattr__(attr):
+    # pitchers.section_weights from other modules loads the weights on first use
+    if attr in ("section_weights", "pitcher_weights"):
+        load_section_weights()
+        return globals()[attr]
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
+
+def load_pitchers_data(filename="pitchers.html", use_cache=True, executor=None):
     base_path = get_base_path()
     html_path = base_path / filename
 
-    with open(html_path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f, "html.parser")
+    # Stream rows out of the data table (or the parsed-export cache) into a compact player store.
+    # The parser and cache are imported here rather than at the top so opening the window doesn't wait on them.
+    from table_reader import iter_export_rows
+    from export_cache import cached_table_rows
+    if use_cache:
+        table_rows = cached_table_rows(html_path, executor=executor)
+    else:
+        table_rows = iter_export_rows(html_path, executor=executor)
+    with stage("read pitchers") as entry:
+        headers, rows = [], []
+        for headers, cells in table_rows:
+            if len(cells) == len(headers):
+                rows.append(cells)
+        entry["rows"] = len(rows)
+    with stage("store pitchers", len(rows)):
+        players = PlayerStore(headers, rows)
+
+    # Score the whole roster in one batch
+    with stage("score pitchers", len(players)):
+        players.add_column('Scores', score_pitchers(players))
 
-    # Locate the player table
-    table = soup.find("table", class_="data")
-    if not table:
-        raise ValueError("No table with class 'data' found in HTML file.")
+    return players
 
-    # Extract headers
-    headers = [th.get_text(strip=True) for th in table.find("thead").find_all("th")]
+HEADER_TO_WEIGHT = {
+    'STU': 'stuff',
+    'MOV': 'movement',
+    'CON': 'control',
+    'STU P': 'stuff_potential',
+    'MOV P': 'movement_potential',
+    'CON P': 'control_potential',
+    'OVR': 'overall_rating',
+    'POT': 'potential_rating',
+    'PIT': 'number_of_pitches',
+    'VELO': 'velocity',
+    'STM': 'stamina',
+    'G/F': 'ground_fly_ratio',
+    'HLD': 'holds',
+    'SctAcc': 'scout_accuracy',
+    # Pitch fields normalized:
+    'FB': 'fastball',
+    'FBP': 'fastball_potential',
+    'CH': 'changeup',
+    'CHP': 'changeup_potential',
+    'CB': 'curveball',
+    'CBP': 'curveball_potential',
+    'SL': 'slider',
+    'SLP': 'slider_potential',
+    'SI': 'sinker',
+    'SIP': 'sinker_potential',
+    'SP': 'splitter',
+    'SPP': 'splitter_potential',
+    'CT': 'cutter',
+    'CTP': 'cutter_potential',
+    'FO': 'forkball',
+    'FOP': 'forkball_potential',
+    'CC': 'circle_change',
+    'CCP': 'circle_change_potential',
+    'SC': 'screwball',
+    'SCP': 'screwball_potential',
+    'KC': 'knuckle_curve',
+    'KCP': 'knuckle_curve_potential',
+    'KN': 'knuckleball',
+    'KNP': 'knuckleball_potential',
+}
 
-    # Extract rows and build player dictionaries with scores
-    players = []
-    for row in table.find("tbody").find_all("tr"):
-        cells = [td.get_text(strip=True) for td in row.find_all("td")]
-        if len(cells) == len(headers):
-            player_data = dict(zip(headers, cells))
-            player_data['Scores'] = calculate_score(player_data)
-            players.append(player_data)
+PITCH_HEADERS = ['FB','CH','CB','SL','SI','SP','CT','FO','CC','SC','KC','KN']
+PITCH_POTENTIAL_HEADERS = ['FBP','CHP','CBP','SLP','SIP','SPP','CTP','FOP','CCP','SCP','KCP','KNP']
 
-    return players
+# Which score each header feeds
+TOTAL, PITCHES, PITCHES_POTENTIAL = 0, 1, 2
+
+def score_bucket(header):
+    # Add to pitches separately, do NOT add to total_score
+    if header in PITCH_HEADERS:
+        return PITCHES
+    if header in PITCH_POTENTIAL_HEADERS:
+        return PITCHES_POTENTIAL
+    return TOTAL
+
+def flatten_weights(weights):
+    # Flatten weights except nested 'pitches'
+    flat_weights = {k.lower(): v for k, v in weights.items() if k != 'pitches'}
+    for pitch, w in weights.get('pitches', {}).items():
+        flat_weights[pitch.lower().replace(" ", "_")] = w
+    return flat_weights
+
+def parse_value(header, value):
+    raw_value = value.strip()
+    try:
+        if "Stars" in raw_value:
+            num = float(raw_value.split()[0])
+        elif "-" in raw_value and header == "VELO":
+            parts = [part.strip() for part in raw_value.replace("mph", "").split("-")]
+            nums = []
+            for p in parts:
+                try:
+                    nums.append(float(p))
+                except ValueError:
+                    pass
+            num = sum(nums) / len(nums) if nums else 0
+        elif raw_value == "-" or raw_value == "":
+            num = 0
+        else:
+            match = re.search(r"\d+(\.\d+)?", raw_value)
+            if match:
+                num = float(match.group(0))
+            else:
+                num = 0
+    except Exception:
+        num = 0
+    return num
 
 def calculate_score(player):
     total_score = 0
     pitches_score = 0
     pitches_potential_score = 0
 
-    # Flatten weights except nested 'pitches'
-    flat_weights = {k.lower(): v for k, v in section_weights.items() if k != 'pitches'}
-    for pitch, w in section_weights.get('pitches', {}).items():
-        flat_weights[pitch.lower().replace(" ", "_")] = w
-
-    header_to_weight = {
-        'STU': 'stuff',
-        'MOV': 'movement',
-        'CON': 'control',
-        'STU P': 'stuff_potential',
-        'MOV P': 'movement_potential',
-        'CON P': 'control_potential',
-        'OVR': 'overall_rating',
-        'POT': 'potential_rating',
-        'PIT': 'number_of_pitches',
-        'VELO': 'velocity',
-        'STM': 'stamina',
-        'G/F': 'ground_fly_ratio',
-        'HLD': 'holds',
-        'SctAcc': 'scout_accuracy',
-        # Pitch fields normalized:
-        'FB': 'fastball',
-        'FBP': 'fastball_potential',
-        'CH': 'changeup',
-        'CHP': 'changeup_potential',
-        'CB': 'curveball',
-        'CBP': 'curveball_potential',
-        'SL': 'slider',
-        'SLP': 'slider_potential',
-        'SI': 'sinker',
-        'SIP': 'sinker_potential',
-        'SP': 'splitter',
-        'SPP': 'splitter_potential',
-        'CT': 'cutter',
-        'CTP': 'cutter_potential',
-        'FO': 'forkball',
-        'FOP': 'forkball_potential',
-        'CC': 'circle_change',
-        'CCP': 'circle_change_potential',
-        'SC': 'screwball',
-        'SCP': 'screwball_potential',
-        'KC': 'knuckle_curve',
-        'KCP': 'knuckle_curve_potential',
-        'KN': 'knuckleball',
-        'KNP': 'knuckleball_potential',
-    }
+    section_weights = load_section_weights()
+    flat_weights = flatten_weights(section_weights)
 
     for header, value in player.items():
-        weight_key = header_to_weight.get(header)
+        weight_key = HEADER_TO_WEIGHT.get(header)
         if not weight_key:
             continue
         weight = flat_weights.get(weight_key, 0)
         if weight == 0:
             continue
 
-        raw_value = value.strip()
-        try:
-            if "Stars" in raw_value:
-                num = float(raw_value.split()[0])
-            elif "-" in raw_value and header == "VELO":
-                parts = [part.strip() for part in raw_value.replace("mph", "").split("-")]
-                nums = []
-                for p in parts:
-                    try:
-                        nums.append(float(p))
-                    except ValueError:
-                        pass
-                num = sum(nums) / len(nums) if nums else 0
-            elif raw_value == "-" or raw_value == "":
-                num = 0
-            else:
-                match = re.search(r"\d+(\.\d+)?", raw_value)
-                if match:
-                    num = float(match.group(0))
-                else:
-                    num = 0
-        except Exception:
-            num = 0
+        num = parse_value(header, value)
 
-        # Add to pitches separately, do NOT add to total_score
-        if header in ['FB','CH','CB','SL','SI','SP','CT','FO','CC','SC','KC','KN']:
+        bucket = score_bucket(header)
+        if bucket == PITCHES:
             pitches_score += num * weight
-        elif header in ['FBP','CHP','CBP','SLP','SIP','SPP','CTP','FOP','CCP','SCP','KCP','KNP']:
+        elif bucket == PITCHES_POTENTIAL:
             pitches_potential_score += num * weight
         else:
             total_score += num * weight
@@ -157,3 +200,129 @@ def calculate_score(player):
         'pitches': round(pitches_score, 2),
         'pitches_potential': round(pitches_potential_score, 2)
     }
+
+# --- Batch scoring ---
+# The roster is parsed once into numeric columns, and section_weights is compiled once into
+# a column -> (weight, bucket) vector. Scores are then accumulated column by column in the
+# export's header order, which is the same order calculate_score adds them in, so the
+# results match the per-player numbers exactly.
+
+def compile_weights(weights=None):
+    if weights is None:
+        weights = load_section_weights()
+    flat_weights = flatten_weights(weights)
+    compiled = {}
+    for header, weight_key in HEADER_TO_WEIGHT.items():
+        weight = flat_weights.get(weight_key, 0)
+        if weight != 0:
+            compiled[header] = (weight, score_bucket(header))
+    return compiled
+
+def pitcher_columns(players):
+    headers = [h for h in (players[0] if players else {}) if h in HEADER_TO_WEIGHT]
+    columns = {"count": len(players), "headers": headers}
+
+    # Rating strings repeat a lot (20-80 scale, "-"), so each distinct one is parsed once
+    for header in headers:
+        if isinstance(players, PlayerStore):
+            columns[header] = players.parsed_column(header, lambda raw: parse_value(header, raw))
+            continue
+        memo = {}
+        values = array('d')
+        for player in players:
+            raw = player.get(header)
+            if raw is None:
+                values.append(0.0)
+                continue
+            num = memo.get(raw)
+            if num is None:
+                num = memo[raw] = parse_value(header, raw)
+            values.append(num)
+        columns[header] = values
+
+    # Penalty flags: 1 = applies, 0 = doesn't. An unreadable PIT skips both, like calculate_score
+    low_pitches = array('b')
+    low_stamina = array('b')
+    for player in players:
+        try:
+            low_pitches.append(int(player.get("PIT", 0)) < 4)
+        except ValueError:
+            low_pitches.append(0)
+            low_stamina.append(0)
+            continue
+        try:
+            low_stamina.append(int(player.get("STM", 0)) < 50)
+        except ValueError:
+            low_stamina.append(0)
+    columns["low_pitches"] = low_pitches
+    columns["low_stamina"] = low_stamina
+    return columns
+
+BUCKET_NAMES = {TOTAL: 'total', PITCHES: 'pitches', PITCHES_POTENTIAL: 'pitches_potential'}
+
+def score_parts(columns, weights=None, parts=None, names=tuple(BUCKET_NAMES.values())):
+    # Recomputes the named score buckets into parts (a dict of name -> values) and returns it.
+    # The buckets never read each other, so each can be recomputed on its own.
+    if weights is None:
+        weights = load_section_weights()
+    if parts is None:
+        parts = {}
+    compiled = compile_weights(weights)
+    count = columns["count"]
+    sums = {bucket: [0] * count for bucket, name in BUCKET_NAMES.items() if name in names}
+
+    for header in columns["headers"]:
+        entry = compiled.get(header)
+        if entry is None or entry[1] not in sums:
+            continue
+        weight, bucket = entry
+        acc = sums[bucket]
+        for i, num in enumerate(columns[header]):
+            acc[i] += num * weight
+
+    if TOTAL in sums:
+        total = sums[TOTAL]
+        penalty = weights.get('penalty_sp_low_pitches', 0)
+        for i, flag in enumerate(columns["low_pitches"]):
+            if flag:
+                total[i] += penalty
+        penalty = weights.get('penalty_sp_low_stamina', 0)
+        for i, flag in enumerate(columns["low_stamina"]):
+            if flag:
+                total[i] += penalty
+
+    for bucket, acc in sums.items():
+        parts[BUCKET_NAMES[bucket]] = acc
+    return parts
+
+def changed_score_parts(old_weights, new_weights):
+    changed = set()
+    old_flat = flatten_weights(old_weights)
+    new_flat = flatten_weights(new_weights)
+    for header, weight_key in HEADER_TO_WEIGHT.items():
+        if old_flat.get(weight_key, 0) != new_flat.get(weight_key, 0):
+            changed.add(BUCKET_NAMES[score_bucket(header)])
+    for key in ('penalty_sp_low_pitches', 'penalty_sp_low_stamina'):
+        if old_weights.get(key, 0) != new_weights.get(key, 0):
+            changed.add('total')
+    return changed
+
+def score_pitcher_columns(columns, weights=None):
+    parts = score_parts(columns, weights)
+    return [
+        {
+            'total': round(t, 2),
+            'pitches': round(p, 2),
+            'pitches_potential': round(pp, 2)
+        }
+        for t, p, pp in zip(parts['total'], parts['pitches'], parts['pitches_potential'])
+    ]
+
+def update_pitcher_scores(players, parts, names):
+    # Writes the named buckets into each player's Scores
+    for name in names:
+        for player, value in zip(players, parts[name]):
+            player['Scores'][name] = round(value, 2)
+
+def score_pitchers(players, weights=None):
+    return score_pitcher_columns(pitcher_columns(players), weights)
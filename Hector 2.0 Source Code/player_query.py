@@ -0,0 +1,168 @@
+from bisect import bisect_left, bisect_right
+import re
+
+# Search box query language, evaluated against prebuilt indexes.
+#
+#   >25  <=30  =27        age comparisons (a bare comparison is on age)
+#   total>=40  off>30     comparisons on any indexed numeric column (see the aliases below)
+#   CAS  atl              team codes (several teams = any of them)
+#   1b  SS  rp            positions (several positions = any of them)
+#   smi                   anything else is a name prefix, matched against each word of the name
+#
+# A team or position code is also still a name prefix: "sea" finds SEA players and Kyle
+# Seager, "c" finds catchers and every name starting with C.
+# Terms of different kinds are ANDed: ">25 CAS 1b" is 1B on CAS older than 25.
+# Teams and positions use hash indexes, numbers use sorted arrays and bisect,
+# name prefixes use a sorted word list, so no query walks the whole roster.
+
+COMPARISON = re.compile(r"^([a-z]*)(>=|<=|>|<|=)(-?\d+(?:\.\d+)?)$")
+NAME_WORD = re.compile(r"[a-z0-9]+")
+
+FIELD_ALIASES = {
+    "": "age",
+    "age": "age",
+    "score": "total",
+    "total": "total",
+    "tot": "total",
+    "off": "offense",
+    "offense": "offense",
+    "offpot": "offense_potential",
+    "pot": "offense_potential",
+    "def": "defense",
+    "defense": "defense",
+    "pitch": "pitches",
+    "pitches": "pitches",
+    "pitchpot": "pitches_potential",
+}
+
+
+def to_float(value):
+    try:
+        return float(str(value).replace("Stars", "").strip())
+    except ValueError:
+        return None
+
+
+def build_index(names, teams, positions, numbers):
+    # names/teams/positions: one entry per row; numbers: {field: values per row}
+    index = {"count": len(names), "team": {}, "pos": {}, "numbers": {}}
+
+    for row, team in enumerate(teams):
+        index["team"].setdefault(str(team or "").upper(), []).append(row)
+    for row, pos in enumerate(positions):
+        index["pos"].setdefault(str(pos or "").upper(), []).append(row)
+
+    words = []
+    for row, name in enumerate(names):
+        for word in set(NAME_WORD.findall(str(name).lower())):
+            words.append((word, row))
+    words.sort()
+    index["name_words"] = [w for w, _ in words]
+    index["name_rows"] = [r for _, r in words]
+
+    for field, values in numbers.items():
+        index["numbers"][field] = number_index(values)
+
+    return index
+
+
+def number_index(values):
+    # (sorted numbers, their rows) for one value per row; unreadable values are left out
+    pairs = sorted((v, row) for row, v in enumerate(map(to_float, values)) if v is not None)
+    return [v for v, _ in pairs], [row for _, row in pairs]
+
+
+def parse_query(text, index):
+    # Returns a list of (kind, key, value) terms
+    terms = []
+    for token in text.strip().lower().split():
+        match = COMPARISON.match(token)
+        if match and FIELD_ALIASES.get(match.group(1)) in index["numbers"]:
+            terms.append(("number", FIELD_ALIASES[match.group(1)], (match.group(2), float(match.group(3)))))
+        elif token.upper() in index["team"]:
+            terms.append(("team", None, token.upper()))
+        elif token.upper() in index["pos"]:
+            terms.append(("pos", None, token.upper()))
+        else:
+            # "abdul-basit" or "o'neil" match the same name words they contain
+            terms.extend(("name", None, word) for word in NAME_WORD.findall(token))
+    return terms
+
+
+def number_rows(index, field, op, value):
+    values, rows = index["numbers"][field]
+    if op == ">":
+        return rows[bisect_right(values, value):]
+    if op == ">=":
+        return rows[bisect_left(values, value):]
+    if op == "<":
+        return rows[:bisect_left(values, value)]
+    if op == "<=":
+        return rows[:bisect_right(values, value)]
+    return rows[bisect_left(values, value):bisect_right(values, value)]
+
+
+def name_rows(index, prefix):
+    words = index["name_words"]
+    start = bisect_left(words, prefix)
+    end = bisect_left(words, prefix + "\uffff")
+    return index["name_rows"][start:end]
+
+
+def code_rows(index, code):
+    # Rows on team code, at position code, or with a name word starting with it
+    rows = set(index["team"].get(code, ())) | set(index["pos"].get(code, ()))
+    words = NAME_WORD.findall(code.lower())
+    if words:
+        named = set(name_rows(index, words[0]))
+        for word in words[1:]:
+            named &= set(name_rows(index, word))
+        rows |= named
+    return rows
+
+
+def run_query(index, text):
+    # Returns the set of matching row numbers, or None when the query has no terms (everything matches)
+    terms = parse_query(text, index)
+    if not terms:
+        return None
+
+    # Teams OR together, positions OR together; everything else ANDs
+    teams = [value for kind, _, value in terms if kind == "team"]
+    positions = [value for kind, _, value in terms if kind == "pos"]
+    candidate_sets = []
+    if teams:
+        candidate_sets.append(set().union(*(code_rows(index, t) for t in teams)))
+    if positions:
+        candidate_sets.append(set().union(*(code_rows(index, p) for p in positions)))
+    for kind, field, value in terms:
+        if kind == "number":
+            candidate_sets.append(set(number_rows(index, field, *value)))
+        elif kind == "name":
+            candidate_sets.append(set(name_rows(index, value)))
+
+    candidate_sets.sort(key=len)
+    result = candidate_sets[0]
+    for rows in candidate_sets[1:]:
+        if not result:
+            break
+        result = result & rows
+    return result
+
+
+def query_narrows(index, old_text, new_text):
+    # True when every row matching new_text also matches old_text, so a filter can
+    # re-check only the rows that are showing
+    old_terms = parse_query(old_text, index)
+    new_terms = parse_query(new_text, index)
+    for kind, field, value in old_terms:
+        if kind in ("team", "pos"):
+            # OR groups: the new query must use exactly the same group
+            if sorted(t for t in old_terms if t[0] == kind) != sorted(t for t in new_terms if t[0] == kind):
+                return False
+        elif kind == "name":
+            if not any(k == "name" and v.startswith(value) for k, _, v in new_terms):
+                return False
+        elif (kind, field, value) not in new_terms:
+            return False
+    return True
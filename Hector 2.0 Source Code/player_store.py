@@ -0,0 +1,234 @@
+from array import array
+import re
+
+# Compact player rosters.
+# Instead of one dict of ~46 strings per player, a PlayerStore keeps one typed column per
+# export header and hands out small row views that behave like the old dicts
+# (p.get("Name"), p["Scores"], "POS" in p, p.items(), p["Scores"] = ...):
+#  - ratings and other whole-number columns are unsigned arrays (1 byte a cell for 20-80
+#    ratings); the odd non-number cell ("-", "") is stored as a code above the largest number
+#  - repeated text (ORG, POS, Prone, B, T, star ratings, VELO, ...) is codes into a value list
+#  - near-unique text (names) stays a plain list of strings
+# Views give back exactly the strings that were exported, so callers see no difference;
+# scoring can skip them and read the numbers straight from the columns (parsed_column).
+
+INT_VALUE = re.compile(r"(?:0|[1-9]\d*)\Z")
+MAX_SPECIAL_VALUES = 8      # non-number cells an int column may have (distinct)
+
+
+class Missing:
+    # Marks a key a player doesn't have; copies and pickles keep it the same object
+    def __reduce__(self):
+        return "MISSING"
+
+    def __repr__(self):
+        return "MISSING"
+
+
+MISSING = Missing()
+
+UNSIGNED_TYPECODES = [(code, 2 ** (8 * array(code).itemsize) - 1) for code in ("B", "H", "I", "Q")]
+
+
+def unsigned_typecode(largest):
+    for code, limit in UNSIGNED_TYPECODES:
+        if largest <= limit:
+            return code
+    return None
+
+
+def build_column(values):
+    # (kind, data, extra) for one column of strings
+    lookup = {}
+    codes = [lookup.setdefault(value, len(lookup)) for value in values]
+    uniques = list(lookup)
+
+    numbers = [int(value) for value in uniques if INT_VALUE.match(value)]
+    specials = [value for value in uniques if not INT_VALUE.match(value)]
+    if numbers and len(specials) <= MAX_SPECIAL_VALUES:
+        base = max(numbers) + 1
+        typecode = unsigned_typecode(base + len(specials))
+        if typecode is not None:
+            special_codes = {value: base + i for i, value in enumerate(specials)}
+            stored = [special_codes[value] if value in special_codes else int(value) for value in uniques]
+            return "int", array(typecode, [stored[code] for code in codes]), (base, specials)
+
+    if len(uniques) * 2 <= len(values):
+        return "cat", array(unsigned_typecode(len(uniques)), codes), uniques
+    return "str", list(values), None
+
+
+def column_getter(kind, data, extra):
+    # row -> the cell's original string
+    if kind == "int":
+        base, specials = extra
+        def get(row):
+            value = data[row]
+            return str(value) if value < base else specials[value - base]
+        return get
+    if kind == "cat":
+        return lambda row: extra[data[row]]
+    return data.__getitem__
+
+
+class PlayerRow:
+    # Dict-like view of one player in a PlayerStore
+    __slots__ = ("store", "row")
+
+    def __init__(self, store, row):
+        self.store = store
+        self.row = row
+
+    def __getitem__(self, key):
+        value = self.store.value(self.row, key)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        value = self.store.value(self.row, key)
+        return default if value is MISSING else value
+
+    def __setitem__(self, key, value):
+        self.store.set_value(self.row, key, value)
+
+    def __contains__(self, key):
+        return self.store.value(self.row, key) is not MISSING
+
+    def keys(self):
+        return [key for key in self.store.keys() if self.store.value(self.row, key) is not MISSING]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"PlayerRow({self.to_dict()!r})"
+
+
+class PlayerStore:
+    # A roster as typed columns; indexing and iterating give PlayerRow views (one per player,
+    # created once, so the same player is always the same object)
+    def __init__(self, headers, rows):
+        # rows: lists of cell strings in header order. Like dict(zip(headers, cells)), a header
+        # that appears twice keeps its first position and its last column.
+        positions = {}
+        for i, header in enumerate(headers):
+            positions[header] = i
+        self.count = len(rows)
+        self.columns = {}
+        for header, i in positions.items():
+            self.columns[header] = build_column([cells[i] for cells in rows])
+        self.extra = {}     # key -> list of values set after loading (e.g. Scores)
+        self.build_views()
+
+    def build_views(self):
+        self.getters = {header: column_getter(*column) for header, column in self.columns.items()}
+        self.rows = [PlayerRow(self, row) for row in range(self.count)]
+
+    # Copies and pickles carry the columns only; getters and views are rebuilt around them
+    def __getstate__(self):
+        return {"count": self.count, "columns": self.columns, "extra": self.extra}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.build_views()
+
+    # --- List API ---
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        return self.rows[index]
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    # --- Cells ---
+    def keys(self):
+        return list(self.getters) + list(self.extra)
+
+    def value(self, row, key):
+        getter = self.getters.get(key)
+        if getter is not None:
+            return getter(row)
+        values = self.extra.get(key)
+        return MISSING if values is None else values[row]
+
+    def set_value(self, row, key, value):
+        if key in self.getters:
+            # Overwriting an exported cell: that column becomes a plain list of values
+            values = self.column(key)
+            del self.columns[key]
+            del self.getters[key]
+            self.extra[key] = values
+        self.extra.setdefault(key, [MISSING] * self.count)[row] = value
+
+    def add_column(self, key, values):
+        # Sets key for every player at once (values in roster order)
+        values = list(values)
+        if len(values) != self.count:
+            raise ValueError(f"{key}: expected {self.count} values, got {len(values)}")
+        self.columns.pop(key, None)
+        self.getters.pop(key, None)
+        self.extra[key] = values
+
+    def column(self, key, default=MISSING):
+        # Every player's value for key, in roster order
+        getter = self.getters.get(key)
+        if getter is not None:
+            return [getter(row) for row in range(self.count)]
+        values = self.extra.get(key)
+        if values is None:
+            return [default] * self.count
+        return [default if value is MISSING else value for value in values]
+
+    def blank_keys(self, keys):
+        # The keys some player has no value for, or an empty one ("" or None). Typed columns
+        # only need their distinct values checked; plain ones are one scan of the list.
+        blank = set()
+        for key in keys:
+            if key in self.columns:
+                kind, data, extra = self.columns[key]
+                values = extra[1] if kind == "int" else extra if kind == "cat" else data
+            elif key in self.extra:
+                values = self.extra[key]
+            else:
+                blank.add(key)
+                continue
+            if self.count and ("" in values or None in values or MISSING in values):
+                blank.add(key)
+        return blank
+
+    def parsed_column(self, key, parse, missing=0.0):
+        # array('d') of parse(cell) for every player, parsing each distinct cell once.
+        # Whole-number cells are read from int columns directly, so parse must agree with
+        # float() on plain digit strings.
+        if key not in self.columns:
+            values = self.column(key, None)
+            memo = {}
+            return array("d", [
+                missing if value is None else memo[value] if value in memo else memo.setdefault(value, parse(value))
+                for value in values
+            ])
+        kind, data, extra = self.columns[key]
+        if kind == "int":
+            base, specials = extra
+            parsed_specials = [parse(value) for value in specials]
+            return array("d", [float(value) if value < base else parsed_specials[value - base] for value in data])
+        if kind == "cat":
+            parsed = [parse(value) for value in extra]
+            return array("d", [parsed[code] for code in data])
+        memo = {}
+        return array("d", [memo[value] if value in memo else memo.setdefault(value, parse(value)) for value in data])
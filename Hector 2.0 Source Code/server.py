@@ -0,0 +1,380 @@
+import argparse
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import multiprocessing
+from pathlib import Path
+import sys
+import threading
+import time
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from data_loader import load_all, get_base_path
+from player_query import build_index, run_query
+from sort_keys import column_keys, sorted_positions, reverse_positions
+from teams import TEAM_COLUMNS, group_rosters, team_rows, team_breakdowns
+from leaderboards import BOARDS, BOARD_TITLES, BATTER_POSITIONS, PITCHER_POSITIONS, build_boards
+from lineups import LINEUP_TEAM_COLUMNS, best_lineups, lineup_team_rows, lineup_json
+from weights_watcher import WeightsWatcher
+from workspace import load_workspace, find_league, league_directory, export_stamp
+from cli import PITCHER_FIELDS, PITCHER_SCORES, BATTER_FIELDS, BATTER_SCORES, player_rows
+
+# Local JSON server over the scored rosters, for spreadsheets and bots.
+# The exports are loaded once; player lists, team totals and leaderboards are served from
+# tables and indexes built at load time, and every response body is cached. At most once a
+# second a request checks whether an export or a weight file changed: a new export is loaded
+# again, a weight edit re-scores in place (as the app does), and either clears the cache.
+#
+#   python server.py                            exports next to the app, http://127.0.0.1:8765
+#   python server.py --dir league2/ --port 9000
+#   python server.py --league Dynasty           a league from hector_workspace.json
+#
+#   GET /pitchers?q=sp >25&sort=total&order=desc&offset=0&limit=50
+#   GET /batters?q=ss total>40                  q is the search box language (player_query.py)
+#   GET /teams                                  totals per team, as in the Teams tab
+#   GET /teams/CAS                              position depth and age distribution
+#   GET /leaders                                every leaderboard; /leaders/batters_total for one
+#   GET /lineups                                best lineup total per team; /lineups/CAS for its lineup
+#   GET /status                                 counts, load time, cache hits
+
+DEFAULT_PORT = 8765
+CHECK_SECONDS = 1.0
+RESPONSE_CACHE_SIZE = 1024
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+
+ROSTER_COLUMNS = {
+    "pitchers": (PITCHER_FIELDS, PITCHER_SCORES),
+    "batters": (BATTER_FIELDS, BATTER_SCORES),
+}
+
+
+class RequestError(Exception):
+    # Answered as {"error": message} with the given HTTP status
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# --- Tables ---
+def roster_table(players, fields, scores):
+    # The roster's rows as the CLI writes them, with a search index over them
+    rows = list(player_rows(players, fields, scores))
+    columns = fields + scores
+    age = fields.index("Age")
+    numbers = {"age": [values[age] for values in rows]}
+    for i, key in enumerate(scores, start=len(fields)):
+        numbers[key] = [values[i] for values in rows]
+    index = build_index(
+        names=[values[fields.index("Name")] for values in rows],
+        teams=[values[fields.index("ORG")] for values in rows],
+        positions=[values[fields.index("POS")] for values in rows],
+        numbers=numbers,
+    )
+    return {"columns": columns, "rows": rows, "index": index, "orders": {}}
+
+
+def sort_order(table, column, descending):
+    # Row positions sorted on column, cached per column and direction
+    order = table["orders"].get((column, descending))
+    if order is None:
+        i = table["columns"].index(column)
+        keys = column_keys(column, [values[i] for values in table["rows"]])
+        ascending = table["orders"].get((column, False))
+        if ascending is None:
+            ascending = table["orders"][(column, False)] = sorted_positions(keys)
+        order = ascending if not descending else reverse_positions(ascending, keys)
+        table["orders"][(column, descending)] = order
+    return order
+
+
+def select_rows(table, query="", sort=None, descending=False):
+    # Row positions matching query, in sort order (roster order without a sort)
+    matches = run_query(table["index"], query)
+    if sort is None:
+        return list(range(len(table["rows"]))) if matches is None else sorted(matches)
+    order = sort_order(table, sort, descending)
+    return list(order) if matches is None else [row for row in order if row in matches]
+
+
+def build_tables(result):
+    pitchers = result["pitchers"]
+    batters = result["batters"]
+    groups = group_rosters(pitchers, batters)
+    return {
+        "pitchers": roster_table(pitchers, *ROSTER_COLUMNS["pitchers"]),
+        "batters": roster_table(batters, *ROSTER_COLUMNS["batters"]),
+        "groups": groups,
+        "teams": [dict(zip(TEAM_COLUMNS, row)) for row in team_rows(pitchers, batters, groups)],
+        "breakdowns": team_breakdowns(groups),
+        "boards": build_boards(batters, pitchers),
+        "lineups": best_lineups(batters),
+    }
+
+
+# --- Responses ---
+def param(params, name, default=None):
+    values = params.get(name)
+    return values[-1] if values else default
+
+
+def int_param(params, name, default, low, high):
+    value = param(params, name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise RequestError(400, f"{name} must be a whole number")
+    return min(max(number, low), high)
+
+
+def players_response(table, params):
+    sort = param(params, "sort", "total")
+    if sort not in table["columns"]:
+        raise RequestError(400, f"unknown sort column {sort!r} (one of {', '.join(table['columns'])})")
+    order = param(params, "order", "desc")
+    if order not in ("asc", "desc"):
+        raise RequestError(400, "order must be asc or desc")
+    offset = int_param(params, "offset", 0, 0, sys.maxsize)
+    limit = int_param(params, "limit", DEFAULT_LIMIT, 0, MAX_LIMIT)
+
+    rows = select_rows(table, param(params, "q", ""), sort, order == "desc")
+    columns = table["columns"]
+    return {
+        "total": len(rows),
+        "offset": offset,
+        "limit": limit,
+        "players": [dict(zip(columns, table["rows"][row])) for row in rows[offset:offset + limit]],
+    }
+
+
+def board_response(name, board):
+    positions = BATTER_POSITIONS if BOARDS[name][0] == "batters" else PITCHER_POSITIONS
+    return {
+        "title": BOARD_TITLES[name],
+        "positions": {
+            pos: [
+                {
+                    "rank": rank, "ID": player.get("ID", ""), "Name": player.get("Name", ""),
+                    "ORG": player.get("ORG", ""), "Age": player.get("Age", ""), "score": score,
+                }
+                for rank, (score, player) in enumerate(board.get(pos, []), start=1)
+            ]
+            for pos in positions
+        },
+    }
+
+
+def route(tables, parts, params):
+    # The JSON object for a path (split on "/") and its query parameters
+    if len(parts) == 1 and parts[0] in ROSTER_COLUMNS:
+        return players_response(tables[parts[0]], params)
+    if parts == ["teams"]:
+        return {"teams": tables["teams"]}
+    if len(parts) == 2 and parts[0] == "teams":
+        team = parts[1].upper()
+        if team not in tables["breakdowns"]:
+            raise RequestError(404, f"no team {parts[1]!r}")
+        return {"team": team, **tables["breakdowns"][team]}
+    if parts == ["leaders"]:
+        return {name: board_response(name, board) for name, board in tables["boards"].items()}
+    if len(parts) == 2 and parts[0] == "leaders":
+        if parts[1] not in tables["boards"]:
+            raise RequestError(404, f"no leaderboard {parts[1]!r} (one of {', '.join(BOARDS)})")
+        return board_response(parts[1], tables["boards"][parts[1]])
+    if parts == ["lineups"]:
+        return {"lineups": [dict(zip(LINEUP_TEAM_COLUMNS, row)) for row in lineup_team_rows(tables["lineups"])]}
+    if len(parts) == 2 and parts[0] == "lineups":
+        team = parts[1].upper()
+        if team not in tables["lineups"]:
+            raise RequestError(404, f"no team {parts[1]!r}")
+        return {"team": team, **lineup_json(tables["lineups"][team])}
+    raise RequestError(404, "not found (try /pitchers, /batters, /teams, /leaders, /lineups or /status)")
+
+
+def encode(value):
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+class RosterServer:
+    # The loaded rosters of one export folder, their tables and the response cache
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.lock = threading.Lock()
+        self.watcher = WeightsWatcher()
+        self.cache = OrderedDict()   # (path, sorted query) -> JSON bytes
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.error = None
+        self.weight_errors = {}   # roster -> (weights file stamp, message) of a file that failed to load
+        self.checked = 0.0
+        self.result = None
+        self.tables = None
+        self.load()
+
+    def load(self):
+        # Raises ValueError when the export is missing fields
+        stamp = export_stamp(self.directory)
+        result = load_all(directory=self.directory)
+        missing = sorted(result["missing_pitcher_fields"] | result["missing_batter_fields"])
+        if missing:
+            raise ValueError("export is missing fields: " + ", ".join(missing))
+        self.result = result
+        self.tables = build_tables(result)
+        self.stamp = stamp
+        self.loaded = datetime.now().isoformat(timespec="seconds")
+        self.cache.clear()
+
+    def refresh(self):
+        # Picks up new exports and weight edits; checks at most every CHECK_SECONDS
+        if time.monotonic() - self.checked < CHECK_SECONDS:
+            return
+        with self.lock:
+            if time.monotonic() - self.checked < CHECK_SECONDS:
+                return
+            self.checked = time.monotonic()
+            try:
+                if export_stamp(self.directory) != self.stamp:
+                    self.load()
+                    self.reloads += 1
+                    self.error = None
+                else:
+                    components, errors = self.watcher.poll(
+                        {"batters": self.result["batters"], "pitchers": self.result["pitchers"]}
+                    )
+                    self.note_weight_errors(errors)
+                    if components:
+                        self.tables = build_tables(self.result)
+                        self.cache.clear()
+            except Exception as e:
+                # Keep serving what was loaded; /status shows what went wrong
+                self.error = f"{type(e).__name__}: {e}"
+                print(f"Could not reload {self.directory}: {self.error}", file=sys.stderr)
+
+    def note_weight_errors(self, errors):
+        # The watcher only retries a weights file once it is saved again, so a failure stays
+        # reported until then; a later save that loads clears it
+        for roster, (stamp, _) in list(self.weight_errors.items()):
+            if self.watcher.stamps[roster] != stamp:
+                del self.weight_errors[roster]
+        for roster, error in errors:
+            message = f"Could not reload {roster} weights: {type(error).__name__}: {error}"
+            self.weight_errors[roster] = (self.watcher.stamps[roster], message)
+            print(message, file=sys.stderr)
+
+    def current_error(self):
+        messages = [self.error] if self.error else []
+        messages += [message for _, message in self.weight_errors.values()]
+        return "; ".join(messages) or None
+
+    def status(self):
+        return {
+            "directory": str(self.directory),
+            "loaded": self.loaded,
+            "reloads": self.reloads,
+            "error": self.current_error(),
+            "pitchers": len(self.result["pitchers"]),
+            "batters": len(self.result["batters"]),
+            "teams": len(self.tables["teams"]),
+            "cache": {"entries": len(self.cache), "hits": self.hits, "misses": self.misses},
+        }
+
+    def respond(self, target):
+        # (HTTP status, JSON bytes) for a request target such as "/batters?q=ss&limit=10"
+        self.refresh()
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.split("/") if part]
+        if parts == ["status"]:
+            return 200, encode(self.status())
+
+        params = parse_qs(url.query)
+        key = (tuple(parts), tuple(sorted((name, tuple(values)) for name, values in params.items())))
+        with self.lock:
+            body = self.cache.get(key)
+            if body is not None:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return 200, body
+            tables = self.tables
+        try:
+            body = encode(route(tables, parts, params))
+        except RequestError as e:
+            return e.status, encode({"error": str(e)})
+        with self.lock:
+            self.misses += 1
+            if self.tables is tables:   # not built from tables a reload has since replaced
+                self.cache[key] = body
+                while len(self.cache) > RESPONSE_CACHE_SIZE:
+                    self.cache.popitem(last=False)
+        return 200, body
+
+
+# --- HTTP ---
+class RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, so clients can reuse one connection
+    disable_nagle_algorithm = True   # headers and body go out as separate writes
+
+    def do_GET(self):
+        status, body = self.server.rosters.respond(self.path)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(rosters, host="127.0.0.1", port=DEFAULT_PORT, verbose=False):
+    server = ThreadingHTTPServer((host, port), RequestHandler)
+    server.daemon_threads = True
+    server.rosters = rosters
+    server.verbose = verbose
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="server.py", description="Serve the scored rosters as JSON.")
+    parser.add_argument("--dir", default=None, help="export folder (default: the exports next to the app)")
+    parser.add_argument("--league", default=None, help="a league from hector_workspace.json instead of --dir")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1, this machine only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default: {DEFAULT_PORT})")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    if args.league is not None:
+        try:
+            directory = league_directory(find_league(load_workspace(), args.league))
+        except KeyError:
+            parser.error(f"no league called {args.league}")
+        except ValueError as e:
+            parser.error(str(e))
+    else:
+        directory = Path(args.dir) if args.dir is not None else get_base_path()
+
+    try:
+        rosters = RosterServer(directory)
+    except (OSError, ValueError) as e:
+        print(f"Could not load {directory}: {e}", file=sys.stderr)
+        return 1
+    server = make_server(rosters, args.host, args.port, args.verbose)
+    print(f"Serving {len(rosters.result['pitchers'])} pitchers and {len(rosters.result['batters'])} batters"
+          f" from {directory} on http://{args.host}:{server.server_port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,382 @@
+import argparse
+from array import array
+import heapq
+import json
+import marshal
+import math
+import os
+from pathlib import Path
+import sys
+import time
+
+from data_loader import load_all, export_path
+from export_cache import file_hash
+from pitchers import get_base_path
+
+# Snapshot store: every export that gets loaded can be kept, so ratings and scores can be
+# compared between any two sim weeks.
+#
+#   python snapshots.py list
+#   python snapshots.py diff -2 -1                         latest week against the one before
+#   python snapshots.py diff 2026-04-01_120000 -1 --roster pitchers --field STU
+#   python snapshots.py player 31568 -2 -1
+#
+# Snapshots live in a .hector_snapshots folder next to the app, one marshal file each,
+# stored by column: numeric columns as packed doubles (NaN where a cell is blank or "-"),
+# everything else as integer codes into a list of distinct values. Diffs join two snapshots
+# on player ID through a hash index and subtract whole columns at once.
+
+SNAPSHOT_DIR_NAME = ".hector_snapshots"
+SNAPSHOT_FORMAT = 1
+INDEX_FILE = "index.json"
+ROSTERS = ("batters", "pitchers")
+
+# Shown next to each player in diffs
+LABEL_FIELDS = ["Name", "POS", "ORG", "Age"]
+
+
+def snapshot_dir(store_dir=None):
+    return Path(store_dir) if store_dir is not None else get_base_path() / SNAPSHOT_DIR_NAME
+
+
+# --- Encoding ---
+def cell_number(value):
+    # Number for a rating cell, NaN for a blank/"-" cell; raises ValueError for text
+    if isinstance(value, (int, float)):
+        return float(value)
+    val = str(value).replace("Stars", "").strip()
+    if val == "" or val == "-":
+        return math.nan
+    return float(val)
+
+
+def encode_column(values):
+    # ("num", packed doubles) when every value is a number or blank, else ("cat", codes, values).
+    # Ratings repeat a lot, so only the distinct values are parsed.
+    lookup = {}
+    codes = [lookup.setdefault(value, len(lookup)) for value in values]
+    uniques = list(lookup)
+    try:
+        numbers = [cell_number(value) for value in uniques]
+    except ValueError:
+        return ("cat", array("l", codes).tobytes(), uniques)
+    return ("num", array("d", [numbers[code] for code in codes]).tobytes())
+
+
+def decode_column(entry):
+    if entry[0] == "num":
+        column = array("d")
+        column.frombytes(entry[1])
+        return column
+    codes = array("l")
+    codes.frombytes(entry[1])
+    uniques = entry[2]
+    return [uniques[code] for code in codes]
+
+
+def encode_roster(players):
+    headers = [field for field in (players[0] if players else {}) if field != "Scores"]
+    score_keys = list(players[0]["Scores"]) if players else []
+    return {
+        "count": len(players),
+        "ids": [str(p.get("ID", "")) for p in players],
+        "columns": {field: encode_column([p.get(field, "") for p in players]) for field in headers},
+        "scores": {key: encode_column([p["Scores"].get(key, 0) for p in players]) for key in score_keys},
+    }
+
+
+def decode_roster(entry):
+    ids = entry["ids"]
+    columns = {field: decode_column(column) for field, column in entry["columns"].items()}
+    scores = {key: decode_column(column) for key, column in entry["scores"].items()}
+    return {
+        "count": entry["count"],
+        "ids": ids,
+        "index": {player_id: row for row, player_id in enumerate(ids)},
+        "columns": columns,
+        "scores": scores,
+    }
+
+
+# --- Store ---
+def read_index(store):
+    try:
+        with open(store / INDEX_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def write_index(store, index):
+    tmp_file = store / (INDEX_FILE + ".tmp")
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1)
+    os.replace(tmp_file, store / INDEX_FILE)
+
+
+def list_snapshots(store_dir=None):
+    # [{"name", "created", "source", "batters", "pitchers"}], oldest first
+    return sorted(read_index(snapshot_dir(store_dir)), key=lambda entry: entry["created"])
+
+
+def export_source(directory=None):
+    # Content hashes of the two exports, so the same export is not stored twice
+    base_path = get_base_path() if directory is None else Path(directory)
+    return [file_hash(export_path(base_path, "batters")), file_hash(export_path(base_path, "pitchers"))]
+
+
+def save_snapshot(pitchers, batters, name=None, source=None, store_dir=None, created=None):
+    # Stores the loaded rosters and returns the snapshot name. When source (see export_source)
+    # matches an existing snapshot, nothing is written and that snapshot's name is returned.
+    store = snapshot_dir(store_dir)
+    index = read_index(store)
+    if source is not None:
+        for entry in index:
+            if entry["source"] == source:
+                return entry["name"]
+
+    created = time.time() if created is None else created
+    if name is None:
+        name = time.strftime("%Y-%m-%d_%H%M%S", time.localtime(created))
+    if any(entry["name"] == name for entry in index):
+        raise ValueError(f"A snapshot called {name!r} already exists")
+
+    store.mkdir(parents=True, exist_ok=True)
+    snapshot = {
+        "format": (SNAPSHOT_FORMAT, sys.version_info[:2]),
+        "name": name,
+        "created": created,
+        "batters": encode_roster(batters),
+        "pitchers": encode_roster(pitchers),
+    }
+    tmp_file = store / f"{name}.tmp"
+    with open(tmp_file, "wb") as f:
+        marshal.dump(snapshot, f)
+    os.replace(tmp_file, store / f"{name}.snap")
+
+    index.append({
+        "name": name, "created": created, "source": source,
+        "batters": len(batters), "pitchers": len(pitchers),
+    })
+    write_index(store, index)
+    return name
+
+
+def resolve_name(name, store_dir=None):
+    # Snapshot names, or positions in the list: -1 is the latest, 0 the oldest
+    names = [entry["name"] for entry in list_snapshots(store_dir)]
+    if name in names:
+        return name
+    try:
+        return names[int(name)]
+    except (ValueError, IndexError):
+        raise ValueError(f"No snapshot {name!r}") from None
+
+
+def load_snapshot(name, store_dir=None):
+    name = resolve_name(name, store_dir)
+    with open(snapshot_dir(store_dir) / f"{name}.snap", "rb") as f:
+        entry = marshal.load(f)
+    if entry.get("format") != (SNAPSHOT_FORMAT, sys.version_info[:2]):
+        raise ValueError(f"Snapshot {name!r} was written by a different version of Hector or Python")
+    return {
+        "name": entry["name"],
+        "created": entry["created"],
+        "batters": decode_roster(entry["batters"]),
+        "pitchers": decode_roster(entry["pitchers"]),
+    }
+
+
+# --- Diffs ---
+def join_rows(old, new):
+    # Keyed join on ID: (old rows, new rows) of the players in both, plus added and removed IDs
+    old_index = old["index"]
+    old_rows = array("l")
+    new_rows = array("l")
+    added = []
+    for new_row, player_id in enumerate(new["ids"]):
+        old_row = old_index.get(player_id)
+        if old_row is None:
+            added.append(player_id)
+        else:
+            old_rows.append(old_row)
+            new_rows.append(new_row)
+    new_index = new["index"]
+    removed = [player_id for player_id in old["ids"] if player_id not in new_index]
+    return old_rows, new_rows, added, removed
+
+
+def roster_column(roster, field):
+    if field in roster["scores"]:
+        return roster["scores"][field]
+    return roster["columns"].get(field)
+
+
+def numeric_fields(old, new):
+    # Fields (scores first) that are numeric in both snapshots
+    fields = []
+    for group in ("scores", "columns"):
+        for field, column in new[group].items():
+            other = roster_column(old, field)
+            if isinstance(column, array) and isinstance(other, array) and field not in fields:
+                fields.append(field)
+    return fields
+
+
+def column_deltas(old, new, field, old_rows, new_rows):
+    # new - old for every joined player (NaN where either side is blank)
+    old_column = roster_column(old, field)
+    new_column = roster_column(new, field)
+    old_values = [old_column[row] for row in old_rows]
+    new_values = [new_column[row] for row in new_rows]
+    return array("d", [n - o for o, n in zip(old_values, new_values)]), old_values, new_values
+
+
+def label(roster, row):
+    columns = roster["columns"]
+    return {field: columns[field][row] if field in columns else "" for field in LABEL_FIELDS}
+
+
+def movers(old, new, roster="batters", field="total", top=20):
+    # (risers, fallers): the players whose field changed most, each a dict with the player's
+    # ID, label fields, old and new value and delta
+    old, new = old[roster], new[roster]
+    if not (isinstance(roster_column(old, field), array) and isinstance(roster_column(new, field), array)):
+        raise ValueError(
+            f"{field!r} is not a numeric {roster} field in both snapshots; try one of: "
+            + ", ".join(numeric_fields(old, new))
+        )
+    old_rows, new_rows, _, _ = join_rows(old, new)
+    deltas, old_values, new_values = column_deltas(old, new, field, old_rows, new_rows)
+    changed = [i for i, delta in enumerate(deltas) if delta == delta and delta != 0]   # skips NaN
+
+    def entry(i):
+        return dict(
+            label(new, new_rows[i]), ID=new["ids"][new_rows[i]],
+            old=old_values[i], new=new_values[i], delta=round(deltas[i], 2),
+        )
+    risers = [entry(i) for i in heapq.nlargest(top, (i for i in changed if deltas[i] > 0), key=deltas.__getitem__)]
+    fallers = [entry(i) for i in heapq.nsmallest(top, (i for i in changed if deltas[i] < 0), key=deltas.__getitem__)]
+    return risers, fallers
+
+
+def diff_summary(old, new, roster="batters"):
+    old, new = old[roster], new[roster]
+    old_rows, new_rows, added, removed = join_rows(old, new)
+    changed_team = 0
+    if "ORG" in old["columns"] and "ORG" in new["columns"]:
+        old_org, new_org = old["columns"]["ORG"], new["columns"]["ORG"]
+        changed_team = sum(1 for o, n in zip(old_rows, new_rows) if old_org[o] != new_org[n])
+    return {"matched": len(new_rows), "added": added, "removed": removed, "changed_team": changed_team}
+
+
+def player_diff(old, new, player_id):
+    # {field: (old, new, delta)} for every field of one player that changed, or None if the
+    # player is not in both snapshots
+    for roster in ROSTERS:
+        old_roster, new_roster = old[roster], new[roster]
+        old_row = old_roster["index"].get(player_id)
+        new_row = new_roster["index"].get(player_id)
+        if old_row is None or new_row is None:
+            continue
+        changes = {}
+        for group in ("scores", "columns"):
+            for field, new_column in new_roster[group].items():
+                old_column = roster_column(old_roster, field)
+                if old_column is None:
+                    continue
+                o, n = old_column[old_row], new_column[new_row]
+                if o != n and not (o != o and n != n):   # NaN on both sides is no change
+                    delta = round(n - o, 2) if isinstance(n, float) and isinstance(o, float) else None
+                    changes[field] = (o, n, delta)
+        return roster, label(new_roster, new_row), changes
+    return None
+
+
+# --- Command line ---
+def format_value(value):
+    if isinstance(value, float):
+        return "-" if value != value else f"{value:g}"
+    return str(value)
+
+
+def print_movers(title, rows, field):
+    print(f"\n{title}:")
+    if not rows:
+        print("  (none)")
+    for row in rows:
+        print(
+            f"  {row['ID']:>7}  {str(row['Name'])[:24]:<24} {row['POS']:<3} {row['ORG']:<5}"
+            f" {field} {format_value(row['old'])} -> {format_value(row['new'])} ({row['delta']:+g})"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="snapshots.py", description="Keep and compare snapshots of OOTP exports.")
+    parser.add_argument("--store", default=None, help=f"snapshot folder (default: {SNAPSHOT_DIR_NAME} next to the app)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="store the current exports")
+    add.add_argument("--dir", default=None, help="export folder (default: the exports next to the app)")
+    add.add_argument("--name", default=None, help="snapshot name (default: the date and time)")
+
+    commands.add_parser("list", help="list stored snapshots")
+
+    diff = commands.add_parser("diff", help="risers and fallers between two snapshots")
+    diff.add_argument("old", help="snapshot name, or position (-2 = the one before the latest)")
+    diff.add_argument("new", help="snapshot name, or position (-1 = the latest)")
+    diff.add_argument("--roster", choices=ROSTERS, default="batters")
+    diff.add_argument("--field", default="total", help="score or rating to compare (default: total)")
+    diff.add_argument("--top", type=int, default=15)
+
+    player = commands.add_parser("player", help="every change for one player between two snapshots")
+    player.add_argument("id")
+    player.add_argument("old")
+    player.add_argument("new")
+
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "add":
+            result = load_all(directory=args.dir)
+            name = save_snapshot(
+                result["pitchers"], result["batters"], args.name, export_source(args.dir), args.store
+            )
+            print(f"Snapshot {name}")
+        elif args.command == "list":
+            for entry in list_snapshots(args.store):
+                created = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["created"]))
+                print(f"  {entry['name']:<24} {created}  {entry['batters']} batters, {entry['pitchers']} pitchers")
+        elif args.command == "diff":
+            old = load_snapshot(args.old, args.store)
+            new = load_snapshot(args.new, args.store)
+            summary = diff_summary(old, new, args.roster)
+            print(
+                f"{old['name']} -> {new['name']} ({args.roster}): {summary['matched']} in both,"
+                f" {len(summary['added'])} new, {len(summary['removed'])} gone, {summary['changed_team']} changed teams"
+            )
+            risers, fallers = movers(old, new, args.roster, args.field, args.top)
+            print_movers("Risers", risers, args.field)
+            print_movers("Fallers", fallers, args.field)
+        elif args.command == "player":
+            old = load_snapshot(args.old, args.store)
+            new = load_snapshot(args.new, args.store)
+            found = player_diff(old, new, args.id)
+            if found is None:
+                print(f"Player {args.id} is not in both snapshots", file=sys.stderr)
+                return 1
+            roster, info, changes = found
+            print(f"{info['Name']} ({info['POS']}, {info['ORG']}) {old['name']} -> {new['name']}")
+            for field, (o, n, delta) in changes.items():
+                change = f" ({delta:+g})" if delta is not None else ""
+                print(f"  {field:<18} {format_value(o)} -> {format_value(n)}{change}")
+            if not changes:
+                print("  no changes")
+    except (OSError, ValueError) as e:
+        print(f"snapshots.py: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+# Typed sort keys for the table columns.
+# Keys are built once per column from the loaded values; the sorted order for each
+# column and direction is then cached, and the other direction is derived in O(n).
+
+PRONE_ORDER = {
+    "wrecked": 0,
+    "fragile": 1,
+    "normal": 2,
+    "durable": 3,
+    "iron man": 4,
+    "ironman": 4,
+}
+
+
+def prone_key(value):
+    return PRONE_ORDER.get(str(value).lower(), -1)
+
+
+def velo_key(value):
+    val = str(value).strip()
+    try:
+        if val.endswith("+"):
+            return float(val[:-1]) + 1.1
+        elif "-" in val:
+            return float(val.split("-")[-1])
+        else:
+            return float(val)
+    except ValueError:
+        return -1
+
+
+def number_key(value):
+    # "-" placeholders count as 0; star ratings sort by their number. Raises ValueError otherwise.
+    if isinstance(value, (int, float)):
+        return float(value)
+    val = str(value).replace("Stars", "").strip()
+    if val == "-" or val == "":
+        return 0.0
+    return float(val)
+
+
+def column_keys(column, values):
+    if column == "Prone":
+        return [prone_key(v) for v in values]
+    if column == "Velo":
+        return [velo_key(v) for v in values]
+    try:
+        return [number_key(v) for v in values]
+    except ValueError:
+        # Any non-numeric cell means the whole column sorts as text
+        return [str(v).lower() for v in values]
+
+
+def sorted_positions(keys):
+    # Stable ascending order of row positions
+    return sorted(range(len(keys)), key=keys.__getitem__)
+
+
+def reverse_positions(order, keys):
+    # Flips a stable sort in O(n): groups of equal keys swap places but keep their inner order,
+    # which is exactly what a stable sort with reverse=True gives.
+    result = []
+    end = len(order)
+    while end > 0:
+        start = end - 1
+        key = keys[order[start]]
+        while start > 0 and keys[order[start - 1]] == key:
+            start -= 1
+        result.extend(order[start:end])
+        end = start
+    return result
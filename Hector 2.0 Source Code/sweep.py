@@ -0,0 +1,326 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import copy
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import batters as batter_module
+import pitchers as pitcher_module
+from data_loader import load_all
+from leaderboards import BATTER_POSITIONS, PITCHER_POSITIONS, pitcher_position, top_n_by_position
+from teams import group_rosters, sum_team_scores, team_score
+
+# Weight sweeps: "what if power were worth 0.2 ... 0.6?"
+#
+#   python sweep.py --vary power=0.2:0.6:0.1 --vary stuff=0.4,0.5,0.6
+#   python sweep.py --vary penalty_sp_low_stamina=-2:0:0.5 --top 5 --json sweep.json
+#
+# The league is loaded and turned into numeric columns once. Every combination of the varied
+# weights then re-scores the whole league with the batch scorers, recomputing only the score
+# parts those weights feed, and reports how team rankings and per-position top-N lists move
+# against the current weights. Combinations are spread over a process pool.
+
+ROSTER_MODULES = {"batters": batter_module, "pitchers": pitcher_module}
+
+# Below this many combinations, worker start-up costs more than it saves
+PARALLEL_MIN_COMBINATIONS = 16
+
+
+# --- Weight specs ---
+def weight_paths(weights, prefix=()):
+    for key, value in weights.items():
+        if isinstance(value, dict):
+            yield from weight_paths(value, prefix + (key,))
+        else:
+            yield prefix + (key,)
+
+
+def resolve_weight(name, base_weights):
+    # "power", "overall.power" or "batters.overall.power" -> ("batters", ("overall", "power"))
+    parts = tuple(name.split("."))
+    rosters = [parts[0]] if parts[0] in base_weights else list(base_weights)
+    if parts[0] in base_weights:
+        parts = parts[1:]
+    matches = [
+        (roster, path)
+        for roster in rosters
+        for path in weight_paths(base_weights[roster])
+        if path[-len(parts):] == parts
+    ]
+    if not matches:
+        raise ValueError(f"No weight called {name!r}")
+    if len(matches) > 1:
+        options = ", ".join(f"{roster}.{'.'.join(path)}" for roster, path in matches)
+        raise ValueError(f"{name!r} is ambiguous: {options}")
+    return matches[0]
+
+
+def parse_values(text):
+    # "0.2:0.6:0.1" (start:stop:step, stop included), "0.2,0.4,0.6" or a single value
+    if ":" in text:
+        start, stop, step = (float(v) for v in text.split(":"))
+        if step <= 0 or stop < start:
+            raise ValueError(f"Bad range {text!r}: need start <= stop and a positive step")
+        count = int(round((stop - start) / step)) + 1
+        return [round(start + i * step, 10) for i in range(count)]
+    return [float(v) for v in text.split(",")]
+
+
+def parse_vary(spec, base_weights):
+    name, sep, values = spec.partition("=")
+    if not sep:
+        raise ValueError(f"Expected NAME=VALUES, got {spec!r}")
+    roster, path = resolve_weight(name.strip(), base_weights)
+    return roster, path, parse_values(values)
+
+
+def with_weights(base_weights, changes):
+    # Copy of {roster: section_weights} with changes [(roster, path, value)] applied
+    weights = dict(base_weights)
+    for roster in {roster for roster, _, _ in changes}:
+        weights[roster] = copy.deepcopy(base_weights[roster])
+    for roster, path, value in changes:
+        section = weights[roster]
+        for key in path[:-1]:
+            section = section[key]
+        section[path[-1]] = value
+    return weights
+
+
+# --- Scoring ---
+def prepare_league(pitchers, batters):
+    # Everything the sweep needs from the loaded rosters, built once
+    return {
+        "columns": {
+            "batters": batter_module.batter_columns(batters),
+            "pitchers": pitcher_module.pitcher_columns(pitchers),
+        },
+        "positions": {
+            "batters": [b.get("POS", "") for b in batters],
+            "pitchers": [pitcher_position(p) for p in pitchers],
+        },
+        "ids": {
+            "batters": [b.get("ID", "") for b in batters],
+            "pitchers": [p.get("ID", "") for p in pitchers],
+        },
+        "groups": group_rosters(pitchers, batters),
+    }
+
+
+def score_parts(league, weights, base=None):
+    # {roster: parts} for these weights; parts the weights leave unchanged are shared with base,
+    # given as (base weights, base parts)
+    parts = {}
+    for roster, module in ROSTER_MODULES.items():
+        columns = league["columns"][roster]
+        if base is None:
+            parts[roster] = module.score_parts(columns, weights[roster])
+            continue
+        base_weights, base_parts = base
+        names = module.changed_score_parts(base_weights[roster], weights[roster])
+        parts[roster] = dict(base_parts[roster])
+        if names:
+            module.score_parts(columns, weights[roster], parts[roster], names)
+    return parts
+
+
+def league_outcome(league, parts, top_n):
+    # Team order (best first) and per-position top-N row lists for one set of score parts
+    batter_parts = parts["batters"]
+    batter_totals = [
+        round(o + p + d, 2)
+        for o, p, d in zip(batter_parts["offense"], batter_parts["offense_potential"], batter_parts["defense"])
+    ]
+    batter_team = [round(o, 2) + round(d, 2) for o, d in zip(batter_parts["offense"], batter_parts["defense"])]
+    pitcher_totals = [round(t, 2) for t in parts["pitchers"]["total"]]
+
+    groups = league["groups"]
+    sp, rp, bat = sum_team_scores(groups, pitcher_totals, batter_team)
+    team_scores = [team_score(*totals)[-1] for totals in zip(sp, rp, bat)]
+    team_order = sorted(range(len(team_scores)), key=lambda code: (-team_scores[code], groups["teams"][code]))
+
+    top = {}
+    for roster, totals, positions in (
+        ("batters", batter_totals, BATTER_POSITIONS),
+        ("pitchers", pitcher_totals, PITCHER_POSITIONS),
+    ):
+        position_of = league["positions"][roster].__getitem__
+        boards = top_n_by_position(range(len(totals)), position_of, totals.__getitem__, top_n, positions)
+        for position, entries in boards.items():
+            top[(roster, position)] = [row for _, row in entries]
+    return {"team_order": team_order, "team_scores": team_scores, "top": top}
+
+
+# --- Process pool ---
+# Each worker gets the league and the baseline once (initializer), then scores batches of
+# combinations against that baseline.
+WORKER_STATE = {}
+
+
+def init_worker(league, base_weights, top_n):
+    WORKER_STATE["league"] = league
+    WORKER_STATE["base"] = (base_weights, score_parts(league, base_weights))
+    WORKER_STATE["top_n"] = top_n
+
+
+def score_combinations(combinations):
+    league = WORKER_STATE["league"]
+    base_weights, base_parts = WORKER_STATE["base"]
+    outcomes = []
+    for changes in combinations:
+        parts = score_parts(league, with_weights(base_weights, changes), (base_weights, base_parts))
+        outcomes.append(league_outcome(league, parts, WORKER_STATE["top_n"]))
+    return outcomes
+
+
+def run_sweep(league, base_weights, varies, top_n=10, jobs=None):
+    # varies: [(roster, path, values)]. Returns (baseline outcome, [(changes, outcome)])
+    combinations = [
+        [(roster, path, value) for (roster, path, _), value in zip(varies, values)]
+        for values in itertools.product(*(values for _, _, values in varies))
+    ]
+    init_worker(league, base_weights, top_n)
+    baseline = league_outcome(league, WORKER_STATE["base"][1], top_n)
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(combinations) < PARALLEL_MIN_COMBINATIONS:
+        outcomes = score_combinations(combinations)
+    else:
+        batch = max(1, len(combinations) // (jobs * 4))
+        batches = [combinations[i:i + batch] for i in range(0, len(combinations), batch)]
+        with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=(league, base_weights, top_n)) as pool:
+            outcomes = [outcome for result in pool.map(score_combinations, batches) for outcome in result]
+    return baseline, list(zip(combinations, outcomes))
+
+
+# --- Reporting ---
+def compare(league, baseline, outcome):
+    # Rank moves per team (positive = up) and who entered / left each top-N list
+    base_rank = {code: rank for rank, code in enumerate(baseline["team_order"], start=1)}
+    teams = league["groups"]["teams"]
+    moves = {}
+    for rank, code in enumerate(outcome["team_order"], start=1):
+        if base_rank[code] != rank:
+            moves[teams[code]] = base_rank[code] - rank
+
+    top_changes = {}
+    for (roster, position), rows in outcome["top"].items():
+        base_rows = baseline["top"].get((roster, position), [])
+        ids = league["ids"][roster]
+        entered = [ids[row] for row in rows if row not in set(base_rows)]
+        left = [ids[row] for row in base_rows if row not in set(rows)]
+        if entered or left:
+            top_changes[f"{roster} {position}"] = {"entered": entered, "left": left}
+    return moves, top_changes
+
+
+def describe_changes(changes):
+    return " ".join(f"{'.'.join(path)}={value:g}" for _, path, value in changes)
+
+
+def build_report(league, base_weights, varies, baseline, results, top_n):
+    teams = league["groups"]["teams"]
+    rank_range = {code: [rank, rank] for rank, code in enumerate(baseline["team_order"], start=1)}
+    combinations = []
+    for changes, outcome in results:
+        moves, top_changes = compare(league, baseline, outcome)
+        for rank, code in enumerate(outcome["team_order"], start=1):
+            low_high = rank_range[code]
+            low_high[0] = min(low_high[0], rank)
+            low_high[1] = max(low_high[1], rank)
+        combinations.append({
+            "weights": {f"{roster}.{'.'.join(path)}": value for roster, path, value in changes},
+            "label": describe_changes(changes),
+            "team_ranking": [teams[code] for code in outcome["team_order"]],
+            "team_moves": moves,
+            "top_changes": top_changes,
+        })
+
+    return {
+        "varied": {
+            f"{roster}.{'.'.join(path)}": {"current": baseline_value(base_weights, roster, path), "values": values}
+            for roster, path, values in varies
+        },
+        "top_n": top_n,
+        "baseline_ranking": [teams[code] for code in baseline["team_order"]],
+        "team_rank_ranges": {
+            teams[code]: {"baseline": rank, "best": rank_range[code][0], "worst": rank_range[code][1]}
+            for rank, code in enumerate(baseline["team_order"], start=1)
+        },
+        "combinations": combinations,
+    }
+
+
+def baseline_value(base_weights, roster, path):
+    value = base_weights[roster]
+    for key in path:
+        value = value[key]
+    return value
+
+
+def print_report(report, seconds, jobs):
+    combinations = report["combinations"]
+    print(f"Scored {len(combinations)} weight combinations in {seconds:.2f}s ({jobs} process{'es' if jobs > 1 else ''}).")
+    for name, info in report["varied"].items():
+        values = ", ".join(f"{v:g}" for v in info["values"])
+        print(f"  {name}: current {info['current']:g}, tried {values}")
+
+    print("\nTeam rank ranges (baseline / best / worst):")
+    for team, ranks in report["team_rank_ranges"].items():
+        marker = "" if ranks["best"] == ranks["worst"] else "  *"
+        print(f"  {team:<6} {ranks['baseline']:>3} {ranks['best']:>5} {ranks['worst']:>6}{marker}")
+
+    print(f"\nChanges against the current weights (top-{report['top_n']} lists):")
+    for combo in combinations:
+        moves = sorted(combo["team_moves"].items(), key=lambda item: -abs(item[1]))
+        moved = ", ".join(f"{team} {move:+d}" for team, move in moves[:5])
+        swaps = sum(len(change["entered"]) for change in combo["top_changes"].values())
+        print(f"  {combo['label']}: {len(moves)} teams moved{' (' + moved + ')' if moved else ''}, {swaps} top-N changes")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="sweep.py", description="Re-score the league for every combination of weight values.")
+    parser.add_argument(
+        "--vary", action="append", required=True, metavar="NAME=VALUES",
+        help="a weight and its values: power=0.2:0.6:0.1 (start:stop:step) or stuff=0.4,0.6."
+             " Names can be qualified (overall.power, batters.infield.infield_range.SS)"
+    )
+    parser.add_argument("--dir", default=None, help="export folder (default: the exports next to the app)")
+    parser.add_argument("--top", type=int, default=10, help="size of the per-position lists (default: 10)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--json", default=None, help="also write the full report to this JSON file")
+    args = parser.parse_args(argv)
+
+    base_weights = {roster: module.section_weights for roster, module in ROSTER_MODULES.items()}
+    try:
+        varies = [parse_vary(spec, base_weights) for spec in args.vary]
+    except ValueError as e:
+        parser.error(str(e))
+    for roster, path, values in varies:
+        probe = with_weights(base_weights, [(roster, path, baseline_value(base_weights, roster, path) + 1)])
+        if not ROSTER_MODULES[roster].changed_score_parts(base_weights[roster], probe[roster]):
+            print(f"Note: {roster}.{'.'.join(path)} does not feed any score, so it changes nothing", file=sys.stderr)
+
+    result = load_all(directory=args.dir)
+    league = prepare_league(result["pitchers"], result["batters"])
+
+    jobs = args.jobs or os.cpu_count() or 1
+    start = time.perf_counter()
+    baseline, results = run_sweep(league, base_weights, varies, args.top, jobs)
+    report = build_report(league, base_weights, varies, baseline, results, args.top)
+    seconds = time.perf_counter() - start
+
+    print_report(report, seconds, jobs if len(results) >= PARALLEL_MIN_COMBINATIONS else 1)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,240 @@
+import argparse
+import csv
+import random
+import sys
+from pathlib import Path
+
+from data_loader import REQUIRED_PITCHER_FIELDS, REQUIRED_BATTER_FIELDS
+
+# Synthetic OOTP exports for benchmarks and testing.
+# Writes pitchers.html and batters.html in the same page layout and table.data markup as a real
+# OOTP "Player List" export, with value mixes taken from a real league: 20-80 ratings in steps
+# of 5 with the odd "-", star ratings, velocity ranges, G/F codes and about 35 players per
+# team. The same size and seed always give the same files. Rows are written as they are made,
+# so 100k-player leagues don't need to fit in memory. --format csv writes the same rows as
+# pitchers.csv and batters.csv.
+#
+#   python synth_exports.py bench_exports/10k --players 10000
+#   python synth_exports.py out --players 100000 --seed 7
+#   python synth_exports.py out --format csv
+
+PLAYERS_PER_TEAM = 35
+PITCHER_SHARE = 0.51
+
+FIRST_NAMES = [
+    "Alex", "Ben", "Carlos", "Dae-ho", "Ed", "Felipe", "Greg", "Hiro", "Ivan", "Jake", "Kyle", "Luis",
+    "Marc", "Nate", "Omar", "Pedro", "Quinn", "Ryan", "Sam", "Tomas", "Uthman", "Victor", "Walter",
+    "Xander", "Yuki", "Zach", "Andre", "Brett", "Colin", "Diego", "Eli", "Frank", "Hector", "Jorge",
+]
+LAST_NAMES = [
+    "Abe", "Alarcon", "Bamberger", "Berneu", "Blom", "Butterell", "Castillo", "Duran", "Ernst", "Fenner",
+    "Gibbs", "Hughes", "Kinnaird", "Koehoorn", "Lopez", "Moreno", "Nakamura", "Ning", "Ortiz", "Park",
+    "Rennie", "Santos", "Son", "Tanaka", "van der Meij", "Wallace", "Watts", "Young", "Zimmer", "Abdul-Basit",
+]
+
+BATTER_POSITIONS = [("C", 14), ("1B", 12), ("2B", 12), ("3B", 12), ("SS", 10), ("LF", 14), ("CF", 12), ("RF", 12), ("DH", 2)]
+PITCHER_POSITIONS = [("RP", 57), ("SP", 36), ("CL", 7)]
+BATS = [("R", 60), ("L", 30), ("S", 10)]
+THROWS = [("R", 70), ("L", 30)]
+PRONE = [("Normal", 58), ("Fragile", 20), ("Durable", 11), ("Iron Man", 5), ("Wrecked", 6)]
+SCOUT_ACCURACY = [("Very High", 65), ("High", 25), ("Average", 6), ("Low", 2), ("Very Low", 2)]
+GROUND_FLY = [("NEU", 49), ("GB", 20), ("FB", 13), ("EX GB", 10), ("EX FB", 8)]
+
+# pitch rating header -> share of pitchers who throw it
+PITCH_SHARES = {
+    "FB": 0.83, "CH": 0.45, "CB": 0.35, "SL": 0.5, "SI": 0.3, "SP": 0.12,
+    "CT": 0.2, "FO": 0.03, "CC": 0.08, "SC": 0.02, "KC": 0.05, "KN": 0.005,
+}
+
+INFIELD = {"1B", "2B", "3B", "SS"}
+OUTFIELD = {"LF", "CF", "RF"}
+
+
+def pick(rng, weighted):
+    values, weights = zip(*weighted)
+    return rng.choices(values, weights)[0]
+
+
+def rating(rng, mean=50, spread=9, missing=0.01):
+    if rng.random() < missing:
+        return "-"
+    return str(min(80, max(20, 5 * round(rng.gauss(mean, spread) / 5))))
+
+
+def potential(rng, current):
+    if current == "-":
+        return "-"
+    return str(min(80, int(current) + rng.choice((0, 0, 0, 5, 5, 10, 15))))
+
+
+def stars(rng, mean):
+    # OVR/POT pair; 2.5 stars is the common case, as in a real league
+    ovr = min(5.0, max(0.5, round((mean - 20) / 6) / 2 + rng.choice((-0.5, 0, 0, 0.5))))
+    pot = min(5.0, ovr + rng.choice((0, 0, 0.5, 1.0)))
+    return f"{ovr:.1f} Stars", f"{pot:.1f} Stars"
+
+
+def team_codes(count):
+    # AAA, AAB, ... so any league size gets distinct three-letter codes
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    return [letters[i // 676 % 26] + letters[i // 26 % 26] + letters[i % 26] for i in range(count)]
+
+
+def person(rng, player_id, teams):
+    return {
+        "ID": str(player_id),
+        "Name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "ORG": rng.choice(teams),
+        "Age": str(min(44, max(17, round(rng.gauss(27, 4))))),
+        "B": pick(rng, BATS),
+        "Prone": pick(rng, PRONE),
+        "SctAcc": pick(rng, SCOUT_ACCURACY),
+    }
+
+
+def batter_row(rng, player_id, teams):
+    row = person(rng, player_id, teams)
+    pos = pick(rng, BATTER_POSITIONS)
+    row["POS"] = pos
+    for current, pot in (("CON", "CON P"), ("GAP", "GAP P"), ("POW", "POW P"), ("EYE", "EYE P"), ("K's", "K P")):
+        row[current] = rating(rng)
+        row[pot] = potential(rng, row[current])
+    for header in ("C ABI", "C FRM", "C ARM"):
+        row[header] = rating(rng, 60) if pos == "C" else rating(rng, 20, 3)
+    for header in ("IF RNG", "IF ERR", "IF ARM", "TDP"):
+        row[header] = rating(rng, 52) if pos in INFIELD else rating(rng, 35)
+    for header in ("OF RNG", "OF ERR", "OF ARM"):
+        row[header] = rating(rng, 52) if pos in OUTFIELD else rating(rng, 35)
+    for header in ("SPE", "STE", "RUN"):
+        row[header] = rating(rng, 45, 12)
+    row["OVR"], row["POT"] = stars(rng, int(row["CON"]) if row["CON"] != "-" else 50)
+    return [row[header] for header in REQUIRED_BATTER_FIELDS]
+
+
+def pitcher_row(rng, player_id, teams):
+    row = person(rng, player_id, teams)
+    pos = pick(rng, PITCHER_POSITIONS)
+    row["POS"] = pos
+    row["T"] = pick(rng, THROWS)
+    for current, pot in (("STU", "STU P"), ("MOV", "MOV P"), ("CON", "CON P")):
+        row[current] = rating(rng, missing=0)
+        row[pot] = potential(rng, row[current])
+    pitches = 0
+    for header, share in PITCH_SHARES.items():
+        if rng.random() < share or pitches < (3 if pos == "SP" else 2):
+            row[header] = rating(rng, 58, missing=0)
+            pitches += 1
+        else:
+            row[header] = "-"
+        row[header + "P"] = potential(rng, row[header])
+    row["PIT"] = str(pitches)
+    low = rng.choice(range(88, 99))
+    row["VELO"] = "100+" if rng.random() < 0.01 else f"{low}-{low + 2}"
+    row["STM"] = rating(rng, 55 if pos == "SP" else 35, missing=0)
+    row["G/F"] = pick(rng, GROUND_FLY)
+    row["HLD"] = rating(rng, 55, 12, missing=0)
+    row["OVR"], row["POT"] = stars(rng, int(row["STU"]))
+    return [row[header] for header in REQUIRED_PITCHER_FIELDS]
+
+
+# --- HTML ---
+PAGE_TOP = """<!DOCTYPE html>
+<html><head><meta http-equiv="Content-Type" content="text/html; charset=UTF-8">
+<title>Player List</title>
+</head>
+
+<body class="ext_bg">
+
+<table cellspacing="0" cellpadding="0" align="center" width="968px">
+
+\t<tbody><tr>
+\t\t<td class="boxtitle">
+\t\t\tPlayer List
+\t\t</td>
+\t</tr>\t\t
+\t<tr>
+\t\t<td>
+\t\t\t<table cellspacing="0" cellpadding="0" class="data sortable" width="968px"><thead><tr>
+"""
+
+PAGE_BOTTOM = """\t\t\t</tbody><tfoot></tfoot></table>
+
+\t\t</td>
+\t</tr>
+</tbody></table>
+
+</body></html>
+"""
+
+RIGHT_ALIGNED = {"ID", "Age"}
+
+
+def write_table(path, headers, rows):
+    # Returns the number of rows written
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(PAGE_TOP)
+        for header in headers:
+            f.write(f'<th class="hsc {"dr" if header in RIGHT_ALIGNED else "dl"}">{header}</th>\n')
+        f.write("\t</tr></thead>\n\t\t\t\t<tbody>\n")
+        cell_classes = ["dr" if header in RIGHT_ALIGNED else "dL" for header in headers]
+        for row in rows:
+            f.write("\t<tr>\n")
+            f.write("".join(f'\t<td class="{cls}">{value}</td>\n' for cls, value in zip(cell_classes, row)))
+            f.write("\t</tr>\n")
+            count += 1
+        f.write(PAGE_BOTTOM)
+    return count
+
+
+def write_csv(path, headers, rows):
+    # Returns the number of rows written
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+WRITERS = {"html": write_table, "csv": write_csv}
+
+
+def write_league(directory, players, seed=0, file_format="html"):
+    # Writes pitchers.html and batters.html (or .csv) for a league of that many players;
+    # returns (pitchers, batters) written
+    write = WRITERS[file_format]
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    teams = team_codes(max(2, round(players / PLAYERS_PER_TEAM)))
+    pitcher_count = round(players * PITCHER_SHARE)
+    batter_count = players - pitcher_count
+    pitchers = write(
+        directory / f"pitchers.{file_format}", REQUIRED_PITCHER_FIELDS,
+        (pitcher_row(rng, 10000 + i, teams) for i in range(pitcher_count))
+    )
+    batters = write(
+        directory / f"batters.{file_format}", REQUIRED_BATTER_FIELDS,
+        (batter_row(rng, 10000 + pitcher_count + i, teams) for i in range(batter_count))
+    )
+    return pitchers, batters
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="synth_exports.py", description="Write synthetic OOTP exports.")
+    parser.add_argument("directory", help="folder to write the pitchers and batters exports into")
+    parser.add_argument("--players", type=int, default=10000, help="league size (default: 10000)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    parser.add_argument("--format", choices=list(WRITERS), default="html", help="export format (default: html)")
+    args = parser.parse_args(argv)
+
+    pitchers, batters = write_league(args.directory, args.players, args.seed, args.format)
+    print(f"Wrote {pitchers} pitchers and {batters} batters to {args.directory}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+import csv
+from html.parser import HTMLParser
+import mmap
+import re
+
+# Streaming reader for the OOTP "Player List" export.
+# Walks the HTML with the stdlib parser in fixed-size chunks instead of building a
+# whole-document tree, so memory stays bounded by one chunk plus the rows not yet consumed.
+# The same view saved as CSV is read with the csv module instead, which is several times
+# faster; iter_export_rows tells the two apart by their first bytes, whatever the file is called.
+
+CHUNK_SIZE = 64 * 1024
+PARALLEL_CHUNK_BYTES = 1024 * 1024   # target size of one row range handed to a worker process
+
+# "data" as a whole class token, compared case-sensitively like _DataTableParser does
+# (class="data-grid" or class="DATA" is not the table the serial parser reads)
+DATA_TABLE_START = re.compile(
+    rb"<(?i:table)\b[^>]*?(?<![\w-])(?i:class)\s*=\s*"
+    rb"(?:\"(?:[^\"]*\s)?data(?=[\s\"])|'(?:[^']*\s)?data(?=[\s'])|data(?=[\s>]))"
+)
+TABLE_END = re.compile(rb"</table\s*>", re.IGNORECASE)
+TBODY_START = re.compile(rb"<tbody\b[^>]*>", re.IGNORECASE)
+TBODY_END = re.compile(rb"</tbody\s*>", re.IGNORECASE)
+NESTED_TABLE = re.compile(rb"<table\b", re.IGNORECASE)
+ROW_START = re.compile(rb"<tr[\s>]", re.IGNORECASE)
+
+SNIFF_BYTES = 4096
+CSV_DELIMITERS = (",", ";", "\t")
+
+
+class _DataTableParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.headers = None
+        self.rows = []
+        self.found_table = False
+        self._table_depth = 0      # nesting depth inside the data table (0 = outside)
+        self._done = False
+        self._section = None       # "thead" / "tbody" of the data table
+        self._seen_thead = False
+        self._seen_tbody = False
+        self._header_cells = []
+        self._row = None
+        self._cell = None
+        self._text = []            # pieces of the current text node (feed() may split one)
+
+    def handle_starttag(self, tag, attrs):
+        if self._done:
+            return
+        self._flush_text()
+        if tag == "table":
+            if self._table_depth:
+                self._table_depth += 1
+            elif "data" in (dict(attrs).get("class") or "").split():
+                self.found_table = True
+                self._table_depth = 1
+            return
+        if not self._table_depth:
+            return
+
+        # Only the first thead/tbody count, matching table.find("thead")/find("tbody")
+        if tag == "thead" and not self._seen_thead:
+            self._seen_thead = True
+            self._section = "thead"
+        elif tag == "tbody" and not self._seen_tbody:
+            self._seen_tbody = True
+            self._section = "tbody"
+        elif self._section == "thead" and tag == "th":
+            self._cell = []
+        elif self._section == "tbody":
+            if tag == "tr":
+                self._row = []
+            elif tag == "td" and self._row is not None:
+                self._cell = []
+
+    def handle_endtag(self, tag):
+        if self._done or not self._table_depth:
+            return
+        self._flush_text()
+        if tag == "table":
+            self._table_depth -= 1
+            if not self._table_depth:
+                self._finish_section()
+                self._done = True
+            return
+
+        if tag == "thead" and self._section == "thead":
+            self._finish_section()
+        elif tag == "tbody" and self._section == "tbody":
+            self._finish_section()
+        elif tag == "th" and self._section == "thead" and self._cell is not None:
+            self._header_cells.append("".join(self._cell))
+            self._cell = None
+        elif tag == "td" and self._row is not None and self._cell is not None:
+            self._row.append("".join(self._cell))
+            self._cell = None
+        elif tag == "tr" and self._row is not None:
+            self.rows.append(tuple(self._row))
+            self._row = None
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._text.append(data)
+
+    def _flush_text(self):
+        # Same as get_text(strip=True): strip every text node, drop the empty ones
+        if self._text:
+            data = "".join(self._text).strip()
+            self._text = []
+            if data and self._cell is not None:
+                self._cell.append(data)
+
+    def _finish_section(self):
+        if self._section == "thead":
+            self.headers = tuple(self._header_cells)
+        self._section = None
+        self._row = None
+        self._cell = None
+
+
+def iter_table_rows(path, chunk_size=CHUNK_SIZE, executor=None):
+    # Yields (headers, cells) tuples for every row in the first <table class="data">.
+    # With an executor (e.g. a ProcessPoolExecutor) the rows are parsed in parallel byte ranges.
+    if executor is not None:
+        table = read_table_parallel(path, executor)
+        if table is not None:
+            headers, rows = table
+            for cells in rows:
+                yield headers, cells
+            return
+
+    parser = _DataTableParser()
+    with open(path, "r", encoding="utf-8") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                parser.close()
+            else:
+                parser.feed(chunk)
+
+            if parser.rows:
+                if parser.headers is None:
+                    raise ValueError("No table header found in HTML file.")
+                rows, parser.rows = parser.rows, []
+                for cells in rows:
+                    yield parser.headers, cells
+
+            if not chunk or parser._done:
+                break
+
+    if not parser.found_table:
+        raise ValueError("No table with class 'data' found in HTML file.")
+
+
+# --- CSV exports ---
+def export_format(path):
+    # "html" or "csv", from the start of the file: an HTML export opens with a tag
+    with open(path, "rb") as f:
+        start = f.read(SNIFF_BYTES)
+    start = start.removeprefix(b"\xef\xbb\xbf").lstrip()
+    return "html" if start.startswith(b"<") else "csv"
+
+
+def iter_csv_rows(path):
+    # Yields (headers, cells) tuples for every row of a CSV export, with the same stripped
+    # strings the HTML reader gives. The delimiter is whichever of , ; or tab the header uses most.
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        first_line = f.readline()
+        f.seek(0)
+        delimiter = max(CSV_DELIMITERS, key=first_line.count)
+        reader = csv.reader(f, delimiter=delimiter)
+        headers = next(reader, None)
+        if headers is None:
+            raise ValueError("CSV export is empty.")
+        headers = tuple(header.strip() for header in headers)
+        for cells in reader:
+            if cells:
+                yield headers, tuple(cell.strip() for cell in cells)
+
+
+def iter_export_rows(path, chunk_size=CHUNK_SIZE, executor=None):
+    # iter_table_rows or iter_csv_rows, whichever the file is; CSV is always read in one pass
+    if export_format(path) == "csv":
+        return iter_csv_rows(path)
+    return iter_table_rows(path, chunk_size, executor)
+
+
+# --- Parallel parsing ---
+# The export is memory-mapped and split on <tr> boundaries inside the data table's tbody.
+# Each byte range is parsed in a worker and the results are joined back in file order.
+
+def split_table(path, chunk_bytes=PARALLEL_CHUNK_BYTES):
+    # Returns (headers, [(start, end), ...]) or None when the layout isn't simple enough to split
+    with open(path, "rb") as f:
+        if not f.seek(0, 2):
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            table = DATA_TABLE_START.search(data)
+            if not table:
+                return None
+            # The tbody has to sit inside this table: a data table without one is read
+            # serially rather than split on some later table's rows
+            table_end = TABLE_END.search(data, table.end())
+            if not table_end:
+                return None
+            tbody = TBODY_START.search(data, table.end(), table_end.start())
+            if not tbody or NESTED_TABLE.search(data, table.end(), tbody.start()):
+                return None
+            tbody_end = TBODY_END.search(data, tbody.end(), table_end.start())
+            if not tbody_end or NESTED_TABLE.search(data, tbody.end(), tbody_end.start()):
+                return None
+
+            parser = _DataTableParser()
+            parser.feed(data[:tbody.start()].decode("utf-8"))
+            parser.close()
+            if parser.headers is None:
+                return None
+
+            ranges = []
+            start = None
+            for match in ROW_START.finditer(data, tbody.end(), tbody_end.start()):
+                if start is None:
+                    start = match.start()
+                elif match.start() - start >= chunk_bytes:
+                    ranges.append((start, match.start()))
+                    start = match.start()
+            if start is not None:
+                ranges.append((start, tbody_end.start()))
+    return parser.headers, ranges
+
+
+def parse_row_range(path, start, end):
+    # Worker side: parse the <tr> elements in one byte range of the data table
+    with open(path, "rb") as f:
+        f.seek(start)
+        fragment = f.read(end - start).decode("utf-8")
+    parser = _DataTableParser()
+    parser.feed('<table class="data"><tbody>' + fragment + "</tbody></table>")
+    parser.close()
+    return parser.rows
+
+
+def read_table_parallel(path, executor, chunk_bytes=PARALLEL_CHUNK_BYTES):
+    # Returns (headers, rows) or None if the file has to be read sequentially
+    layout = split_table(path, chunk_bytes)
+    if layout is None:
+        return None
+    headers, ranges = layout
+    path = str(path)
+    futures = [executor.submit(parse_row_range, path, start, end) for start, end in ranges]
+    rows = []
+    for future in futures:
+        rows.extend(future.result())
+    return headers, rows
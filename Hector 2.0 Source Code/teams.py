@@ -0,0 +1,167 @@
+from bisect import bisect_right
+
+# Team summaries shared by the Teams tab and the command line.
+# ORG is factorized once into integer team codes over both rosters; every team figure is
+# then a bincount-style reduction (one flat list indexed by code) instead of per-row dict
+# lookups. Position depth and the age distribution come out of the same grouping as the
+# totals, at no extra pass over the rows.
+
+TEAM_COLUMNS = ("Team", "Avg Age", "SP Total", "RP Total", "Team Pitching Total", "Batters Total", "Total Team Score")
+
+# Ages below each edge fall in the bin before it
+AGE_BIN_EDGES = [23, 26, 30, 34]
+AGE_BIN_LABELS = ["22 and under", "23-25", "26-29", "30-33", "34+"]
+
+
+def factorize(values):
+    # Integer code per value, and the distinct values in first-seen order
+    lookup = {}
+    codes = [lookup.setdefault(value, len(lookup)) for value in values]
+    return codes, list(lookup)
+
+
+def bincount(codes, weights=None, size=0):
+    # Sum of weights (or count) per code; values are added in row order
+    counts = [0] * size
+    if weights is None:
+        for code in codes:
+            counts[code] += 1
+    else:
+        for code, weight in zip(codes, weights):
+            counts[code] += weight
+    return counts
+
+
+def to_age(value):
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+SP, RP, OTHER_ROLE = 0, 1, 2
+
+def pitcher_role(pos):
+    if pos == "SP":
+        return SP
+    if pos in ("RP", "CL"):
+        return RP
+    return OTHER_ROLE
+
+
+def group_rosters(pitchers, batters):
+    # Every player is factorized on (team, position, age) in one pass; depth and age figures
+    # come from the counts per distinct key. None of this reads scores, so it can be kept for
+    # as long as the rosters are, and re-scoring only has to redo team_totals.
+    players = list(pitchers) + list(batters)
+    key_codes, keys = factorize([(p.get("ORG", "Unknown"), p.get("POS", ""), p.get("Age")) for p in players])
+    key_counts = bincount(key_codes, None, len(keys))
+
+    key_teams, teams = factorize([team for team, _, _ in keys])
+    key_pos, positions = factorize([pos for _, pos, _ in keys])
+    size = len(teams)
+    bins = len(AGE_BIN_LABELS)
+
+    depth = [0] * (size * len(positions))
+    age_sum = [0] * size
+    age_count = [0] * size
+    age_hist = [0] * (size * bins)
+    for (_, _, age), team, pos, count in zip(keys, key_teams, key_pos, key_counts):
+        depth[team * len(positions) + pos] += count
+        age = to_age(age)
+        if age is not None:
+            # Ages are whole numbers, so count * age adds up exactly like the ages one by one
+            age_sum[team] += age * count
+            age_count[team] += count
+            age_hist[team * bins + bisect_right(AGE_BIN_EDGES, age)] += count
+
+    key_roles = [team * 3 + pitcher_role(pos) for team, (_, pos, _) in zip(key_teams, keys)]
+    return {
+        "teams": teams,
+        "pitcher_codes": [key_roles[code] for code in key_codes[:len(pitchers)]],   # team * 3 + role
+        "batter_codes": [key_teams[code] for code in key_codes[len(pitchers):]],
+        "age_sum": age_sum,
+        "age_count": age_count,
+        "positions": positions,
+        "depth": depth,
+        "age_hist": age_hist,
+    }
+
+
+def team_totals(groups, pitchers, batters):
+    # Score sums per team: pitchers by (team, role), batters by team. Pitchers come before
+    # batters and scores are added in roster order, as the old per-row loop did, so the
+    # totals match it exactly.
+    return sum_team_scores(
+        groups,
+        [p["Scores"].get("total", 0) for p in pitchers],
+        [b["Scores"].get("offense", 0) + b["Scores"].get("defense", 0) for b in batters],
+    )
+
+
+def sum_team_scores(groups, pitcher_scores, batter_scores):
+    # Same as team_totals, from one score per pitcher / batter in roster order
+    size = len(groups["teams"])
+    role_totals = bincount(groups["pitcher_codes"], pitcher_scores, size * 3)
+    return role_totals[SP::3], role_totals[RP::3], bincount(groups["batter_codes"], batter_scores, size)
+
+
+def team_score(sp, rp, batters_total):
+    # (SP, RP, pitching, batters, total), rounded the way the Teams tab shows them
+    sp_total = round(sp, 2)
+    rp_total = round(rp, 2)
+    team_pitching_total = round(sp_total + rp_total, 2)
+    batters_total = round(batters_total, 2)
+    return sp_total, rp_total, team_pitching_total, batters_total, round(team_pitching_total + batters_total, 2)
+
+
+def team_rows(pitchers, batters, groups=None):
+    # One (Team, Avg Age, SP, RP, pitching, batters, total) tuple per team, sorted by team.
+    # groups: group_rosters() of the same rosters, to skip the grouping after a re-score.
+    if groups is None:
+        groups = group_rosters(pitchers, batters)
+    sp, rp, batter_totals = team_totals(groups, pitchers, batters)
+    rows = []
+    for code, team in sorted(enumerate(groups["teams"]), key=lambda item: item[1]):
+        count = groups["age_count"][code]
+        avg_age = round(groups["age_sum"][code] / count, 2) if count else "N/A"
+        rows.append((team, avg_age) + team_score(sp[code], rp[code], batter_totals[code]))
+    return rows
+
+
+def team_breakdowns(groups):
+    # {team: {"depth": {pos: players}, "ages": {age bin: players}}}
+    positions = groups["positions"]
+    bins = len(AGE_BIN_LABELS)
+    breakdowns = {}
+    for code, team in enumerate(groups["teams"]):
+        depth = groups["depth"][code * len(positions):(code + 1) * len(positions)]
+        ages = groups["age_hist"][code * bins:(code + 1) * bins]
+        breakdowns[team] = {
+            "depth": {pos: count for pos, count in zip(positions, depth) if count},
+            "ages": dict(zip(AGE_BIN_LABELS, ages)),
+        }
+    return breakdowns
+
+
+# Positions in the order breakdown tables list them; any others follow in roster order
+DEPTH_POSITIONS = ["SP", "RP", "CL", "C", "1B", "2B", "3B", "SS", "LF", "CF", "RF", "DH"]
+
+
+def breakdown_columns(groups):
+    positions = DEPTH_POSITIONS + [pos for pos in groups["positions"] if pos not in DEPTH_POSITIONS]
+    return positions, ["Team"] + positions + AGE_BIN_LABELS
+
+
+def breakdown_rows(groups):
+    # One (Team, players per position..., players per age bin...) tuple per team, sorted by team
+    positions, _ = breakdown_columns(groups)
+    breakdowns = team_breakdowns(groups)
+    rows = []
+    for team in sorted(breakdowns):
+        depth = breakdowns[team]["depth"]
+        ages = breakdowns[team]["ages"]
+        rows.append((team, *[depth.get(pos, 0) for pos in positions], *[ages[label] for label in AGE_BIN_LABELS]))
+    return rows
@@ -0,0 +1,26 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The app's modules sit flat in the source folder, next to this tests folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# One synthetic league (synth_exports.py) for every test that needs real-looking rosters
+LEAGUE_PLAYERS = 1500
+LEAGUE_SEED = 4
+
+
+@pytest.fixture(scope="session")
+def league_dir(tmp_path_factory):
+    from synth_exports import write_league
+    directory = tmp_path_factory.mktemp("league")
+    write_league(directory, LEAGUE_PLAYERS, LEAGUE_SEED, "csv")
+    return directory
+
+
+@pytest.fixture(scope="session")
+def league(league_dir):
+    # load_all result for league_dir; tests only read it
+    from data_loader import load_all
+    return load_all(directory=league_dir, parallel=False)
@@ -0,0 +1,41 @@
+from pathlib import Path
+
+import pytest
+
+from cli import find_exports, output_names
+
+
+def make_export(path):
+    path.mkdir(parents=True)
+    (path / "pitchers.html").write_text("<table></table>")
+    (path / "batters.csv").write_text("ID,Name\n")
+    return path
+
+
+def test_output_names_are_folder_names_when_unique(tmp_path):
+    a = make_export(tmp_path / "league" / "week1")
+    b = make_export(tmp_path / "league" / "week2")
+    assert output_names([a, b]) == {a: "week1", b: "week2"}
+
+
+def test_output_names_use_the_path_below_the_common_folder_for_clashes(tmp_path):
+    a = make_export(tmp_path / "leagueA" / "week1")
+    b = make_export(tmp_path / "leagueB" / "week1")
+    c = make_export(tmp_path / "leagueB" / "week2")
+    names = output_names(find_exports([tmp_path / "leagueA", tmp_path / "leagueB"]))
+    assert names == {
+        a: str(Path("leagueA", "week1")),
+        b: str(Path("leagueB", "week1")),
+        c: str(Path("leagueB", "week2")),
+    }
+
+
+def test_find_exports_drops_a_folder_given_twice(tmp_path):
+    a = make_export(tmp_path / "week1")
+    assert find_exports([a, tmp_path / "week1" / ".." / "week1"]) == [a]
+
+
+def test_find_exports_rejects_a_folder_without_exports(tmp_path):
+    (tmp_path / "empty").mkdir()
+    with pytest.raises(ValueError):
+        find_exports([tmp_path / "empty"])
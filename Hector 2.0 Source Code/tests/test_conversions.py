@@ -0,0 +1,51 @@
+import operator
+
+import pytest
+
+from batters import calculate_batter_score
+from conversions import CONVERSIONS, conversion_indexes, recommend, batter_projections
+from player_query import to_float
+
+OPS = {">=": operator.ge, ">": operator.gt}
+
+
+def passes(player, thresholds):
+    for field, op, value in thresholds:
+        number = to_float(player.get(field))
+        if number is None or not OPS[op](number, value):
+            return False
+    return True
+
+
+@pytest.mark.parametrize("name", list(CONVERSIONS))
+def test_candidates_are_exactly_the_players_passing_every_threshold(league, name):
+    roster, from_positions, to_positions, thresholds = CONVERSIONS[name]
+    players = league[roster]
+    expected = {
+        id(p) for p in players
+        if str(p.get("POS", "")).upper() in from_positions and passes(p, thresholds)
+    }
+    results = recommend(name, league["pitchers"], league["batters"])
+    assert {id(r["player"]) for r in results} == expected
+    assert len(results) == len(expected) * len(to_positions)
+    assert expected   # the synthetic league has some of each
+
+
+def test_batter_projections_match_scoring_at_the_new_position(league):
+    candidates = [p for p in league["batters"] if p.get("POS") == "1B"][:30]
+    for target in ("2B", "SS", "3B"):
+        projected = batter_projections(candidates, target)
+        expected = [calculate_batter_score(dict(p.items(), POS=target))["total"] for p in candidates]
+        assert projected == expected
+
+
+def test_team_gain_is_over_the_weakest_player_at_the_target(league):
+    pitchers, batters = league["pitchers"], league["batters"]
+    results = recommend("1b_to_if", pitchers, batters, conversion_indexes(pitchers, batters))
+    for result in results:
+        team = result["player"].get("ORG")
+        at_target = [p["Scores"]["total"] for p in batters if p.get("ORG") == team and p.get("POS") == result["to"]]
+        assert result["team_gain"] == round(result["projected"] - (min(at_target) if at_target else 0), 2)
+        assert result["change"] == round(result["projected"] - result["score"], 2)
+    keys = [(r["projected"], r["team_gain"]) for r in results]
+    assert keys == sorted(keys, reverse=True)
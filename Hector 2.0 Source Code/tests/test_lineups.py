@@ -0,0 +1,83 @@
+from itertools import permutations
+import random
+
+import pytest
+
+from batters import calculate_batter_score
+from leaderboards import BATTER_POSITIONS
+from lineups import min_cost_assignment, best_assignment, position_scores, best_lineups, team_lineup
+
+
+def brute_force(scores):
+    # Highest summed score over every way of giving positions distinct players
+    positions, players = len(scores), len(scores[0])
+    if positions <= players:
+        return max(sum(scores[i][p[i]] for i in range(positions)) for p in permutations(range(players), positions))
+    return max(sum(scores[p[k]][k] for k in range(players)) for p in permutations(range(positions), players))
+
+
+def test_best_assignment_matches_brute_force():
+    rng = random.Random(1)
+    for _ in range(300):
+        positions, players = rng.randint(1, 6), rng.randint(1, 8)
+        scores = [[rng.choice([rng.randint(0, 50), rng.random() * 100]) for _ in range(players)]
+                  for _ in range(positions)]
+        assigned = best_assignment(scores)
+        taken = [k for k in assigned if k is not None]
+        assert len(taken) == len(set(taken)) == min(positions, players)
+        total = sum(scores[i][k] for i, k in enumerate(assigned) if k is not None)
+        assert total == pytest.approx(brute_force(scores))
+
+
+def test_min_cost_assignment_small_cases():
+    assert min_cost_assignment([]) == []
+    assert min_cost_assignment([[5]]) == [0]
+    assert min_cost_assignment([[4, 1, 3], [2, 0, 5], [3, 2, 2]]) == [1, 0, 2]
+    assert min_cost_assignment([[9, 1, 9, 9]]) == [1]
+
+
+def test_best_assignment_with_no_players():
+    assert best_assignment([[], []]) == [None, None]
+
+
+def test_score_at_listed_position_is_the_total(league):
+    batters = league["batters"]
+    scores = position_scores(batters)
+    checked = 0
+    for row, player in enumerate(batters):
+        pos = player.get("POS", "").upper()
+        if pos in scores:
+            assert round(scores[pos][row], 2) == player["Scores"]["total"]
+            checked += 1
+    assert checked
+
+
+def test_position_scores_match_calculate_batter_score(league):
+    batters = league["batters"]
+    scores = position_scores(batters)
+    for row, player in enumerate(batters[:40]):
+        for pos in BATTER_POSITIONS:
+            moved = dict(player.items(), POS=pos)
+            assert round(scores[pos][row], 2) == calculate_batter_score(moved)["total"]
+
+
+def test_lineups_are_optimal_for_small_teams(league):
+    batters = league["batters"]
+    scores = position_scores(batters)
+    rows = list(range(7))   # few enough players to try every assignment
+    lineup = team_lineup(batters, rows, scores)
+    matrix = [[scores[pos][row] for row in rows] for pos in BATTER_POSITIONS]
+    assert lineup["total"] == round(brute_force(matrix), 2)
+    assert sum(slot["player"] is None for slot in lineup["slots"]) == len(BATTER_POSITIONS) - len(rows)
+
+
+def test_every_team_gets_nine_different_players_and_beats_its_depth_chart(league):
+    batters = league["batters"]
+    lineups = best_lineups(batters)
+    assert set(lineups) == {player.get("ORG") for player in batters}
+    for lineup in lineups.values():
+        players = [id(slot["player"]) for slot in lineup["slots"] if slot["player"] is not None]
+        assert len(players) == len(set(players))
+        assert [slot["pos"] for slot in lineup["slots"]] == BATTER_POSITIONS
+        assert lineup["gain"] >= 0
+        assert lineup["total"] == pytest.approx(sum(slot["score"] for slot in lineup["slots"]), abs=0.05)
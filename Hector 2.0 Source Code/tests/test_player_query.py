@@ -0,0 +1,105 @@
+from player_query import build_index, parse_query, run_query, query_narrows
+
+PLAYERS = [
+    # name, team, pos, age, total
+    ("Kyle Seager", "TEX", "3B", 30, 150),
+    ("Ichiro Suzuki", "SEA", "RF", 38, 170),
+    ("Felix Hernandez", "SEA", "SP", 26, 190),
+    ("Carlos Santana", "CLE", "C", 26, 160),
+    ("Buster Posey", "SF", "C", 25, 210),
+    ("Chase Utley", "PHI", "2B", 33, 140),
+    ("Mike Smith", "CAS", "1B", 24, 120),
+    ("Joe Smithers", "CAS", "SS", 29, 130),
+]
+
+
+def make_index():
+    return build_index(
+        names=[p[0] for p in PLAYERS],
+        teams=[p[1] for p in PLAYERS],
+        positions=[p[2] for p in PLAYERS],
+        numbers={"age": [p[3] for p in PLAYERS], "total": [p[4] for p in PLAYERS]},
+    )
+
+
+def names(rows):
+    return sorted(PLAYERS[row][0] for row in rows)
+
+
+def test_parse_query_kinds():
+    index = make_index()
+    assert parse_query(">25 total>=150 cas 1b smi", index) == [
+        ("number", "age", (">", 25.0)),
+        ("number", "total", (">=", 150.0)),
+        ("team", None, "CAS"),
+        ("pos", None, "1B"),
+        ("name", None, "smi"),
+    ]
+
+
+def test_parse_query_splits_punctuated_names():
+    assert parse_query("o'neil", make_index()) == [("name", None, "o"), ("name", None, "neil")]
+
+
+def test_parse_query_unknown_field_is_a_name():
+    assert parse_query("foo>3", make_index()) == [("name", None, "foo"), ("name", None, "3")]
+
+
+def test_empty_query_matches_everything():
+    assert run_query(make_index(), "   ") is None
+
+
+def test_team_code_is_also_a_name_prefix():
+    # SEA players and Kyle Seager on TEX
+    assert names(run_query(make_index(), "sea")) == ["Felix Hernandez", "Ichiro Suzuki", "Kyle Seager"]
+
+
+def test_position_code_is_also_a_name_prefix():
+    # Catchers and every name with a word starting with C
+    assert names(run_query(make_index(), "c")) == ["Buster Posey", "Carlos Santana", "Chase Utley"]
+
+
+def test_codes_of_one_kind_or_together():
+    assert names(run_query(make_index(), "tex cle")) == ["Carlos Santana", "Kyle Seager"]
+
+
+def test_terms_of_different_kinds_and_together():
+    index = make_index()
+    assert names(run_query(index, "cas 1b")) == ["Mike Smith"]
+    assert names(run_query(index, "smi >25")) == ["Joe Smithers"]
+    assert names(run_query(index, "sea total>160")) == ["Felix Hernandez", "Ichiro Suzuki"]
+    assert run_query(index, "phi c >40") == set()
+
+
+def test_number_comparisons():
+    index = make_index()
+    assert names(run_query(index, "=26")) == ["Carlos Santana", "Felix Hernandez"]
+    assert names(run_query(index, "total<130")) == ["Mike Smith"]
+    assert names(run_query(index, "score<=130")) == ["Joe Smithers", "Mike Smith"]
+
+
+def test_query_narrows():
+    index = make_index()
+    assert query_narrows(index, "", "smi")
+    assert query_narrows(index, "sm", "smi")
+    assert query_narrows(index, "smi", "smi >25")
+    assert query_narrows(index, "cas", "cas smi")
+    assert not query_narrows(index, "smi", "sm")
+    assert not query_narrows(index, "cas", "cas tex")   # a wider team group
+    assert not query_narrows(index, "cas 1b", "cas")
+    # "se" is a name prefix, "sea" a team code that also lets SEA players through
+    assert not query_narrows(index, "se", "sea")
+
+
+def test_query_narrows_agrees_with_run_query():
+    index = make_index()
+    queries = ["", "s", "se", "sea", "c", "ca", "cas", "cas s", "cas smi", "sea >30", ">25", "total>140", "tex cle"]
+    everyone = set(range(len(PLAYERS)))
+    for old in queries:
+        for new in queries:
+            if query_narrows(index, old, new):
+                old_rows = run_query(index, old)
+                new_rows = run_query(index, new)
+                old_rows = everyone if old_rows is None else old_rows
+                new_rows = everyone if new_rows is None else new_rows
+                assert new_rows <= old_rows, (old, new)
@@ -0,0 +1,93 @@
+import copy
+import pickle
+
+import pytest
+
+from player_store import PlayerStore, build_column, MISSING
+
+HEADERS = ["ID", "Name", "POS", "CON", "VELO", "CON"]
+ROWS = [
+    ["1", "Ann Smith", "SS", "50", "90-92", "55"],
+    ["2", "Bob Jones", "SS", "-", "95+", "60"],
+    ["3", "Cy Young", "C", "80", "90-92", "65"],
+    ["4", "Di Ross", "SS", "45", "", "70"],
+]
+
+
+def make_store():
+    return PlayerStore(HEADERS, ROWS)
+
+
+def test_views_give_back_the_exported_strings():
+    store = make_store()
+    for player, cells in zip(store, ROWS):
+        expected = dict(zip(HEADERS, cells))   # a repeated header keeps its last column
+        assert player.to_dict() == expected
+        assert list(player) == list(expected)
+
+
+def test_column_kinds():
+    assert build_column(["50", "-", "80", "50"])[0] == "int"
+    assert build_column(["SS", "SS", "C", "SS"])[0] == "cat"
+    assert build_column(["Ann", "Bob", "Cy", "Di"])[0] == "str"
+    kind, data, (base, specials) = build_column(["50", "-", "80"])
+    assert data.typecode == "B" and specials == ["-"] and base == 81
+
+
+def test_get_contains_and_missing_keys():
+    player = make_store()[0]
+    assert player.get("Name") == "Ann Smith"
+    assert player.get("nope", "x") == "x"
+    assert "POS" in player and "nope" not in player
+    with pytest.raises(KeyError):
+        player["nope"]
+
+
+def test_set_value_and_add_column():
+    store = make_store()
+    store[1]["POS"] = "2B"
+    assert store.column("POS") == ["SS", "2B", "C", "SS"]
+    store[0]["Note"] = "hurt"
+    assert store[0]["Note"] == "hurt" and "Note" not in store[1]
+    store.add_column("Scores", [{"total": i} for i in range(4)])
+    assert store[3]["Scores"] == {"total": 3}
+    with pytest.raises(ValueError):
+        store.add_column("Scores", [1, 2])
+
+
+def test_blank_keys():
+    store = make_store()
+    assert store.blank_keys(["ID", "Name", "CON", "VELO", "nope"]) == {"VELO", "nope"}
+    store[0]["Note"] = "x"
+    assert store.blank_keys(["Note"]) == {"Note"}
+    assert PlayerStore(HEADERS, []).blank_keys(["ID"]) == set()
+
+
+def test_parsed_column_parses_each_distinct_value_once():
+    store = make_store()
+    calls = []
+
+    def parse(value):
+        calls.append(value)
+        return 0.0 if value == "-" else float(value)
+
+    # Whole numbers are read straight from the int column; only specials are parsed
+    assert list(store.parsed_column("CON", parse)) == [55.0, 60.0, 65.0, 70.0]
+    assert calls == []
+    store = PlayerStore(["CON"], [["50"], ["-"], ["-"], ["80"]])
+    assert list(store.parsed_column("CON", parse)) == [50.0, 0.0, 0.0, 80.0]
+    assert calls == ["-"]
+
+    positions = []
+    values = make_store().parsed_column("POS", lambda v: positions.append(v) or {"SS": 6.0, "C": 2.0}[v])
+    assert list(values) == [6.0, 6.0, 2.0, 6.0]
+    assert sorted(positions) == ["C", "SS"]
+    assert list(make_store().parsed_column("nope", float, missing=-1.0)) == [-1.0] * 4
+
+
+def test_copies_and_pickles_keep_the_values():
+    store = make_store()
+    store.add_column("Scores", [{"total": i} for i in range(4)])
+    for clone in (pickle.loads(pickle.dumps(store)), copy.deepcopy(store)):
+        assert [p.to_dict() for p in clone] == [p.to_dict() for p in store]
+    assert pickle.loads(pickle.dumps(MISSING)) is MISSING
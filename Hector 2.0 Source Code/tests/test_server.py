@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from server import RosterServer
+
+
+@pytest.fixture(scope="module")
+def rosters(league_dir):
+    return RosterServer(league_dir)
+
+
+def status(rosters):
+    code, body = rosters.respond("/status")
+    assert code == 200
+    return json.loads(body)
+
+
+def poll_with(rosters, monkeypatch, stamp, errors):
+    # One refresh as if the batters weights file had this stamp and polling it gave these errors
+    rosters.watcher.stamps["batters"] = stamp
+    monkeypatch.setattr(rosters.watcher, "poll", lambda players: (set(), errors))
+    rosters.checked = 0.0
+    rosters.refresh()
+
+
+def test_weights_error_is_reported_until_the_file_loads_again(rosters, monkeypatch):
+    assert status(rosters)["error"] is None
+
+    poll_with(rosters, monkeypatch, (1, 10), [("batters", SyntaxError("invalid syntax"))])
+    assert "Could not reload batters weights: SyntaxError: invalid syntax" in status(rosters)["error"]
+
+    # Nothing saved since: the watcher doesn't retry, and the error stays
+    poll_with(rosters, monkeypatch, (1, 10), [])
+    assert "batters weights" in status(rosters)["error"]
+
+    # Saved again and loaded
+    poll_with(rosters, monkeypatch, (2, 11), [])
+    assert status(rosters)["error"] is None
+
+
+def test_unknown_path_is_a_404(rosters):
+    code, body = rosters.respond("/nope")
+    assert code == 404
+    assert "error" in json.loads(body)
@@ -0,0 +1,45 @@
+import pytest
+
+from snapshots import encode_roster, decode_roster, movers, join_rows
+
+
+def snapshot(batters):
+    return {"batters": decode_roster(encode_roster(batters)), "pitchers": decode_roster(encode_roster([]))}
+
+
+def batter(player_id, name, total, age="25", org="CAS"):
+    return {"ID": player_id, "Name": name, "POS": "SS", "ORG": org, "Age": age, "Scores": {"total": total}}
+
+
+def test_join_rows_matches_on_id():
+    old = snapshot([batter("1", "A", 10), batter("2", "B", 20)])["batters"]
+    new = snapshot([batter("3", "C", 30), batter("2", "B", 25)])["batters"]
+    old_rows, new_rows, added, removed = join_rows(old, new)
+    assert list(old_rows) == [1]
+    assert list(new_rows) == [1]
+    assert added == ["3"]
+    assert removed == ["1"]
+
+
+def test_movers_risers_and_fallers():
+    old = snapshot([batter("1", "A", 10), batter("2", "B", 20), batter("3", "C", 30), batter("4", "D", 40)])
+    new = snapshot([batter("4", "D", 40), batter("3", "C", 25), batter("1", "A", 18), batter("2", "B", 21)])
+    risers, fallers = movers(old, new)
+    assert [(r["ID"], r["old"], r["new"], r["delta"]) for r in risers] == [("1", 10, 18, 8), ("2", 20, 21, 1)]
+    assert [(f["ID"], f["delta"]) for f in fallers] == [("3", -5)]
+    assert risers[0]["Name"] == "A"
+
+
+def test_movers_rejects_a_field_numeric_in_one_snapshot_only():
+    old = snapshot([batter("1", "A", 10, age="n/a"), batter("2", "B", 20, age="?")])
+    new = snapshot([batter("1", "A", 10, age="25"), batter("2", "B", 20, age="26")])
+    with pytest.raises(ValueError, match="numeric"):
+        movers(old, new, field="Age")
+    with pytest.raises(ValueError, match="numeric"):
+        movers(new, old, field="Age")
+
+
+def test_movers_rejects_a_missing_field():
+    old = snapshot([batter("1", "A", 10)])
+    with pytest.raises(ValueError):
+        movers(old, old, field="nope")
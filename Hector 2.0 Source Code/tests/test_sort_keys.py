@@ -0,0 +1,35 @@
+import random
+
+from sort_keys import column_keys, number_key, prone_key, velo_key, sorted_positions, reverse_positions
+
+
+def test_prone_order():
+    values = ["Iron Man", "fragile", "Normal", "wrecked", "Durable", "???"]
+    assert sorted(values, key=prone_key) == ["???", "wrecked", "fragile", "Normal", "Durable", "Iron Man"]
+
+
+def test_velo_ranges_and_plus():
+    assert velo_key("90-92") == 92.0
+    assert velo_key("100+") > velo_key("100") > velo_key("97-99")
+    assert velo_key("fast") == -1
+
+
+def test_number_key_stars_and_placeholders():
+    assert number_key("3.5 Stars") == 3.5
+    assert number_key("-") == 0.0
+    assert number_key(7) == 7.0
+
+
+def test_a_text_cell_makes_the_column_text():
+    assert column_keys("Age", ["25", "-", "31"]) == [25.0, 0.0, 31.0]
+    assert column_keys("Name", ["Smith", "42", "adams"]) == ["smith", "42", "adams"]
+    assert column_keys("Prone", ["Normal", "Wrecked"]) == [2, 0]
+
+
+def test_reverse_positions_is_a_stable_descending_sort():
+    rng = random.Random(3)
+    for _ in range(200):
+        keys = [rng.randint(0, 5) for _ in range(rng.randint(0, 30))]
+        order = sorted_positions(keys)
+        assert order == sorted(range(len(keys)), key=keys.__getitem__)
+        assert reverse_positions(order, keys) == sorted(range(len(keys)), key=keys.__getitem__, reverse=True)
@@ -0,0 +1,50 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from table_reader import iter_table_rows, read_table_parallel, split_table
+
+HEAD = "<thead><tr><th>ID</th><th>Name</th></tr></thead>"
+
+
+def rows_html(*names):
+    return "".join(f"<tr><td>{i}</td><td>{name}</td></tr>" for i, name in enumerate(names, 1))
+
+
+def write_export(tmp_path, body):
+    path = tmp_path / "export.html"
+    path.write_text(f"<html><body>{body}</body></html>", encoding="utf-8")
+    return path
+
+
+def serial_rows(path):
+    return [cells for _, cells in iter_table_rows(path)]
+
+
+def test_split_rows_match_the_serial_parser(tmp_path):
+    names = [f"Player {i}" for i in range(200)]
+    path = write_export(tmp_path, f'<table class="sortable data">{HEAD}<tbody>{rows_html(*names)}</tbody></table>')
+    headers, ranges = split_table(path, chunk_bytes=512)
+    assert headers == ("ID", "Name")
+    assert len(ranges) > 1
+    with ThreadPoolExecutor(2) as executor:
+        assert read_table_parallel(path, executor, chunk_bytes=512) == (headers, serial_rows(path))
+
+
+def test_class_names_containing_data_are_skipped(tmp_path):
+    decoy = f'<table class="data-grid">{HEAD}<tbody>{rows_html("Decoy")}</tbody></table>'
+    upper = f'<table class="DATA">{HEAD}<tbody>{rows_html("Upper")}</tbody></table>'
+    real = f"<table class='data'>{HEAD}<tbody>{rows_html('Real')}</tbody></table>"
+    path = write_export(tmp_path, decoy + upper + real)
+    with ThreadPoolExecutor(1) as executor:
+        headers, rows = read_table_parallel(path, executor)
+    assert rows == serial_rows(path) == [("1", "Real")]
+
+
+def test_data_table_without_tbody_is_not_split_on_a_later_table(tmp_path):
+    first = f'<table class="data">{HEAD}{rows_html("First")}</table>'
+    later = f'<table class="other">{HEAD}<tbody>{rows_html("Later")}</tbody></table>'
+    path = write_export(tmp_path, first + later)
+    assert split_table(path) is None
+    with ThreadPoolExecutor(1) as executor:
+        rows = [cells for _, cells in iter_table_rows(path, executor=executor)]
+    assert rows == serial_rows(path)
+    assert ("1", "Later") not in rows
@@ -0,0 +1,74 @@
+from teams import factorize, bincount, group_rosters, team_rows, team_breakdowns, breakdown_rows, AGE_BIN_LABELS
+
+
+def pitcher(org, pos, age, total):
+    return {"ORG": org, "POS": pos, "Age": age, "Scores": {"total": total}}
+
+
+def batter(org, pos, age, offense, defense):
+    return {"ORG": org, "POS": pos, "Age": age, "Scores": {"offense": offense, "defense": defense}}
+
+
+PITCHERS = [
+    pitcher("CAS", "SP", "22", 100.5), pitcher("CAS", "RP", "30", 40.25), pitcher("CAS", "CL", "34", 10),
+    pitcher("ATL", "SP", "27", 90), pitcher("ATL", "SP", "", 80),
+]
+BATTERS = [
+    batter("CAS", "C", "25", 50, 10), batter("CAS", "SS", "22", 60, 20),
+    batter("ATL", "1B", "31", 70, 5), batter("TOR", "CF", "n/a", 30, 15),
+]
+
+
+def naive_team_rows(pitchers, batters):
+    # The per-row loop the grouped version replaced
+    teams = {}
+    for p in pitchers:
+        team = teams.setdefault(p["ORG"], {"sp": 0, "rp": 0, "bat": 0, "ages": []})
+        if p["POS"] == "SP":
+            team["sp"] += p["Scores"]["total"]
+        elif p["POS"] in ("RP", "CL"):
+            team["rp"] += p["Scores"]["total"]
+    for b in batters:
+        teams.setdefault(b["ORG"], {"sp": 0, "rp": 0, "bat": 0, "ages": []})["bat"] += (
+            b["Scores"]["offense"] + b["Scores"]["defense"])
+    for p in pitchers + batters:
+        try:
+            teams[p["ORG"]]["ages"].append(float(p["Age"]))
+        except ValueError:
+            pass
+    rows = []
+    for name in sorted(teams):
+        t = teams[name]
+        avg = round(sum(t["ages"]) / len(t["ages"]), 2) if t["ages"] else "N/A"
+        pitching = round(round(t["sp"], 2) + round(t["rp"], 2), 2)
+        rows.append((name, avg, round(t["sp"], 2), round(t["rp"], 2), pitching, round(t["bat"], 2),
+                     round(pitching + round(t["bat"], 2), 2)))
+    return rows
+
+
+def test_factorize_and_bincount():
+    codes, values = factorize(["b", "a", "b", "c"])
+    assert codes == [0, 1, 0, 2] and values == ["b", "a", "c"]
+    assert bincount(codes, size=3) == [2, 1, 1]
+    assert bincount(codes, [1.5, 2, 3, 4], 3) == [4.5, 2, 4]
+
+
+def test_team_rows_match_a_per_row_loop():
+    assert team_rows(PITCHERS, BATTERS) == naive_team_rows(PITCHERS, BATTERS)
+
+
+def test_team_rows_reuse_groups_after_a_rescore():
+    groups = group_rosters(PITCHERS, BATTERS)
+    rescored = [dict(p, Scores={"total": p["Scores"]["total"] * 2}) for p in PITCHERS]
+    assert team_rows(rescored, BATTERS, groups) == naive_team_rows(rescored, BATTERS)
+
+
+def test_breakdowns_count_positions_and_age_bins():
+    breakdowns = team_breakdowns(group_rosters(PITCHERS, BATTERS))
+    assert breakdowns["CAS"]["depth"] == {"SP": 1, "RP": 1, "CL": 1, "C": 1, "SS": 1}
+    assert breakdowns["CAS"]["ages"] == dict(zip(AGE_BIN_LABELS, [2, 1, 0, 1, 1]))
+    assert breakdowns["TOR"]["ages"] == dict(zip(AGE_BIN_LABELS, [0, 0, 0, 0, 0]))
+
+
+def test_breakdown_rows_are_sorted_by_team():
+    assert [row[0] for row in breakdown_rows(group_rosters(PITCHERS, BATTERS))] == ["ATL", "CAS", "TOR"]
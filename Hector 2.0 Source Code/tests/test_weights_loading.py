@@ -0,0 +1,33 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SOURCE_DIR = Path(__file__).resolve().parent.parent
+
+CHECK = """
+import sys
+import {modules}
+import batters, pitchers
+assert "section_weights" not in vars(batters) and "section_weights" not in vars(pitchers), "weights loaded at import"
+assert isinstance(batters.section_weights, dict) and isinstance(pitchers.section_weights, dict)
+"""
+
+
+def run_check(modules):
+    # A fresh interpreter, so no other test has loaded the weights yet
+    result = subprocess.run(
+        [sys.executable, "-c", CHECK.format(modules=", ".join(modules))],
+        cwd=SOURCE_DIR, capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_importing_the_app_modules_does_not_run_the_weight_files():
+    run_check(["data_loader", "leaderboards", "weights_watcher", "conversions", "lineups", "workspace", "teams"])
+
+
+def test_importing_the_gui_does_not_run_the_weight_files():
+    pytest.importorskip("tkinter")
+    run_check(["gui"])
@@ -0,0 +1,262 @@
+from tkinter import ttk
+
+# Virtual-scrolling table for very large rosters.
+# VirtualTable keeps every row in memory (values, order, tags) and only gives the real
+# ttk.Treeview enough items to fill the visible window; scrolling rewrites those items.
+# It answers the subset of the Treeview API gui.py uses (insert/delete/get_children/
+# set_children/set/item/heading/column/tag_configure/bind/identify_row/focus/...),
+# so the same sort, filter, hover and double-click code drives either kind of table.
+
+
+class VirtualTable(ttk.Frame):
+    def __init__(self, master, columns, show="headings", **kwargs):
+        super().__init__(master, **kwargs)
+        self.tree = ttk.Treeview(self, columns=columns, show=show, selectmode="browse")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self._columns = list(self.tree["columns"])
+        self._values = {}        # iid -> values tuple
+        self._tags = {}          # iid -> tags
+        self._order = []         # attached iids, in display order
+        self._positions = None   # iid -> index in _order, rebuilt on demand
+        self._top = 0            # index in _order of the first visible row
+        self._slots = []         # Treeview items used as the visible window
+        self._slot_iids = {}     # slot item -> iid shown in it
+        self._selected = None
+        self._next_iid = 0
+        self._redraw_pending = False
+
+        self.tree.bind("<Configure>", lambda e: self._redraw())
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.yview_scroll(-3, "units"))
+        self.tree.bind("<Button-5>", lambda e: self.yview_scroll(3, "units"))
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<Up>", lambda e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self._move_selection(-self._visible_rows()))
+        self.tree.bind("<Next>", lambda e: self._move_selection(self._visible_rows()))
+
+    # --- Treeview API ---
+    def cget(self, key):
+        if key == "columns":
+            return self.tree.cget("columns")
+        return super().cget(key)
+
+    __getitem__ = cget
+
+    def heading(self, column, **kwargs):
+        return self.tree.heading(column, **kwargs)
+
+    def column(self, column, **kwargs):
+        return self.tree.column(column, **kwargs)
+
+    def tag_configure(self, tagname, **kwargs):
+        return self.tree.tag_configure(tagname, **kwargs)
+
+    def identify_region(self, x, y):
+        return self.tree.identify_region(x, y)
+
+    def bind(self, sequence=None, func=None, add=None):
+        # Handlers see this table as event.widget, like they would with a plain Treeview
+        if func is None:
+            return self.tree.bind(sequence)
+        def handler(event):
+            event.widget = self
+            return func(event)
+        return self.tree.bind(sequence, handler, add)
+
+    def insert(self, parent, index, iid=None, values=(), **kwargs):
+        if iid is None:
+            iid = f"V{self._next_iid}"
+            self._next_iid += 1
+        self._values[iid] = tuple(values)
+        if kwargs.get("tags"):
+            self._tags[iid] = kwargs["tags"]
+        if index == "end":
+            self._order.append(iid)
+        else:
+            self._order.insert(index, iid)
+        self._positions = None
+        self._schedule_redraw()
+        return iid
+
+    def delete(self, *items):
+        items = set(items)
+        if not items:
+            return
+        for iid in items:
+            self._values.pop(iid, None)
+            self._tags.pop(iid, None)
+        self._order = [iid for iid in self._order if iid not in items]
+        self._positions = None
+        if self._selected in items:
+            self._selected = None
+        self._schedule_redraw()
+
+    def get_children(self, item=""):
+        return tuple(self._order)
+
+    def set_children(self, item, *newchildren):
+        self._order = list(newchildren)
+        self._positions = None
+        self._schedule_redraw()
+
+    def detach(self, *items):
+        items = set(items)
+        self._order = [iid for iid in self._order if iid not in items]
+        self._positions = None
+        self._schedule_redraw()
+
+    def move(self, item, parent, index):
+        if item in self._index():
+            self._order.remove(item)
+        self._order.insert(index, item)
+        self._positions = None
+        self._schedule_redraw()
+
+    reattach = move
+
+    def set(self, item, column=None, value=None):
+        values = self._values[item]
+        if column is None:
+            return dict(zip(self._columns, values))
+        col = self._columns.index(column)
+        if value is None:
+            return values[col]
+        values = list(values)
+        values[col] = value
+        self._values[item] = tuple(values)
+        self._refresh_row(item)
+
+    def item(self, item, option=None, **kwargs):
+        if "values" in kwargs:
+            self._values[item] = tuple(kwargs["values"])
+        if "tags" in kwargs:
+            self._tags[item] = kwargs["tags"]
+        if kwargs:
+            self._refresh_row(item)
+            return None
+        info = {"values": list(self._values[item]), "tags": list(self._tags.get(item, ()))}
+        return info[option] if option else info
+
+    def exists(self, item):
+        return item in self._values
+
+    def identify_row(self, y):
+        return self._slot_iids.get(self.tree.identify_row(y), "")
+
+    def focus(self, item=None):
+        if item is None:
+            return self._selected or ""
+        self._selected = item
+        self._schedule_redraw()
+
+    def selection(self):
+        return (self._selected,) if self._selected else ()
+
+    def see(self, item):
+        index = self._index().get(item)
+        if index is None:
+            return
+        rows = self._visible_rows()
+        if index < self._top:
+            self._top = index
+        elif index >= self._top + rows:
+            self._top = index - rows + 1
+        self._redraw()
+
+    def yview_scroll(self, number, what):
+        step = self._visible_rows() if what == "pages" else 1
+        self._scroll_to(self._top + number * step)
+
+    def yview_moveto(self, fraction):
+        self._scroll_to(int(round(float(fraction) * len(self._order))))
+
+    # --- Rendering ---
+    def _index(self):
+        if self._positions is None:
+            self._positions = {iid: i for i, iid in enumerate(self._order)}
+        return self._positions
+
+    def _visible_rows(self):
+        rowheight = ttk.Style().lookup("Treeview", "rowheight")
+        try:
+            rowheight = int(rowheight)
+        except (TypeError, ValueError):
+            rowheight = 20
+        height = self.tree.winfo_height()
+        if height <= 1:
+            height = int(self.tree.cget("height")) * rowheight + rowheight
+        return max(1, (height - rowheight) // rowheight)   # one row's worth for the headings
+
+    def _scroll_to(self, top):
+        top = max(0, min(top, len(self._order) - self._visible_rows()))
+        if top != self._top:
+            self._top = top
+            self._redraw()
+
+    def _schedule_redraw(self):
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._redraw)
+
+    def _redraw(self):
+        self._redraw_pending = False
+        rows = self._visible_rows()
+        self._top = max(0, min(self._top, len(self._order) - rows))
+        window = self._order[self._top:self._top + rows]
+
+        while len(self._slots) < len(window):
+            self._slots.append(self.tree.insert("", "end"))
+        self._slot_iids = {}
+        selected_slot = None
+        for slot, iid in zip(self._slots, window):
+            self.tree.item(slot, values=self._values[iid], tags=self._tags.get(iid, ()))
+            self._slot_iids[slot] = iid
+            if iid == self._selected:
+                selected_slot = slot
+        self.tree.set_children("", *self._slots[:len(window)])
+
+        if selected_slot is not None:
+            self.tree.selection_set(selected_slot)
+            self.tree.focus(selected_slot)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+
+        total = len(self._order)
+        if total:
+            self.scrollbar.set(self._top / total, (self._top + len(window)) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _refresh_row(self, iid):
+        for slot, shown in self._slot_iids.items():
+            if shown == iid:
+                self.tree.item(slot, values=self._values[iid], tags=self._tags.get(iid, ()))
+                break
+
+    # --- Events ---
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self.yview_moveto(args[1])
+        elif args[0] == "scroll":
+            self.yview_scroll(int(args[1]), args[2])
+
+    def _on_mousewheel(self, event):
+        self.yview_scroll(-3 if event.delta > 0 else 3, "units")
+
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        if selection and selection[0] in self._slot_iids:
+            self._selected = self._slot_iids[selection[0]]
+
+    def _move_selection(self, step):
+        if not self._order:
+            return "break"
+        index = self._index().get(self._selected, self._top - (1 if step > 0 else 0))
+        index = max(0, min(index + step, len(self._order) - 1))
+        self._selected = self._order[index]
+        self.see(self._selected)
+        return "break"
@@ -0,0 +1,93 @@
+import os
+
+import batters as batter_module
+import pitchers as pitcher_module
+from instrument import stage
+
+# Picks up edits to batter_weights.py / pitcher_weights.py while the app is running.
+# A changed file is re-executed and its section_weights installed in batters/pitchers,
+# then the loaded roster is re-scored in place. Only the score parts whose weights changed
+# are recomputed, from numeric columns built once per roster and kept between edits.
+
+# roster -> (scoring module, weights module name, column builder, Scores writer)
+ROSTERS = {
+    "batters": (batter_module, "batter_weights", batter_module.batter_columns, batter_module.update_batter_scores),
+    "pitchers": (pitcher_module, "pitcher_weights", pitcher_module.pitcher_columns, pitcher_module.update_pitcher_scores),
+}
+
+
+def weights_path(roster):
+    module, name, _, _ = ROSTERS[roster]
+    return module.get_base_path() / f"{name}.py"
+
+
+def weights_stamp(roster):
+    try:
+        st = os.stat(weights_path(roster))
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def reload_weights(roster):
+    # Re-executes the weights file and installs it; returns (old, new) section_weights.
+    # A file that fails to run raises and leaves the current weights in place.
+    module, name, _, _ = ROSTERS[roster]
+    weights_module = module.import_weights_module(name)
+    old = module.section_weights
+    new = weights_module.section_weights
+    setattr(module, name, weights_module)
+    module.section_weights = new
+    return old, new
+
+
+class WeightsWatcher:
+    def __init__(self):
+        self.stamps = {roster: weights_stamp(roster) for roster in ROSTERS}
+        self.cache = {}   # roster -> (players, columns, parts)
+
+    def changed_rosters(self):
+        changed = []
+        for roster in ROSTERS:
+            stamp = weights_stamp(roster)
+            if stamp != self.stamps[roster]:
+                self.stamps[roster] = stamp
+                changed.append(roster)
+        return changed
+
+    def rescore(self, roster, players, old, new):
+        # Updates the players' Scores in place; returns the changed (roster, Scores key) components
+        module, _, make_columns, update_scores = ROSTERS[roster]
+        names = module.changed_score_parts(old, new)
+        if not names or not players:
+            return set()
+
+        with stage(f"rescore {roster}", len(players)):
+            cached = self.cache.get(roster)
+            if cached is not None and cached[0] is players:
+                _, columns, parts = cached
+                module.score_parts(columns, new, parts, names)
+            else:
+                # First edit since this roster was loaded: build its columns and every part once
+                columns = make_columns(players)
+                parts = module.score_parts(columns, new)
+                self.cache[roster] = (players, columns, parts)
+
+            update_scores(players, parts, names)
+        if roster == "batters":
+            names = names | {"total"}   # the batter total is the sum of the three parts
+        return {(roster, name) for name in names}
+
+    def poll(self, rosters):
+        # rosters: {"batters": [...], "pitchers": [...]}. Returns (changed components, errors),
+        # errors being (roster, exception) for weight files that could not be loaded.
+        components = set()
+        errors = []
+        for roster in self.changed_rosters():
+            try:
+                old, new = reload_weights(roster)
+            except Exception as e:
+                errors.append((roster, e))
+                continue
+            components |= self.rescore(roster, rosters[roster], old, new)
+        return components, errors
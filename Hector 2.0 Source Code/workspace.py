@@ -0,0 +1,259 @@
+import argparse
+from collections import OrderedDict
+import json
+import multiprocessing
+import os
+from pathlib import Path
+import sys
+import time
+
+import batters as batter_module
+import pitchers as pitcher_module
+from data_loader import load_all, export_path, get_base_path
+
+# Workspace of several leagues' exports.
+# hector_workspace.json next to the app lists each league's export folder and its StatsPlus
+# site; without it there is one league, the exports next to the app.
+#
+#   {"active": "RFBL", "cache_size": 3, "leagues": [
+#       {"name": "RFBL", "directory": ".", "statsplus": "https://atl-01.statsplus.net/rfbl"},
+#       {"name": "Dynasty", "directory": "D:/OOTP/dynasty", "statsplus": ""}]}
+#
+# Loaded leagues are kept in a LeagueCache (least recently used dropped first), so switching
+# back to one is instant. The app loads the other leagues ahead of time, one process each,
+# unless the workspace has "preload": false.
+#
+#   python workspace.py list
+#   python workspace.py add Dynasty D:/OOTP/dynasty --statsplus https://atl-01.statsplus.net/dyn
+#   python workspace.py load                       load every league at once and report times
+
+WORKSPACE_FILE = "hector_workspace.json"
+DEFAULT_LEAGUE = "Default"
+DEFAULT_STATSPLUS = "https://atl-01.statsplus.net/rfbl"
+DEFAULT_CACHE_SIZE = 3
+
+
+def workspace_path():
+    return get_base_path() / WORKSPACE_FILE
+
+
+def default_workspace():
+    return {
+        "active": DEFAULT_LEAGUE,
+        "cache_size": DEFAULT_CACHE_SIZE,
+        "leagues": [{"name": DEFAULT_LEAGUE, "directory": ".", "statsplus": DEFAULT_STATSPLUS}],
+    }
+
+
+def load_workspace(path=None):
+    path = workspace_path() if path is None else Path(path)
+    try:
+        with open(path, encoding="utf-8") as f:
+            workspace = json.load(f)
+    except FileNotFoundError:
+        return default_workspace()
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Could not read {path}: {e}")
+    if not workspace.get("leagues"):
+        raise ValueError(f"{path} lists no leagues")
+    names = [league["name"] for league in workspace["leagues"]]
+    if len(set(names)) != len(names):
+        raise ValueError(f"{path} lists a league name twice")
+    if workspace.get("active") not in names:
+        workspace["active"] = names[0]
+    workspace.setdefault("cache_size", DEFAULT_CACHE_SIZE)
+    return workspace
+
+
+def save_workspace(workspace, path=None):
+    path = workspace_path() if path is None else Path(path)
+    tmp_file = path.with_suffix(".tmp")
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(workspace, f, indent=2)
+    os.replace(tmp_file, path)
+
+
+def find_league(workspace, name):
+    for league in workspace["leagues"]:
+        if league["name"] == name:
+            return league
+    raise KeyError(name)
+
+
+def add_league(workspace, name, directory, statsplus=""):
+    if any(league["name"] == name for league in workspace["leagues"]):
+        raise ValueError(f"There is already a league called {name}")
+    league = {"name": name, "directory": str(directory), "statsplus": statsplus.rstrip("/")}
+    workspace["leagues"].append(league)
+    return league
+
+
+def remove_league(workspace, name):
+    league = find_league(workspace, name)
+    if len(workspace["leagues"]) == 1:
+        raise ValueError("A workspace needs at least one league")
+    workspace["leagues"].remove(league)
+    if workspace["active"] == name:
+        workspace["active"] = workspace["leagues"][0]["name"]
+
+
+def league_directory(league):
+    # Relative folders are relative to the app folder
+    directory = Path(league["directory"])
+    return directory if directory.is_absolute() else get_base_path() / directory
+
+
+def player_url(league, player_id):
+    # The player's StatsPlus page, or None when the league has no StatsPlus site set
+    if not league.get("statsplus"):
+        return None
+    return f"{league['statsplus']}/player/{player_id}?page=dash"
+
+
+def export_stamp(directory):
+    # Changes whenever either export is replaced or edited
+    stamp = []
+    for roster in ("pitchers", "batters"):
+        path = export_path(directory, roster)
+        try:
+            st = os.stat(path)
+        except OSError:
+            stamp.append((str(path), None, None))
+        else:
+            stamp.append((str(path), st.st_mtime_ns, st.st_size))
+    return tuple(stamp)
+
+
+def current_weights():
+    # The weights in use right now; a weight-file reload installs new dicts, so identity tells
+    # whether scores are still current
+    return (batter_module.section_weights, pitcher_module.section_weights)
+
+
+def rescore(result):
+    # Scores both rosters again with the current weights
+    result["pitchers"].add_column("Scores", pitcher_module.score_pitchers(result["pitchers"]))
+    result["batters"].add_column("Scores", batter_module.score_batters(result["batters"]))
+
+
+# --- Cache ---
+class LeagueCache:
+    # league name -> load_all result, holding at most size leagues (least recently used go first)
+    def __init__(self, size=DEFAULT_CACHE_SIZE):
+        self.size = max(1, size)
+        self.entries = OrderedDict()
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def put(self, name, result, stamp):
+        # stamp: export_stamp of the folder when it was read
+        self.entries[name] = {"result": result, "stamp": stamp, "weights": current_weights()}
+        self.entries.move_to_end(name)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def touch(self, name):
+        # Marks a league used and its scores current (e.g. after a weight change re-scored it)
+        entry = self.entries.get(name)
+        if entry is not None:
+            entry["weights"] = current_weights()
+            self.entries.move_to_end(name)
+
+    def get(self, name, directory):
+        # The cached result, or None when there is none or the exports changed since.
+        # Scores made with weights that have since been edited are redone first.
+        entry = self.entries.get(name)
+        if entry is None:
+            return None
+        if entry["stamp"] != export_stamp(directory):
+            del self.entries[name]
+            return None
+        weights = current_weights()
+        if any(a is not b for a, b in zip(entry["weights"], weights)):
+            rescore(entry["result"])
+            entry["weights"] = weights
+        self.entries.move_to_end(name)
+        return entry["result"]
+
+    def discard(self, name):
+        self.entries.pop(name, None)
+
+
+# --- Loading ---
+def load_league(directory):
+    # Worker side: (export stamp, load_all result) for one league folder. The stamp is taken
+    # first, so an export replaced during the load is read again next time.
+    stamp = export_stamp(directory)
+    return stamp, load_all(directory=directory, parallel=False)
+
+
+def load_leagues(leagues, max_workers=None):
+    # Loads leagues at once, one process each; yields (league, stamp, result, error) as they finish
+    if not leagues:
+        return
+    from concurrent.futures import ProcessPoolExecutor, as_completed   # not needed to open the window
+    with ProcessPoolExecutor(max_workers=max_workers or min(len(leagues), os.cpu_count() or 1)) as pool:
+        futures = {pool.submit(load_league, str(league_directory(league))): league for league in leagues}
+        for future in as_completed(futures):
+            try:
+                stamp, result = future.result()
+            except Exception as e:
+                yield futures[future], None, None, e
+            else:
+                yield futures[future], stamp, result, None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="workspace.py", description="Manage the leagues Hector can switch between.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="show the leagues")
+    add = commands.add_parser("add", help="add a league")
+    add.add_argument("name")
+    add.add_argument("directory", help="folder holding the league's pitchers and batters exports")
+    add.add_argument("--statsplus", default="", help="the league's StatsPlus site, e.g. https://atl-01.statsplus.net/rfbl")
+    remove = commands.add_parser("remove", help="remove a league (its exports are left alone)")
+    remove.add_argument("name")
+    activate = commands.add_parser("activate", help="the league the app opens with")
+    activate.add_argument("name")
+    load = commands.add_parser("load", help="load every league at once and report the times")
+    load.add_argument("-j", "--jobs", type=int, default=None, help="leagues loaded at once (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    try:
+        workspace = load_workspace()
+        if args.command == "add":
+            add_league(workspace, args.name, args.directory, args.statsplus)
+        elif args.command == "remove":
+            remove_league(workspace, args.name)
+        elif args.command == "activate":
+            find_league(workspace, args.name)
+            workspace["active"] = args.name
+    except KeyError as e:
+        parser.error(f"no league called {e.args[0]}")
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.command in ("add", "remove", "activate"):
+        save_workspace(workspace)
+    if args.command == "load":
+        start = time.perf_counter()
+        failed = 0
+        for league, stamp, result, error in load_leagues(workspace["leagues"], args.jobs):
+            if error is not None:
+                print(f"{league['name']}: FAILED - {type(error).__name__}: {error}", file=sys.stderr)
+                failed += 1
+            else:
+                print(f"{league['name']}: {len(result['pitchers'])} pitchers, {len(result['batters'])} batters"
+                      f" ({time.perf_counter() - start:.2f}s)")
+        return 1 if failed else 0
+
+    for league in workspace["leagues"]:
+        active = "*" if league["name"] == workspace["active"] else " "
+        print(f"{active} {league['name']}: {league_directory(league)}  {league.get('statsplus') or '(no StatsPlus site)'}")
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())